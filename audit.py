@@ -0,0 +1,305 @@
+import datetime
+import re
+import zoneinfo
+import numpy as np
+from logger import info, success, warning, error, debug
+
+MOVE_FIELDS = ["name", "date", "move_type", "partner_id", "journal_id", "amount_total", "invoice_date", "ref",
+               "create_date"]
+LINE_FIELDS = ["journal_id", "debit", "credit"]
+PAGE_SIZE = 2000
+
+CHECKS = ("duplicates", "round_amounts", "weekend", "after_hours", "benford", "partner_outliers")
+
+# Weight of each matching component of two invoices; pairs reaching DUPLICATE_MIN_SCORE are flagged.
+DUPLICATE_WEIGHTS = {"partner": 0.25, "amount": 0.35, "invoice_date": 0.2, "ref": 0.2}
+DUPLICATE_MIN_SCORE = 0.8
+# Larger blocks are recurring documents (rent, subscriptions), not duplicates.
+MAX_BLOCK_SIZE = 50
+
+ROUND_MIN_AMOUNT = 1000
+
+BUSINESS_HOURS = (7, 20)
+# Off-hours postings are weak signals on their own: they rank below duplicates and outliers.
+WEEKEND_SCORE = 0.5
+AFTER_HOURS_SCORE = (0.25, 0.75)
+
+# Expected first-digit frequencies, and Nigrini's mean absolute deviation
+# above which a first-digit distribution no longer conforms.
+BENFORD = np.log10(1 + 1 / np.arange(1, 10))
+BENFORD_MAD_THRESHOLD = 0.015
+BENFORD_MIN_LINES = 100
+BENFORD_MIN_AMOUNT = 10
+
+# An entry is compared with its partner's other entries once there are Z_MIN_MOVES of them.
+Z_THRESHOLD = 3.0
+Z_MIN_MOVES = 7
+
+
+def _many2one(value):
+    return value[0] if value else 0
+
+
+def _dates(values, unit="D"):
+    return np.array([value or "NaT" for value in values], dtype=f"datetime64[{unit}]")
+
+
+class Moves:
+    """Posted journal entries of a period as NumPy columns, one position per entry."""
+
+    def __init__(self):
+        self._rows = {field: [] for field in ["id", *MOVE_FIELDS]}
+
+    def add(self, rows):
+        for row in rows:
+            for field, values in self._rows.items():
+                values.append(row.get(field))
+
+    def freeze(self):
+        rows = self._rows
+        self.ids = np.array(rows["id"], dtype=np.int64)
+        self.names = rows["name"]
+        self.move_types = np.array([value or "" for value in rows["move_type"]])
+        self.partners = np.array([_many2one(value) for value in rows["partner_id"]], dtype=np.int64)
+        self.partner_names = {value[0]: value[1] for value in rows["partner_id"] if value}
+        self.journals = np.array([_many2one(value) for value in rows["journal_id"]], dtype=np.int64)
+        self.amounts = np.array([value or 0.0 for value in rows["amount_total"]], dtype=float)
+        self.cents = np.round(self.amounts * 100).astype(np.int64)
+        self.dates = _dates(rows["date"])
+        self.invoice_dates = _dates(rows["invoice_date"])
+        self.created = _dates(rows["create_date"], "s")
+        # Normalized references as integer codes, -1 for none, so they can be compared and grouped in NumPy.
+        codes = {}
+        self.refs = np.array([codes.setdefault(re.sub(r"[^0-9a-z]", "", str(value).lower()), len(codes))
+                              if value else -1 for value in rows["ref"]], dtype=np.int64)
+        self._rows = None
+        return self
+
+    def __len__(self):
+        return len(self.ids)
+
+    def describe(self, position):
+        return {
+            "move_id": [int(self.ids[position]), self.names[position]],
+            "date": str(self.dates[position]),
+            "partner_id": [int(self.partners[position]), self.partner_names[self.partners[position]]]
+            if self.partners[position] else False,
+            "amount_total": float(self.amounts[position]),
+        }
+
+
+def _finding(check, score, **details):
+    return {"check": check, "score": round(float(score), 3), **details}
+
+
+def _blocks(*columns):
+    """
+    Groups of 2 to MAX_BLOCK_SIZE positions whose ``columns`` hash to the same
+    blocking key; callers compare the actual values, as keys may collide.
+    """
+    key = np.zeros(len(columns[0]), dtype=np.uint64)
+    for column in columns:
+        # FNV-style mixing; uint64 arithmetic wraps around.
+        key = (key ^ column.astype(np.uint64)) * np.uint64(0x100000001B3)
+    _, inverse, counts = np.unique(key, return_inverse=True, return_counts=True)
+    inverse = inverse.reshape(-1)
+    sizes = counts[inverse]
+    positions = np.flatnonzero((sizes >= 2) & (sizes <= MAX_BLOCK_SIZE))
+    positions = positions[np.argsort(inverse[positions], kind="stable")]
+    starts = np.flatnonzero(np.diff(inverse[positions])) + 1
+    return np.split(positions, starts) if len(positions) else []
+
+
+def duplicate_invoices(moves):
+    """
+    Pairs of invoices of the same type and partner sharing a blocking key,
+    (amount, invoice_date) or (amount, ref), scored by how many of partner,
+    amount, invoice date and reference match.
+    """
+    invoices = np.flatnonzero((moves.move_types != "entry") & (moves.partners != 0))
+    if len(invoices) < 2:
+        return []
+    types = np.unique(moves.move_types[invoices], return_inverse=True)[1].reshape(-1)
+    partners, cents = moves.partners[invoices], moves.cents[invoices]
+    invoice_dates = moves.invoice_dates[invoices].view(np.int64)
+    refs = moves.refs[invoices]
+    dated = ~np.isnat(moves.invoice_dates[invoices])
+
+    pairs = set()
+    for keyed, key in ((dated, invoice_dates), (refs >= 0, refs)):
+        subset = np.flatnonzero(keyed)
+        for block in _blocks(types[subset], partners[subset], cents[subset], key[subset]):
+            block = subset[block]
+            pairs.update((int(a), int(b)) for i, a in enumerate(block) for b in block[i + 1:])
+
+    findings = []
+    for a, b in pairs:
+        if types[a] != types[b] or partners[a] != partners[b]:
+            continue
+        score = DUPLICATE_WEIGHTS["partner"]
+        score += DUPLICATE_WEIGHTS["amount"] * (cents[a] == cents[b])
+        score += DUPLICATE_WEIGHTS["invoice_date"] * (dated[a] and invoice_dates[a] == invoice_dates[b])
+        score += DUPLICATE_WEIGHTS["ref"] * (refs[a] >= 0 and refs[a] == refs[b])
+        if score >= DUPLICATE_MIN_SCORE - 1e-9:
+            first, second = invoices[min(a, b)], invoices[max(a, b)]
+            findings.append(_finding("duplicates", score, **moves.describe(first),
+                                     duplicate_of=[int(moves.ids[second]), moves.names[second]]))
+    return findings
+
+
+def round_amounts(moves):
+    """Entries of at least ROUND_MIN_AMOUNT in whole thousands, scored by their share of trailing zeros."""
+    flagged = np.flatnonzero((moves.amounts >= ROUND_MIN_AMOUNT) & (moves.cents % 100000 == 0))
+    findings = []
+    for position in flagged:
+        digits = str(int(moves.cents[position] // 100))
+        zeros = len(digits) - len(digits.rstrip("0"))
+        findings.append(_finding("round_amounts", zeros / len(digits), **moves.describe(position)))
+    return findings
+
+
+def _local(created, timezone):
+    """``created`` (UTC datetime64[s]) in ``timezone``, with the offset of each distinct day."""
+    zone = zoneinfo.ZoneInfo(timezone)
+    days, inverse = np.unique(created.astype("datetime64[D]"), return_inverse=True)
+    offsets = np.array([
+        0 if np.isnat(day) else
+        int(zone.utcoffset(datetime.datetime.fromisoformat(str(day)) + datetime.timedelta(hours=12)).total_seconds())
+        for day in days
+    ], dtype="timedelta64[s]")
+    return created + offsets[inverse.reshape(-1)]
+
+
+def off_hours(moves, timezone, checks):
+    """Entries created on a Saturday or Sunday, or outside BUSINESS_HOURS, in ``timezone``."""
+    created = _local(moves.created, timezone)
+    known = ~np.isnat(created)
+    # 1970-01-01 was a Thursday: shift so Monday is 0.
+    weekdays = (created.astype("datetime64[D]").view(np.int64) + 3) % 7
+    hours = (created - created.astype("datetime64[D]")).astype("timedelta64[m]").view(np.int64) / 60
+    start, end = BUSINESS_HOURS
+    findings = []
+    if "weekend" in checks:
+        for position in np.flatnonzero(known & (weekdays >= 5)):
+            findings.append(_finding("weekend", WEEKEND_SCORE, **moves.describe(position),
+                                     created=str(created[position])))
+    if "after_hours" in checks:
+        # Deeper into the night scores higher, up to the middle of the off-hours window.
+        outside = np.maximum(start - hours, hours - end)
+        low, high = AFTER_HOURS_SCORE
+        for position in np.flatnonzero(known & (outside > 0)):
+            depth = min(1.0, outside[position] / ((24 - end + start) / 2))
+            findings.append(_finding("after_hours", low + (high - low) * depth,
+                                     **moves.describe(position), created=str(created[position])))
+    return findings
+
+
+def partner_outliers(moves):
+    """
+    Entries whose amount lies Z_THRESHOLD standard deviations or more from the
+    mean of their partner's other entries (leaving the entry out, so a single
+    extreme amount cannot hide by inflating its own partner's deviation).
+    """
+    known = np.flatnonzero(moves.partners != 0)
+    if not len(known):
+        return []
+    inverse = np.unique(moves.partners[known], return_inverse=True)[1].reshape(-1)
+    amounts = moves.amounts[known]
+    others = np.bincount(inverse)[inverse] - 1
+    sums = np.bincount(inverse, weights=amounts)[inverse] - amounts
+    squares = np.bincount(inverse, weights=amounts ** 2)[inverse] - amounts ** 2
+    usable = others >= Z_MIN_MOVES
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.where(usable, sums / others, 0)
+        stds = np.sqrt(np.maximum(np.where(usable, squares / others, 0) - means ** 2, 0))
+        z = np.where(usable & (stds > 0), (amounts - means) / stds, 0)
+    findings = []
+    for index in np.flatnonzero(np.abs(z) >= Z_THRESHOLD):
+        findings.append(_finding("partner_outliers", min(1.0, abs(z[index]) / (4 * Z_THRESHOLD)),
+                                 **moves.describe(known[index]), z_score=round(float(z[index]), 2),
+                                 partner_mean=round(float(means[index]), 2), partner_moves=int(others[index]) + 1))
+    return findings
+
+
+def first_digits(amounts):
+    """Leading digit (1-9) of each amount of at least BENFORD_MIN_AMOUNT."""
+    amounts = amounts[amounts >= BENFORD_MIN_AMOUNT]
+    return (amounts / 10 ** np.floor(np.log10(amounts))).astype(np.int64).clip(1, 9)
+
+
+def benford(journals, amounts, journal_names):
+    """Journals whose journal items' first digits deviate from Benford's law, scored by mean absolute deviation."""
+    findings = []
+    for journal in np.unique(journals):
+        digits = first_digits(amounts[journals == journal])
+        if len(digits) < BENFORD_MIN_LINES:
+            continue
+        observed = np.bincount(digits, minlength=10)[1:] / len(digits)
+        mad = float(np.mean(np.abs(observed - BENFORD)))
+        if mad > BENFORD_MAD_THRESHOLD:
+            excess = int(np.argmax(observed - BENFORD)) + 1
+            findings.append(_finding(
+                "benford", min(1.0, mad / (4 * BENFORD_MAD_THRESHOLD)),
+                journal_id=[int(journal), journal_names.get(int(journal), "")], lines=len(digits),
+                mad=round(mad, 4), most_overrepresented_digit=excess,
+                observed=[round(float(value), 3) for value in observed],
+            ))
+    return findings
+
+
+async def load_moves(client, domain):
+    moves = Moves()
+    page = []
+    async for row in client.iter_search_read("account.move", domain, MOVE_FIELDS, page_size=PAGE_SIZE):
+        page.append(row)
+        if len(page) == PAGE_SIZE:
+            moves.add(page)
+            page = []
+    moves.add(page)
+    return moves.freeze()
+
+
+async def load_line_amounts(client, domain):
+    """(journal ids, absolute amounts) of the journal items matching ``domain``, as NumPy arrays."""
+    journals, amounts, names = [], [], {}
+    async for row in client.iter_search_read("account.move.line", domain, LINE_FIELDS, page_size=PAGE_SIZE):
+        if row["journal_id"]:
+            names[row["journal_id"][0]] = row["journal_id"][1]
+        journals.append(_many2one(row["journal_id"]))
+        amounts.append((row["debit"] or 0.0) - (row["credit"] or 0.0))
+    return np.array(journals, dtype=np.int64), np.abs(np.array(amounts, dtype=float)), names
+
+
+async def audit_entries(client, start_date=None, end_date=None, journal_id=None, checks=CHECKS, timezone="UTC"):
+    """
+    Run ``checks`` on the posted journal entries (and, for ``benford``,
+    journal items) dated from ``start_date`` to ``end_date``; returns
+    (findings sorted by score, number of entries, number of items).
+    """
+    domain = []
+    if start_date:
+        domain.append(["date", ">=", start_date])
+    if end_date:
+        domain.append(["date", "<=", end_date])
+    if journal_id:
+        domain.append(["journal_id", "=", journal_id])
+
+    moves = await load_moves(client, [["state", "=", "posted"], *domain])
+    info("🕵️ Auditing {} journal entries with checks: {}", len(moves), ", ".join(checks))
+    findings = []
+    if "duplicates" in checks:
+        findings += duplicate_invoices(moves)
+    if "round_amounts" in checks:
+        findings += round_amounts(moves)
+    if "weekend" in checks or "after_hours" in checks:
+        findings += off_hours(moves, timezone, checks)
+    if "partner_outliers" in checks:
+        findings += partner_outliers(moves)
+    lines = 0
+    if "benford" in checks:
+        journals, amounts, names = await load_line_amounts(client, [["parent_state", "=", "posted"], *domain])
+        lines = len(amounts)
+        findings += benford(journals, amounts, names)
+    findings.sort(key=lambda finding: -finding["score"])
+    success("✅ Audit flagged {} findings in {} entries and {} journal items", len(findings), len(moves), lines)
+    return findings, len(moves), lines
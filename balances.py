@@ -0,0 +1,311 @@
+import asyncio
+import numpy as np
+from snapshot import closed_until, month_end, month_start
+from logger import info, success, warning, error, debug
+
+# Fields of account.move.line the engine reads; everything else is summed away.
+LINE_FIELDS = ["account_id", "debit", "credit", "date", "company_id"]
+LINE_PAGE_SIZE = 2000
+
+# Bucket of the lines dated before the report's start date.
+OPENING = "opening"
+
+PRECISION = 2
+
+# Snapshot kind of the monthly sums of locked journal items.
+CLOSED_SUMS = "closed_sums"
+
+
+class AccountSums:
+    """
+    Debit and credit totals of journal items per bucket, as NumPy arrays indexed by account.
+
+    ``accounts`` maps an account id to its column; each bucket (a ``YYYY-MM``
+    month or OPENING) is a ``(2, n)`` array of debit and credit sums. Buckets
+    created before new accounts showed up are padded on access.
+    """
+
+    def __init__(self):
+        self.accounts = {}
+        self.names = {}
+        self.buckets = {}
+        self.lines = 0
+
+    def _column(self, account):
+        column = self.accounts.get(account[0])
+        if column is None:
+            column = self.accounts[account[0]] = len(self.accounts)
+            self.names[account[0]] = account[1]
+        return column
+
+    def add_accounts(self, accounts):
+        """Give every ``[id, name]`` in ``accounts`` a column, so accounts without items are reported too."""
+        for account in accounts:
+            self._column(account)
+
+    def bucket(self, label):
+        size = len(self.accounts)
+        sums = self.buckets.get(label)
+        if sums is None:
+            sums = self.buckets[label] = np.zeros((2, size))
+        elif sums.shape[1] < size:
+            sums = self.buckets[label] = np.pad(sums, ((0, 0), (0, size - sums.shape[1])))
+        return sums
+
+    def add_lines(self, rows, bucket_of):
+        """Add a page of journal items; ``bucket_of(date)`` returns the bucket label, or None to skip the line."""
+        columns, debits, credits, labels = [], [], [], []
+        for row in rows:
+            label = bucket_of(row["date"])
+            if label is None or not row["account_id"]:
+                continue
+            columns.append(self._column(row["account_id"]))
+            debits.append(row["debit"])
+            credits.append(row["credit"])
+            labels.append(label)
+        if not columns:
+            return
+        self.lines += len(columns)
+
+        # One bincount per side over (bucket, account) pairs instead of a Python loop per line.
+        size = len(self.accounts)
+        names, groups = np.unique(np.array(labels), return_inverse=True)
+        flat = groups * size + np.array(columns)
+        length = len(names) * size
+        debit = np.bincount(flat, weights=np.array(debits, dtype=float), minlength=length).reshape(len(names), size)
+        credit = np.bincount(flat, weights=np.array(credits, dtype=float), minlength=length).reshape(len(names), size)
+        for index, name in enumerate(names):
+            sums = self.bucket(str(name))
+            sums[0] += debit[index]
+            sums[1] += credit[index]
+
+    def add_sums(self, other, relabel):
+        """Add ``other``'s buckets into this one; ``relabel(label)`` returns the target bucket, or None to skip it."""
+        if not other.accounts:
+            return
+        columns = np.array([self._column([account, other.names[account]]) for account in other.accounts])
+        for label, sums in other.buckets.items():
+            target = relabel(label)
+            if target is not None:
+                self.bucket(target)[:, columns[:sums.shape[1]]] += sums
+
+    def copy(self):
+        clone = AccountSums()
+        clone.accounts = dict(self.accounts)
+        clone.names = dict(self.names)
+        clone.buckets = {label: sums.copy() for label, sums in self.buckets.items()}
+        clone.lines = self.lines
+        return clone
+
+    def to_dict(self):
+        return {
+            "accounts": [[account, self.names[account]] for account in self.accounts],
+            "buckets": {label: sums.tolist() for label, sums in self.buckets.items()},
+            "lines": self.lines,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sums = cls()
+        sums.add_accounts(data["accounts"])
+        sums.buckets = {label: np.array(values, dtype=float).reshape(2, -1) for label, values in data["buckets"].items()}
+        sums.lines = data["lines"]
+        return sums
+
+    def total(self, labels):
+        """Sum of ``labels``' buckets as a ``(2, n)`` array."""
+        total = np.zeros((2, len(self.accounts)))
+        for label in labels:
+            if label in self.buckets:
+                total += self.bucket(label)
+        return total
+
+
+async def stream_lines(client, sums, domain, bucket_of):
+    """Stream posted journal items matching ``domain`` into ``sums``, page by page."""
+    page = []
+    async for row in client.iter_search_read("account.move.line", domain, LINE_FIELDS, page_size=LINE_PAGE_SIZE):
+        page.append(row)
+        if len(page) == LINE_PAGE_SIZE:
+            sums.add_lines(page, bucket_of)
+            page = []
+    sums.add_lines(page, bucket_of)
+
+
+def _line_domain(company_id, after=None, until=None):
+    domain = [["parent_state", "=", "posted"], ["company_id", "=", company_id]]
+    if after:
+        domain.append(["date", ">", after])
+    if until:
+        domain.append(["date", "<=", until])
+    return domain
+
+
+def _by_month(date):
+    return date[:7]
+
+
+# (url, db, username, company_id) -> (until, AccountSums of every line dated <= until, or the task computing it)
+_closed = {}
+
+
+async def _extend_closed(client, company_id, base, after, until):
+    sums = base.copy() if base is not None else AccountSums()
+    before = sums.lines
+    await stream_lines(client, sums, _line_domain(company_id, after, until), _by_month)
+    success("✅ Summed {} locked journal items of company {} up to {}", sums.lines - before, company_id, until)
+    store = client.snapshots
+    if store is not None:
+        store.save(CLOSED_SUMS, store.signature(client.uid, company_id), until, sums.to_dict())
+    return sums
+
+
+def _stored_closed(client, company_id, until):
+    """Return (until, AccountSums) of the latest snapshot of the company's sums up to ``until``, or None."""
+    store = client.snapshots
+    if store is None:
+        return None
+    found = store.latest(CLOSED_SUMS, store.signature(client.uid, company_id), until)
+    if found is None:
+        return None
+    try:
+        return found[0], AccountSums.from_dict(found[1])
+    except (KeyError, TypeError, ValueError) as e:
+        warning("⚠️ Ignoring unreadable closed sums of company {}: {}", company_id, e)
+        return None
+
+
+async def _settled(value):
+    return value if isinstance(value, AccountSums) else await asyncio.shield(value)
+
+
+async def closed_sums(client, company_id, until):
+    """
+    Monthly sums of company ``company_id``'s posted journal items dated on or
+    before ``until``, a locked date. Those items can no longer change, so the
+    sums are kept for the process and in the snapshot store, and only extended
+    when the lock date moves forward: a rerun streams none of them again.
+    """
+    key = (client.url, client.db, client.username, company_id)
+    cached = _closed.get(key)
+    if cached is None:
+        cached = _stored_closed(client, company_id, until)
+        if cached is not None:
+            _closed[key] = cached
+    if cached is not None and cached[0] == until:
+        return await _settled(cached[1])
+
+    base = after = None
+    if cached is not None and cached[0] < until:
+        try:
+            base, after = await _settled(cached[1]), cached[0]
+        except Exception:
+            base = after = None
+    if base is None:
+        info("🧮 Summing locked journal items of company {} up to {}", company_id, until)
+    task = asyncio.ensure_future(_extend_closed(client, company_id, base, after, until))
+    _closed[key] = (until, task)
+    try:
+        sums = await asyncio.shield(task)
+    except Exception:
+        if _closed.get(key, (None, None))[1] is task:
+            del _closed[key]
+        raise
+    if _closed.get(key, (None, None))[1] is task:
+        _closed[key] = (until, sums)
+    return sums
+
+
+async def compute_balances(client, start_date=None, end_date=None, company_id=None):
+    """
+    Sum posted journal items into an AccountSums with an OPENING bucket
+    (items before ``start_date``) and one bucket per month up to ``end_date``.
+
+    Per company, whole months on or before the lock date come from
+    closed_sums(); only later items, and the locked months that ``start_date``
+    or ``end_date`` cut in two, are streamed from Odoo.
+    """
+    def bucket_of(date):
+        if end_date and date > end_date:
+            return None
+        if start_date and date < start_date:
+            return OPENING
+        return date[:7]
+
+    lock_dates = await client.lock_dates()
+    if client.snapshots is not None:
+        client.snapshots.observe(lock_dates)
+    companies = [company_id] if company_id else list(lock_dates)
+    sums = AccountSums()
+    for company in companies:
+        until = closed_until(lock_dates.get(company))
+        if not until:
+            await stream_lines(client, sums, _line_domain(company, until=end_date), bucket_of)
+            continue
+
+        # Locked months the report's dates fall inside of are re-read line by line.
+        split = set()
+        if start_date and start_date != month_start(start_date) and start_date <= until:
+            split.add(start_date[:7])
+        if end_date and end_date != month_end(end_date) and end_date <= until:
+            split.add(end_date[:7])
+
+        def relabel(month):
+            first = month + "-01"
+            if month in split or (end_date and first > end_date):
+                return None
+            if start_date and month_end(first) < start_date:
+                return OPENING
+            return month
+
+        sums.add_sums(await closed_sums(client, company, until), relabel)
+        for month in sorted(split):
+            first = month + "-01"
+            await stream_lines(client, sums, _line_domain(company, None, month_end(first)) + [["date", ">=", first]], bucket_of)
+        if not end_date or end_date > until:
+            await stream_lines(client, sums, _line_domain(company, until, end_date), bucket_of)
+    return sums
+
+
+def balance_rows(sums, by_month=False, include_zero_balance=False, account_ids=None):
+    """
+    Rows of opening balance, period debit and credit, and closing balance per
+    account, sorted by account name; with ``by_month`` each row also has a
+    ``months`` list of per-month debit, credit and balance.
+    """
+    months = sorted(label for label in sums.buckets if label != OPENING)
+    opening = sums.total([OPENING])
+    period = sums.total(months)
+    opening_balance = np.round(opening[0] - opening[1], PRECISION)
+    debit = np.round(period[0], PRECISION)
+    credit = np.round(period[1], PRECISION)
+    closing_balance = np.round(opening_balance + debit - credit, PRECISION)
+
+    keep = np.ones(len(sums.accounts), dtype=bool)
+    if not include_zero_balance:
+        keep &= (opening_balance != 0) | (debit != 0) | (credit != 0) | (closing_balance != 0)
+    by_column = list(sums.accounts)
+    if account_ids is not None:
+        wanted = set(account_ids)
+        keep &= np.array([account in wanted for account in by_column], dtype=bool)
+
+    monthly = {month: np.round(sums.bucket(month), PRECISION) for month in months} if by_month else {}
+    rows = []
+    for column in np.flatnonzero(keep):
+        account = by_column[column]
+        row = {
+            "account_id": [account, sums.names[account]],
+            "opening_balance": float(opening_balance[column]),
+            "debit": float(debit[column]),
+            "credit": float(credit[column]),
+            "closing_balance": float(closing_balance[column]),
+        }
+        if by_month:
+            row["months"] = [
+                {"month": month, "debit": float(values[0, column]), "credit": float(values[1, column]),
+                 "balance": float(np.round(values[0, column] - values[1, column], PRECISION))}
+                for month, values in monthly.items() if values[0, column] or values[1, column]
+            ]
+        rows.append(row)
+    rows.sort(key=lambda row: row["account_id"][1] or "")
+    return rows
@@ -0,0 +1,110 @@
+"""
+Measure the per-call cost of the logger.
+
+Compares the previous logger (level dict rebuilt, ``strftime`` and a
+line-buffered ``print`` on every call) with the current one for:
+
+- a disabled ``debug`` call written as an f-string (formatted anyway) and
+  with lazy ``{}`` arguments (skipped entirely),
+- an enabled ``info`` call written synchronously and through the queue writer.
+
+Output goes to a line-buffered handle on /dev/null, so every synchronous line
+is still one ``write`` syscall, as it is on stderr.
+
+    python -m benchmarks.logger_benchmark --calls 200000
+"""
+
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+import logger
+from logger import Colors, LogLevel
+
+MODEL = "account.move"
+ROWS = list(range(20))
+
+
+def _legacy_log(stream, message, level=LogLevel.INFO, *args):
+    # The logger as it was before the level filter and queue writer
+    if args:
+        message = message.format(*args)
+    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    source = "odoo-mcp-server"
+    level_info = {
+        LogLevel.INFO: {"emoji": "🌐 ", "color": Colors.GREEN, "text": "INFO"},
+        LogLevel.SUCCESS: {"emoji": "✅ ", "color": Colors.GREEN, "text": "INFO"},
+        LogLevel.WARNING: {"emoji": "🚀 ", "color": Colors.YELLOW, "text": "WARN"},
+        LogLevel.ERROR: {"emoji": "❌ ", "color": Colors.RED, "text": "ERROR"},
+        LogLevel.DEBUG: {"emoji": "🔍 ", "color": Colors.BLUE, "text": "DEBUG"},
+    }.get(level, {"emoji": "", "color": Colors.RESET, "text": "UNKNOWN"})
+    colored_level = f"{level_info['color']}{level_info['text']}{Colors.RESET}"
+    print(f"{timestamp} | {colored_level} | {source:<20} | {level_info['emoji']}{message}", file=stream)
+
+
+def _per_call_ns(calls, func):
+    started = time.perf_counter_ns()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter_ns() - started) / calls
+
+
+def run(calls):
+    stream = open(os.devnull, "w", buffering=1)
+    results = {}
+    try:
+        results["legacy_debug"] = _per_call_ns(
+            calls, lambda: _legacy_log(stream, f"🔍 Executing search_read on model: {MODEL} rows {ROWS}", LogLevel.DEBUG)
+        )
+
+        logger.configure(level="INFO", fmt="text", use_queue=False, stream=stream)
+        results["disabled_debug_fstring"] = _per_call_ns(
+            calls, lambda: logger.debug(f"🔍 Executing search_read on model: {MODEL} rows {ROWS}")
+        )
+        results["disabled_debug_lazy"] = _per_call_ns(
+            calls, lambda: logger.debug("🔍 Executing search_read on model: {} rows {}", MODEL, ROWS)
+        )
+
+        results["legacy_info"] = _per_call_ns(
+            calls, lambda: _legacy_log(stream, "✅ Retrieved {} records from {}", LogLevel.INFO, len(ROWS), MODEL)
+        )
+        results["sync_info"] = _per_call_ns(
+            calls, lambda: logger.info("✅ Retrieved {} records from {}", len(ROWS), MODEL)
+        )
+
+        logger.configure(use_queue=True)
+        results["queued_info"] = _per_call_ns(
+            calls, lambda: logger.info("✅ Retrieved {} records from {}", len(ROWS), MODEL)
+        )
+        started = time.perf_counter()
+        logger.flush()
+        results["queue_drain_ms"] = (time.perf_counter() - started) * 1000
+    finally:
+        logger.configure_from_env()
+        logger.configure(stream=sys.stderr)
+        stream.close()
+    return {name: round(value, 1) for name, value in results.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.calls)
+    print(f"{'case':<24} {'ns/call':>10}")
+    for name, value in results.items():
+        if name != "queue_drain_ms":
+            print(f"{name:<24} {value:>10}")
+    print(f"queued lines drained {results['queue_drain_ms']} ms after the loop")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,482 @@
+"""
+A small fake Odoo server for benchmarks.
+
+It serves ``/xmlrpc/2/common``, ``/xmlrpc/2/object`` and ``/jsonrpc`` from
+in-memory synthetic datasets, with enough of ``search_read`` (simple domains,
+fields, limit, order), ``read``, ``fields_get`` and ``read_group`` for the
+clients and tools to run unmodified.
+"""
+
+import datetime
+import json
+import random
+import threading
+import xmlrpc.client
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DB = "bench"
+USERNAME = "admin"
+PASSWORD = "admin"
+UID = 2
+
+MOVE_TYPES = ["out_invoice", "in_invoice", "out_refund", "in_refund", "entry"]
+ACCOUNT_TYPES = ["asset_receivable", "asset_cash", "asset_current", "liability_payable",
+                 "liability_current", "equity", "income", "expense"]
+JOURNALS = [("sale", "INV"), ("purchase", "BILL"), ("bank", "BNK1"), ("cash", "CSH1"),
+            ("general", "MISC"), ("general", "EXCH"), ("general", "CABA")]
+COMPANY = [1, "Bench Company"]
+# Posted entries on or before this date are locked (res.company.fiscalyear_lock_date).
+LOCK_DATE = "2023-12-31"
+CURRENCY = [1, "EUR"]
+
+# Relational fields per model, for fields_get; other fields are typed from their values.
+RELATIONS = {
+    "account.move": {"journal_id": ("many2one", "account.journal"), "partner_id": ("many2one", "res.partner"),
+                     "company_id": ("many2one", "res.company"), "currency_id": ("many2one", "res.currency")},
+    "account.move.line": {"move_id": ("many2one", "account.move"), "account_id": ("many2one", "account.account"),
+                          "company_id": ("many2one", "res.company"),
+                          "partner_id": ("many2one", "res.partner"), "journal_id": ("many2one", "account.journal")},
+    "account.bank.statement.line": {"journal_id": ("many2one", "account.journal"),
+                                    "partner_id": ("many2one", "res.partner"),
+                                    "company_id": ("many2one", "res.company")},
+    "res.partner": {"country_id": ("many2one", "res.country"), "company_id": ("many2one", "res.company"),
+                    "category_id": ("many2many", "res.partner.category"), "user_id": ("many2one", "res.users")},
+    "account.account": {"company_id": ("many2one", "res.company"), "currency_id": ("many2one", "res.currency")},
+    "account.journal": {"company_id": ("many2one", "res.company"), "currency_id": ("many2one", "res.currency"),
+                        "default_account_id": ("many2one", "account.account")},
+    "account.analytic.account": {"partner_id": ("many2one", "res.partner"), "company_id": ("many2one", "res.company"),
+                                 "plan_id": ("many2one", "account.analytic.plan"),
+                                 "root_plan_id": ("many2one", "account.analytic.plan"),
+                                 "group_id": ("many2one", "account.group")},
+}
+
+
+def make_moves(count, seed=0, partners=500):
+    rng = random.Random(seed)
+    start = datetime.date(2020, 1, 1)
+    rows = []
+    for i in range(1, count + 1):
+        date = (start + datetime.timedelta(days=rng.randrange(1800))).isoformat()
+        partner_id = rng.randrange(1, partners + 1)
+        journal_id = rng.randrange(1, len(JOURNALS) + 1)
+        amount_untaxed = round(rng.uniform(10, 40000), 2)
+        amount_total = round(amount_untaxed * 1.2, 2)
+        move_type = rng.choice(MOVE_TYPES)
+        sign = -1 if move_type in ("in_invoice", "out_refund") else 1
+        rows.append({
+            "id": i,
+            "name": f"INV/{date[:4]}/{i:06d}",
+            "ref": f"REF{rng.randrange(10 ** 6):06d}",
+            "date": date,
+            "invoice_date": date,
+            "invoice_date_due": date,
+            "move_type": move_type,
+            "state": "posted",
+            "amount_untaxed": amount_untaxed,
+            "amount_total": amount_total,
+            "amount_untaxed_signed": sign * amount_untaxed,
+            "amount_total_signed": sign * amount_total,
+            "amount_residual": 0.0,
+            "journal_id": [journal_id, f"Journal {journal_id}"],
+            "partner_id": [partner_id, f"Partner {partner_id}"],
+            "company_id": COMPANY,
+            "currency_id": CURRENCY,
+            "payment_state": rng.choice(["paid", "not_paid", "partial"]),
+            "write_date": f"{date} 12:00:00",
+        })
+    return rows
+
+
+def make_move_lines(moves, accounts=200):
+    """
+    Two balanced journal items (debit and credit) per move. Items on
+    receivable and payable accounts of moves that are not paid stay open,
+    with their balance as residual.
+    """
+    rows = []
+    for move in moves:
+        amount = abs(move["amount_total"])
+        for side in (0, 1):
+            account_id = (move["id"] * 7 + side * 3) % accounts + 1
+            balance = amount if side == 0 else -amount
+            reconcilable = ACCOUNT_TYPES[account_id % len(ACCOUNT_TYPES)] in ("asset_receivable", "liability_payable")
+            residual = balance if reconcilable and move["payment_state"] != "paid" else 0.0
+            rows.append({
+                "id": len(rows) + 1,
+                "move_id": [move["id"], move["name"]],
+                "move_name": move["name"],
+                "name": move["name"],
+                "ref": move["ref"],
+                "date": move["date"],
+                "date_maturity": move["invoice_date_due"],
+                "parent_state": move["state"],
+                "account_id": [account_id, f"Account {account_id}"],
+                "partner_id": move["partner_id"],
+                "journal_id": move["journal_id"],
+                "company_id": move["company_id"],
+                "debit": amount if side == 0 else 0.0,
+                "credit": amount if side == 1 else 0.0,
+                "balance": balance,
+                "amount_residual": residual,
+                "reconciled": reconcilable and not residual,
+                "write_date": move["write_date"],
+            })
+    return rows
+
+
+def make_statement_lines(move_lines, count, seed=2):
+    """
+    Unreconciled bank statement lines paying open journal items: mostly one
+    item each (a third of them citing its move's number), some several items
+    of one partner due within a month at once, and some matching nothing.
+    """
+    rng = random.Random(seed)
+    items = [line for line in move_lines if line["amount_residual"]]
+    rng.shuffle(items)
+    by_partner = {}
+    for item in items:
+        by_partner.setdefault((item["partner_id"][0], item["amount_residual"] > 0), []).append(item)
+    taken = set()
+    rows = []
+    for i in range(1, count + 1):
+        while items and items[-1]["id"] in taken:
+            items.pop()
+        kind = rng.random()
+        paid = [items.pop()] if items and kind < 0.9 else []
+        if paid and kind >= 0.75:
+            group = by_partner[(paid[0]["partner_id"][0], paid[0]["amount_residual"] > 0)]
+            due = datetime.date.fromisoformat(paid[0]["date_maturity"])
+            paid += [other for other in group if other is not paid[0] and other["id"] not in taken
+                     and abs((datetime.date.fromisoformat(other["date_maturity"]) - due).days) <= 30][:rng.randrange(1, 3)]
+        taken.update(item["id"] for item in paid)
+        day = datetime.date.fromisoformat(max(item["date_maturity"] for item in paid) if paid else "2024-06-01")
+        date = (day + datetime.timedelta(days=rng.randrange(0, 30))).isoformat()
+        amount = round(sum(item["amount_residual"] for item in paid), 2) or round(rng.uniform(-5000, 5000), 2)
+        with_ref = len(paid) == 1 and rng.random() < 0.33
+        rows.append({
+            "id": i,
+            "date": date,
+            "amount": amount,
+            "payment_ref": f"Payment {paid[0]['move_name']}" if with_ref else f"Transfer {rng.randrange(10 ** 6):06d}",
+            "partner_id": paid[0]["partner_id"] if paid and rng.random() < 0.8 else False,
+            "journal_id": [3, "Journal 3"],
+            "company_id": COMPANY,
+            "is_reconciled": False,
+            "write_date": f"{date} 12:00:00",
+        })
+    return rows
+
+
+def make_partners(count, seed=1):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(1, count + 1):
+        rows.append({
+            "id": i,
+            "name": f"Partner {i}",
+            "display_name": f"Partner {i}",
+            "email": f"partner{i}@example.com",
+            "phone": f"+1 555 {i:07d}",
+            "mobile": False,
+            "vat": f"BE0{rng.randrange(10 ** 9):09d}",
+            "street": f"{i} Bench Street",
+            "city": rng.choice(["Brussels", "Paris", "Berlin", "Madrid"]),
+            "zip": f"{rng.randrange(1000, 9999)}",
+            "country_id": [1, "Belgium"],
+            "is_company": True,
+            "customer_rank": rng.randrange(0, 3),
+            "supplier_rank": rng.randrange(0, 3),
+            "company_id": COMPANY,
+            "category_id": [],
+            "user_id": False,
+            "write_date": "2024-01-01 12:00:00",
+        })
+    return rows
+
+
+def make_accounts(count):
+    rows = []
+    for i in range(1, count + 1):
+        account_type = ACCOUNT_TYPES[i % len(ACCOUNT_TYPES)]
+        rows.append({
+            "id": i,
+            "code": f"{100000 + i}",
+            "name": f"Account {i}",
+            "display_name": f"{100000 + i} Account {i}",
+            "account_type": account_type,
+            "company_id": COMPANY,
+            "currency_id": False,
+            "reconcile": account_type in ("asset_receivable", "liability_payable"),
+            "write_date": "2024-01-01 12:00:00",
+        })
+    return rows
+
+
+def make_journals():
+    return [{
+        "id": i,
+        "name": f"Journal {i}",
+        "display_name": f"Journal {i}",
+        "type": journal_type,
+        "code": code,
+        "active": True,
+        "company_id": COMPANY,
+        "currency_id": False,
+        "default_account_id": [i, f"Account {i}"],
+        "sequence": i,
+        "write_date": "2024-01-01 12:00:00",
+    } for i, (journal_type, code) in enumerate(JOURNALS, start=1)]
+
+
+def make_analytic_accounts(count=50):
+    return [{
+        "id": i,
+        "name": f"Project {i}",
+        "code": f"AA{i:03d}",
+        "partner_id": False,
+        "group_id": False,
+        "company_id": COMPANY,
+        "active": True,
+        "balance": 0.0,
+        "plan_id": [1, "Projects"],
+        "root_plan_id": [1, "Projects"],
+        "write_date": "2024-01-01 12:00:00",
+    } for i in range(1, count + 1)]
+
+
+def make_companies():
+    return [{
+        "id": COMPANY[0],
+        "name": COMPANY[1],
+        "display_name": COMPANY[1],
+        "currency_id": CURRENCY,
+        "fiscalyear_lock_date": LOCK_DATE,
+        "write_date": "2024-01-01 12:00:00",
+    }]
+
+
+def make_datasets(moves=1000, partners=500, accounts=200, move_lines=True, statement_lines=0):
+    """
+    Build the synthetic datasets: ``moves`` account.move rows (plus two
+    account.move.line rows each when ``move_lines``, and ``statement_lines``
+    account.bank.statement.line rows paying some of them), ``partners``
+    res.partner rows, ``accounts`` account.account rows, and fixed journals,
+    analytic accounts and company (locked up to LOCK_DATE).
+    """
+    account_moves = make_moves(moves, partners=max(partners, 1))
+    datasets = {
+        "account.move": account_moves,
+        "res.partner": make_partners(partners),
+        "account.account": make_accounts(accounts),
+        "account.journal": make_journals(),
+        "account.analytic.account": make_analytic_accounts(),
+        "res.company": make_companies(),
+    }
+    if move_lines:
+        datasets["account.move.line"] = make_move_lines(account_moves, max(accounts, 1))
+        datasets["account.bank.statement.line"] = make_statement_lines(datasets["account.move.line"], statement_lines)
+    return datasets
+
+
+def _field_type(model, field, value):
+    if field in RELATIONS.get(model, {}):
+        return RELATIONS[model][field]
+    if isinstance(value, bool):
+        return "boolean", None
+    if isinstance(value, int):
+        return "integer", None
+    if isinstance(value, float):
+        return "float", None
+    if field == "date" or field.endswith("_date") or field.startswith("date_"):
+        return ("datetime" if field == "write_date" else "date"), None
+    return "char", None
+
+
+def _group_key(row, spec):
+    field, _, granularity = spec.partition(":")
+    value = row.get(field)
+    if granularity and value:
+        day = datetime.date.fromisoformat(value[:10])
+        if granularity == "day":
+            return day.strftime("%d %b %Y")
+        if granularity == "week":
+            return f"W{day.isocalendar()[1]:02d} {day.isocalendar()[0]}"
+        if granularity == "month":
+            return day.strftime("%B %Y")
+        if granularity == "quarter":
+            return f"Q{(day.month - 1) // 3 + 1} {day.year}"
+        return str(day.year)
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def _matches(row, condition):
+    field, operator, value = condition
+    current = row.get(field)
+    if isinstance(current, list) and len(current) == 2 and isinstance(current[0], int):
+        current = current[0]  # many2one compares on id
+    if operator == "=":
+        return current == value
+    if operator == "!=":
+        return current != value
+    if operator == ">":
+        return current is not None and current > value
+    if operator == ">=":
+        return current is not None and current >= value
+    if operator == "<":
+        return current is not None and current < value
+    if operator == "<=":
+        return current is not None and current <= value
+    if operator == "in":
+        return current in value
+    if operator == "not in":
+        return current not in value
+    if operator == "ilike":
+        return str(value).lower() in str(current or "").lower()
+    raise ValueError(f"Unsupported operator in mock Odoo: {operator}")
+
+
+class MockOdoo:
+    """The model layer behind the HTTP handler; datasets map model -> rows."""
+
+    def __init__(self, datasets):
+        self.datasets = datasets
+
+    def search(self, model, domain, order=None):
+        rows = [
+            row for row in self.datasets.get(model, [])
+            if all(_matches(row, condition) for condition in domain if isinstance(condition, (list, tuple)))
+        ]
+        if order:
+            for part in reversed(order.split(",")):
+                field, _, direction = part.strip().partition(" ")
+                rows.sort(key=lambda row: row.get(field) or 0, reverse=direction.lower() == "desc")
+        return rows
+
+    def read_group(self, model, domain, fields, groupby, offset=0, limit=None, orderby=None, lazy=True):
+        groupby = [groupby] if isinstance(groupby, str) else list(groupby)
+        if lazy:
+            groupby = groupby[:1]
+        aggregates = [spec.split(":")[0] for spec in fields if ":" in spec]
+        groups = {}
+        for row in self.search(model, domain):
+            key = tuple(_group_key(row, spec) for spec in groupby)
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {"__count": 0, **{field: 0.0 for field in aggregates}}
+                for spec, value in zip(groupby, key):
+                    group[spec] = list(value) if isinstance(value, tuple) else value
+                group["__domain"] = domain
+            group["__count"] += 1
+            for field in aggregates:
+                group[field] += row.get(field) or 0.0
+        result = list(groups.values())
+        result = result[offset or 0:]
+        return result[:limit] if limit else result
+
+    def execute_kw(self, db, uid, password, model, method, args, kwargs=None):
+        kwargs = kwargs or {}
+        if uid != UID or password != PASSWORD:
+            raise xmlrpc.client.Fault(3, "Access Denied")
+        if method == "search_read":
+            domain = args[0] if args else kwargs.get("domain", [])
+            rows = self.search(model, domain, kwargs.get("order"))
+            rows = rows[kwargs.get("offset") or 0:]
+            if kwargs.get("limit"):
+                rows = rows[:kwargs["limit"]]
+            fields = kwargs.get("fields")
+            if fields:
+                rows = [{"id": row["id"], **{f: row.get(f, False) for f in fields}} for row in rows]
+            return rows
+        if method == "read":
+            ids = set(args[0])
+            fields = kwargs.get("fields")
+            rows = [row for row in self.datasets.get(model, []) if row["id"] in ids]
+            if fields:
+                rows = [{"id": row["id"], **{f: row.get(f, False) for f in fields}} for row in rows]
+            return rows
+        if method == "fields_get":
+            sample = self.datasets.get(model, [{}])[0] if self.datasets.get(model) else {}
+            definitions = {}
+            for field, value in sample.items():
+                field_type, relation = _field_type(model, field, value)
+                definitions[field] = {"string": field.replace("_", " ").title(), "type": field_type}
+                if relation:
+                    definitions[field]["relation"] = relation
+            return definitions
+        if method == "read_group":
+            return self.read_group(model, *args, **kwargs)
+        if method == "search":
+            return [row["id"] for row in self.search(model, args[0] if args else [], kwargs.get("order"))]
+        if method == "search_count":
+            return len(self.search(model, args[0] if args else []))
+        raise xmlrpc.client.Fault(2, f"Method {method} is not supported by mock Odoo")
+
+    def dispatch(self, service, method, args):
+        if service == "common" and method == "authenticate":
+            db, username, password = args[:3]
+            return UID if (db, username, password) == (DB, USERNAME, PASSWORD) else False
+        if service == "common" and method == "version":
+            return {"server_version": "17.0", "server_serie": "17.0"}
+        if service == "object" and method == "execute_kw":
+            return self.execute_kw(*args)
+        raise xmlrpc.client.Fault(2, f"Unknown method {service}.{method}")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.server.latency:
+            threading.Event().wait(self.server.latency)
+        if self.path.startswith("/xmlrpc/2/"):
+            payload = self._xmlrpc(self.path.rsplit("/", 1)[-1], body)
+            content_type = "text/xml"
+        elif self.path == "/jsonrpc":
+            payload = self._jsonrpc(body)
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _xmlrpc(self, service, body):
+        args, method = xmlrpc.client.loads(body)
+        try:
+            result = xmlrpc.client.dumps((self.server.odoo.dispatch(service, method, args),), methodresponse=True, allow_none=True)
+        except xmlrpc.client.Fault as fault:
+            result = xmlrpc.client.dumps(fault, allow_none=True)
+        return result.encode()
+
+    def _jsonrpc(self, body):
+        request = json.loads(body)
+        params = request["params"]
+        try:
+            response = {"jsonrpc": "2.0", "id": request.get("id"),
+                        "result": self.server.odoo.dispatch(params["service"], params["method"], params["args"])}
+        except xmlrpc.client.Fault as fault:
+            name = "odoo.exceptions.AccessDenied" if fault.faultCode == 3 else "odoo.exceptions.UserError"
+            response = {"jsonrpc": "2.0", "id": request.get("id"),
+                        "error": {"code": 200, "message": "Odoo Server Error",
+                                  "data": {"name": name, "message": fault.faultString}}}
+        return json.dumps(response).encode()
+
+
+def start_mock_odoo(datasets=None, latency=0.0, host="127.0.0.1", port=0):
+    """Start the mock in a daemon thread and return the server (``server.url`` is its base URL)."""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.odoo = MockOdoo(datasets if datasets is not None else make_datasets())
+    server.latency = latency
+    server.url = f"http://{host}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
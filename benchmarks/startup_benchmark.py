@@ -0,0 +1,127 @@
+"""
+Measure how fast the stdio MCP server starts.
+
+- import time of ``mcp_server`` (what stdio mode loads), ``server`` (the
+  FastAPI app with every tool) and ``main``, each in a fresh interpreter,
+  plus whether FastAPI ended up imported;
+- time from spawning ``python main.py`` to the ``initialize`` response;
+- latency of the first ``tools/call`` after the handshake, against the mock
+  Odoo, once the background login has had ``--settle`` seconds to finish.
+
+    python -m benchmarks.startup_benchmark --runs 10 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.mock_odoo import DB, PASSWORD, USERNAME, make_datasets, start_mock_odoo
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORT_TARGETS = ["mcp_server", "server", "main"]
+PROTOCOL_VERSION = "2024-11-05"
+
+
+def import_time(module, env):
+    """Seconds to import ``module`` in a fresh interpreter, and whether FastAPI got imported."""
+    code = (
+        "import sys, time\n"
+        "started = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(time.perf_counter() - started, 'fastapi' in sys.modules, len(sys.modules))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True,
+                            text=True, check=True).stdout.split()
+    return float(output[-3]), output[-2] == "True", int(output[-1])
+
+
+def _send(process, message):
+    process.stdin.write(json.dumps(message) + "\n")
+    process.stdin.flush()
+
+
+def _receive(process, request_id):
+    while True:
+        line = process.stdout.readline()
+        if not line:
+            raise RuntimeError("MCP server exited before answering")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def handshake(env, settle, tool):
+    """Return (seconds to the initialize response, seconds for the first tool call)."""
+    started = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "main.py"], cwd=ROOT, env=env, text=True,
+                               stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        _send(process, {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "startup-benchmark", "version": "0"},
+        }})
+        _receive(process, 1)
+        initialized = time.perf_counter() - started
+        _send(process, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+        time.sleep(settle)
+        started = time.perf_counter()
+        _send(process, {"jsonrpc": "2.0", "id": 2, "method": "tools/call",
+                        "params": {"name": tool, "arguments": {}}})
+        _receive(process, 2)
+        return initialized, time.perf_counter() - started
+    finally:
+        process.stdin.close()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def _ms(values):
+    return {"median_ms": round(statistics.median(values) * 1000, 1), "max_ms": round(max(values) * 1000, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--settle", type=float, default=1.0,
+                        help="seconds between the handshake and the first tool call")
+    parser.add_argument("--tool", default="get_journals", help="tool called after the handshake")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    server = start_mock_odoo(make_datasets(moves=200, partners=50, accounts=50))
+    env = dict(os.environ, ODOO_URL=server.url, ODOO_DB=DB, ODOO_USERNAME=USERNAME, ODOO_PASSWORD=PASSWORD,
+               ODOO_LOG_LEVEL="ERROR")
+    env.pop("ODOO_MIRROR_PATH", None)
+
+    results = {"imports": {}}
+    for module in IMPORT_TARGETS:
+        samples = [import_time(module, env) for _ in range(args.runs)]
+        results["imports"][module] = {
+            **_ms([seconds for seconds, _, _ in samples]),
+            "imports_fastapi": samples[0][1],
+            "modules": samples[0][2],
+        }
+    samples = [handshake(env, args.settle, args.tool) for _ in range(args.runs)]
+    results["initialize"] = _ms([initialize for initialize, _ in samples])
+    results["first_tool_call"] = _ms([call for _, call in samples])
+
+    print(f"{'import':<24} {'median ms':>10} {'max ms':>10} {'modules':>8}  fastapi")
+    for module, row in results["imports"].items():
+        print(f"{module:<24} {row['median_ms']:>10} {row['max_ms']:>10} {row['modules']:>8}  {row['imports_fastapi']}")
+    for name in ("initialize", "first_tool_call"):
+        print(f"{name:<24} {results[name]['median_ms']:>10} {results[name]['max_ms']:>10}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Latency and throughput benchmark for the MCP tools and FastAPI endpoints.
+
+Starts the mock Odoo in a separate process (so its memory does not count
+towards this process' RSS), points the server at it through ODOO_URL & co,
+then drives every tool function and every ``/mcp/odoo/*`` endpoint (in
+process, through httpx's ASGI transport) at each requested concurrency.
+
+For every (target, case, concurrency) it reports p50/p95/p99 latency,
+throughput and the peak RSS of this process so far, and can save the run as
+JSON and compare it with a previous run:
+
+    python -m benchmarks.suite --moves 20000 --partners 2000 --accounts 500 \\
+        --latency-ms 5 --concurrency 1 8 32 --json after.json --baseline before.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import math
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import threading
+import time
+
+from benchmarks.mock_odoo import DB, PASSWORD, USERNAME, make_datasets, start_mock_odoo
+
+BATCH_QUERIES = [
+    {"key": "accounts", "model": "account.account", "fields": ["code", "name"], "limit": 100},
+    {"key": "journals", "model": "account.journal", "fields": ["name", "type"]},
+    {"key": "partners", "model": "res.partner", "fields": ["name", "email"], "limit": 100},
+    {"key": "invoices", "model": "account.move", "domain": [["state", "=", "posted"]],
+     "fields": ["name", "amount_total"], "limit": 100},
+]
+
+
+def tool_cases(limit):
+    """Name -> zero-argument coroutine factory for every MCP tool."""
+    from mcp_server import handlers
+
+    return {
+        "get_recent_journal_entries": lambda: handlers["get_recent_journal_entries"](limit=limit),
+        "get_invoices": lambda: handlers["get_invoices"](limit=limit),
+        "get_chart_of_accounts": lambda: handlers["get_chart_of_accounts"](limit=limit),
+        "get_partners": lambda: handlers["get_partners"](limit=limit),
+        "get_journals": lambda: handlers["get_journals"](limit=limit),
+        "get_analytic_accounts": lambda: handlers["get_analytic_accounts"](limit=limit),
+        "get_invoice_totals": lambda: handlers["get_invoice_totals"](),
+        "get_move_totals": lambda: handlers["get_move_totals"](),
+        "get_account_balances": lambda: handlers["get_account_balances"](),
+        "batch_query": lambda: handlers["batch_query"](queries=BATCH_QUERIES),
+    }
+
+
+def endpoint_cases(limit):
+    """Name -> (method, path, json body) for every FastAPI route."""
+    return {
+        "/mcp/odoo/accounting": ("GET", f"/mcp/odoo/accounting?limit={limit}", None),
+        "/mcp/odoo/invoices": ("GET", f"/mcp/odoo/invoices?limit={limit}", None),
+        "/mcp/odoo/accounts": ("GET", f"/mcp/odoo/accounts?limit={limit}", None),
+        "/mcp/odoo/partners": ("GET", f"/mcp/odoo/partners?limit={limit}", None),
+        "/mcp/odoo/journals": ("GET", f"/mcp/odoo/journals?limit={limit}", None),
+        "/mcp/odoo/analytic_accounts": ("GET", f"/mcp/odoo/analytic_accounts?limit={limit}", None),
+        "/mcp/odoo/invoices?fields=minimal": ("GET", f"/mcp/odoo/invoices?limit={limit}&fields=minimal", None),
+        "/mcp/odoo/invoices?response_format=columns": ("GET", f"/mcp/odoo/invoices?limit={limit}&response_format=columns", None),
+        "/mcp/odoo/invoices?stream": ("GET", f"/mcp/odoo/invoices?limit={limit}&stream=true", None),
+        "/mcp/odoo/aggregates/invoices": ("GET", "/mcp/odoo/aggregates/invoices", None),
+        "/mcp/odoo/aggregates/moves": ("GET", "/mcp/odoo/aggregates/moves", None),
+        "/mcp/odoo/aggregates/account_balances": ("GET", "/mcp/odoo/aggregates/account_balances", None),
+        "/mcp/odoo/batch": ("POST", "/mcp/odoo/batch", BATCH_QUERIES),
+    }
+
+
+def _serve(dataset_sizes, latency, ready):
+    server = start_mock_odoo(make_datasets(**dataset_sizes), latency)
+    ready.put(server.url)
+    threading.Event().wait()
+
+
+def start_mock_process(dataset_sizes, latency):
+    """Run the mock Odoo in a child process; returns (process, url)."""
+    ready = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(dataset_sizes, latency, ready), daemon=True)
+    process.start()
+    return process, ready.get(timeout=300)
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if platform.system() == "Darwin" else 1024), 1)
+
+
+async def drive(call, requests, concurrency):
+    """
+    Issue ``requests`` calls from ``concurrency`` workers; ``call`` returns
+    True on success. Returns (sorted latencies in seconds, errors, wall time).
+    """
+    latencies = []
+    errors = 0
+    issued = 0
+
+    async def worker():
+        nonlocal issued, errors
+        while issued < requests:
+            issued += 1
+            started = time.perf_counter()
+            try:
+                ok = await call()
+            except Exception:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return sorted(latencies), errors, time.perf_counter() - started
+
+
+def summarize(target, case, concurrency, latencies, errors, wall):
+    def ms(value):
+        return round(value * 1000, 3) if value is not None else None
+
+    return {
+        "target": target,
+        "case": case,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p95_ms": ms(percentile(latencies, 0.95)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+async def run_tools(cases, requests, concurrencies, warmup):
+    results = []
+    for name, factory in cases.items():
+        async def call():
+            result = await factory()
+            return result.get("success", True)
+
+        await drive(call, warmup, 1)
+        for concurrency in concurrencies:
+            results.append(summarize("tool", name, concurrency, *await drive(call, requests, concurrency)))
+            print_row(results[-1])
+    return results
+
+
+async def run_endpoints(cases, requests, concurrencies, warmup):
+    import httpx
+    from server import app
+
+    results = []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, (method, path, body) in cases.items():
+            async def call():
+                response = await client.request(method, path, json=body)
+                await response.aread()
+                return response.status_code == 200
+
+            await drive(call, warmup, 1)
+            for concurrency in concurrencies:
+                results.append(summarize("endpoint", name, concurrency, *await drive(call, requests, concurrency)))
+                print_row(results[-1])
+    return results
+
+
+def print_header():
+    print(f"{'target':<9} {'case':<40} {'conc':>5} {'reqs':>6} {'err':>4} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'rss MB':>8}")
+
+
+def print_row(row):
+    print(f"{row['target']:<9} {row['case']:<40} {row['concurrency']:>5} {row['requests']:>6} {row['errors']:>4} "
+          f"{row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9} {row['throughput_rps']:>9} {row['peak_rss_mb']:>8}")
+
+
+def compare(results, baseline_path):
+    """Print the change in p50, p95 and throughput against a previous run."""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    previous = {(row["target"], row["case"], row["concurrency"]): row for row in baseline["results"]}
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('commit') or 'unknown commit'}):")
+    print(f"{'target':<9} {'case':<40} {'conc':>5} {'p50':>8} {'p95':>8} {'req/s':>8}")
+
+    def change(new, old):
+        if not old or new is None:
+            return "n/a"
+        return f"{(new - old) / old * 100:+.1f}%"
+
+    for row in results:
+        old = previous.get((row["target"], row["case"], row["concurrency"]))
+        if old is None:
+            continue
+        print(f"{row['target']:<9} {row['case']:<40} {row['concurrency']:>5} "
+              f"{change(row['p50_ms'], old['p50_ms']):>8} {change(row['p95_ms'], old['p95_ms']):>8} "
+              f"{change(row['throughput_rps'], old['throughput_rps']):>8}")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--moves", type=int, default=5000, help="account.move rows (two account.move.line rows each)")
+    parser.add_argument("--partners", type=int, default=1000, help="res.partner rows")
+    parser.add_argument("--accounts", type=int, default=300, help="account.account rows")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency injected into every mock Odoo request")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=200, help="calls per case and concurrency level")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured calls per case before measuring")
+    parser.add_argument("--limit", type=int, default=100, help="limit passed to the record tools and routes")
+    parser.add_argument("--targets", nargs="+", choices=["tools", "endpoints"], default=["tools", "endpoints"])
+    parser.add_argument("--transport", choices=["xmlrpc", "jsonrpc"], default="xmlrpc")
+    parser.add_argument("--no-cache", action="store_true", help="disable the reference data cache")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--baseline", help="previous --json output to compare against")
+    args = parser.parse_args()
+
+    dataset_sizes = {"moves": args.moves, "partners": args.partners, "accounts": args.accounts}
+    process, url = start_mock_process(dataset_sizes, args.latency_ms / 1000)
+    os.environ.update(ODOO_URL=url, ODOO_DB=DB, ODOO_USERNAME=USERNAME, ODOO_PASSWORD=PASSWORD,
+                      ODOO_TRANSPORT=args.transport)
+    if args.no_cache:
+        os.environ["ODOO_CACHE_TTLS"] = "account.account=0,account.journal=0,account.analytic.account=0"
+    os.environ.pop("ODOO_MIRROR_PATH", None)
+
+    import logger
+    logger.configure(level="ERROR")
+
+    async def run():
+        results = []
+        if "tools" in args.targets:
+            results += await run_tools(tool_cases(args.limit), args.requests, args.concurrency, args.warmup)
+        if "endpoints" in args.targets:
+            results += await run_endpoints(endpoint_cases(args.limit), args.requests, args.concurrency, args.warmup)
+        return results
+
+    print_header()
+    try:
+        results = asyncio.run(run())
+    finally:
+        process.terminate()
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "datasets": dataset_sizes,
+            "latency_ms": args.latency_ms,
+            "transport": args.transport,
+            "requests": args.requests,
+            "limit": args.limit,
+            "cache": not args.no_cache,
+        },
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Compare the XML-RPC and JSON-RPC transports on large account.move payloads.
+
+For each payload size this fetches the raw ``search_read`` response from the
+mock Odoo once per transport, then measures how long decoding it takes and
+its peak allocation (tracemalloc), plus the end-to-end ``search_read`` time
+through OdooClient.
+
+    python -m benchmarks.transport_benchmark --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+import urllib.request
+import xmlrpc.client
+
+from benchmarks.mock_odoo import DB, PASSWORD, UID, USERNAME, make_datasets, start_mock_odoo
+from odoo_client import OdooClient, json_loads, _jsonrpc_payload
+
+FIELDS = ["name", "date", "move_type", "amount_total", "journal_id", "partner_id", "invoice_date", "payment_state"]
+
+
+def _raw_response(url, transport, limit):
+    args = (DB, UID, PASSWORD, "account.move", "search_read", [[]], {"fields": FIELDS, "limit": limit})
+    if transport == "xmlrpc":
+        body = xmlrpc.client.dumps(args, "execute_kw", allow_none=True).encode()
+        request = urllib.request.Request(f"{url}/xmlrpc/2/object", body, {"Content-Type": "text/xml"})
+    else:
+        body = _jsonrpc_payload("object", "execute_kw", args, 1)
+        request = urllib.request.Request(f"{url}/jsonrpc", body, {"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return response.read()
+
+
+def _decode(transport, payload):
+    if transport == "xmlrpc":
+        return xmlrpc.client.loads(payload)[0][0]
+    return json_loads(payload)["result"]
+
+
+def _best_of(repeat, func):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(sizes, repeat):
+    server = start_mock_odoo(make_datasets(moves=max(sizes), move_lines=False))
+    results = []
+    try:
+        for size in sizes:
+            for transport in ("xmlrpc", "jsonrpc"):
+                payload = _raw_response(server.url, transport, size)
+                decode_seconds = _best_of(repeat, lambda: _decode(transport, payload))
+
+                tracemalloc.start()
+                _decode(transport, payload)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                client = OdooClient(server.url, DB, USERNAME, PASSWORD, pool_size=1, transport=transport)
+                end_to_end_seconds = _best_of(
+                    repeat, lambda: client.search_read("account.move", [], FIELDS, limit=size)
+                )
+                client.close()
+
+                results.append({
+                    "rows": size,
+                    "transport": transport,
+                    "payload_bytes": len(payload),
+                    "decode_ms": round(decode_seconds * 1000, 2),
+                    "decode_peak_mb": round(peak / 1024 / 1024, 2),
+                    "search_read_ms": round(end_to_end_seconds * 1000, 2),
+                })
+    finally:
+        server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.repeat)
+    print(f"{'rows':>8} {'transport':>9} {'payload MB':>11} {'decode ms':>10} {'peak MB':>8} {'search_read ms':>15}")
+    for row in results:
+        print(f"{row['rows']:>8} {row['transport']:>9} {row['payload_bytes'] / 1024 / 1024:>11.2f} "
+              f"{row['decode_ms']:>10} {row['decode_peak_mb']:>8} {row['search_read_ms']:>15}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import datetime
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from logger import info, success, warning, error, debug
+
+# Reference data that almost never changes within a conversation.
+DEFAULT_TTLS = {
+    "account.account": 3600,
+    "account.journal": 3600,
+    "account.analytic.account": 900,
+    # lock dates, read before every snapshot lookup
+    "res.company": 300,
+}
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# Odoo stamps write_date on the server, so look back a little to absorb clock skew.
+SNAPSHOT_SKEW = datetime.timedelta(seconds=60)
+
+HIT = "hit"
+STALE = "stale"
+MISS = "miss"
+
+
+def _parse_ttls(value):
+    ttls = {}
+    for item in value.split(","):
+        if "=" in item:
+            model, seconds = item.split("=", 1)
+            ttls[model.strip()] = float(seconds)
+    return ttls
+
+
+def snapshot_time():
+    """Return the write_date watermark for a fetch that starts now."""
+    return (datetime.datetime.now(datetime.timezone.utc) - SNAPSHOT_SKEW).strftime("%Y-%m-%d %H:%M:%S")
+
+
+class _Entry:
+    __slots__ = ("model", "rows", "size", "fetched_at", "snapshot")
+
+    def __init__(self, model, rows, size, snapshot):
+        self.model = model
+        self.rows = rows
+        self.size = size
+        self.fetched_at = time.monotonic()
+        self.snapshot = snapshot
+
+
+class ResultCache:
+    """
+    TTL + LRU cache for search_read results.
+
+    Only models with a TTL are cached. Entries are evicted least recently
+    used first once their estimated JSON size exceeds ``max_bytes``. Expired
+    entries are kept until evicted, so a client can revalidate them by
+    ``write_date`` instead of fetching them again.
+    """
+
+    def __init__(self, ttls=None, max_bytes=DEFAULT_MAX_BYTES, revalidate=False):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_bytes = max_bytes
+        self.revalidate = revalidate
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+        self._size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        ttls = dict(DEFAULT_TTLS)
+        ttls.update(_parse_ttls(os.environ.get("ODOO_CACHE_TTLS", "")))
+        return cls(
+            ttls={model: ttl for model, ttl in ttls.items() if ttl > 0},
+            max_bytes=int(os.environ.get("ODOO_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+            revalidate=os.environ.get("ODOO_CACHE_REVALIDATE", "").lower() in ("1", "true", "yes"),
+        )
+
+    def caches(self, model):
+        return model in self.ttls
+
+    @staticmethod
+    def key(db, uid, model, domain, fields, limit, order):
+        """Build a key that ignores field order and tuple-vs-list differences in the domain."""
+        normalized = json.dumps(
+            [model, domain, sorted(fields) if fields else None, limit or None, order],
+            default=str,
+        )
+        return (db, uid, normalized)
+
+    def lookup(self, key):
+        """Return ``(rows, snapshot, state)``; rows are copies the caller may modify."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, None, MISS
+            self._entries.move_to_end(key)
+            if time.monotonic() - entry.fetched_at < self.ttls.get(entry.model, 0):
+                self.hits += 1
+                return [dict(row) for row in entry.rows], entry.snapshot, HIT
+            if not self.revalidate:
+                self.misses += 1
+                return None, None, MISS
+            return [dict(row) for row in entry.rows], entry.snapshot, STALE
+
+    def record_revalidation(self, refreshed):
+        with self._lock:
+            if refreshed:
+                self.revalidations += 1
+            else:
+                self.misses += 1
+
+    def put(self, key, model, rows, snapshot):
+        size = len(json.dumps(rows, default=str))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old.size
+            self._entries[key] = _Entry(model, [dict(row) for row in rows], size, snapshot)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= evicted.size
+                self.evictions += 1
+
+    def invalidate(self, model=None):
+        """Drop every entry for ``model``, or the whole cache when no model is given."""
+        with self._lock:
+            for key in [k for k, entry in self._entries.items() if model is None or entry.model == model]:
+                self._size -= self._entries.pop(key).size
+        debug("🧹 Invalidated cache for {}", model or 'all models')
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._size,
+            }
+
+
+def can_revalidate(rows, limit):
+    """A result truncated by ``limit`` cannot be patched: new records may sort into it."""
+    return not (limit and len(rows) >= limit)
+
+
+def merge_changes(rows, changed, count):
+    """
+    Apply records changed since a snapshot to the cached rows.
+
+    Returns the merged rows, or None when the cached result cannot be patched
+    and must be fetched again: a new record appeared, or records were deleted
+    (``count`` no longer matches).
+    """
+    by_id = {row["id"]: index for index, row in enumerate(rows)}
+    for record in changed:
+        if record["id"] not in by_id:
+            return None
+        rows[by_id[record["id"]]] = record
+    if count != len(rows):
+        return None
+    return rows
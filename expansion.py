@@ -0,0 +1,84 @@
+import asyncio
+from logger import info, success, warning, error, debug
+
+RELATIONAL_TYPES = ("many2one", "many2many", "one2many")
+
+# Compact field sets for expanded records; models not listed only get display_name.
+EXPAND_FIELDS = {
+    "res.partner": ["name", "email", "phone", "vat", "city", "country_id", "is_company"],
+    "res.partner.category": ["name"],
+    "res.company": ["name", "currency_id"],
+    "res.currency": ["name", "symbol"],
+    "res.country": ["name", "code"],
+    "res.users": ["name", "login"],
+    "account.journal": ["name", "code", "type"],
+    "account.account": ["code", "name", "account_type"],
+    "account.analytic.plan": ["name"],
+    "account.group": ["name", "code_prefix_start"],
+}
+
+
+def parse_expand(expand):
+    """Accept a comma-separated string or a list of field names."""
+    if isinstance(expand, str):
+        expand = expand.split(",")
+    return [field.strip() for field in expand or [] if field.strip()]
+
+
+def _referenced_ids(value, field_type):
+    if not value:
+        return []
+    if field_type == "many2one":
+        return [value[0]]
+    return list(value)
+
+
+async def expand_records(odoo, model, records, expand):
+    """
+    Replace relational values in ``records`` with the related records.
+
+    All ids referenced by the expanded fields are collected across the whole
+    result set, then each related model is fetched with one batched ``read``.
+    An identity map keyed by (model, id) means a partner referenced by a
+    hundred invoices is fetched and built once and shared by all of them.
+    """
+    fields = parse_expand(expand)
+    if not fields or not records:
+        return records
+
+    schema = await odoo.fields_get(model)
+    wanted = {}
+    for field in fields:
+        definition = schema.get(field)
+        if definition is None or definition.get("type") not in RELATIONAL_TYPES:
+            raise ValueError(f"Cannot expand '{field}': not a relational field of {model}")
+        comodel = definition["relation"]
+        ids = wanted.setdefault(comodel, set())
+        for record in records:
+            ids.update(_referenced_ids(record.get(field), definition["type"]))
+
+    comodels = [comodel for comodel, ids in wanted.items() if ids]
+    debug("🔗 Expanding {} on {} with one read per model: {}", ', '.join(fields), model, ', '.join(comodels))
+    fetched = await asyncio.gather(*(
+        odoo.read(comodel, sorted(wanted[comodel]), EXPAND_FIELDS.get(comodel, ["display_name"]))
+        for comodel in comodels
+    ))
+    identity_map = {
+        (comodel, row["id"]): row
+        for comodel, rows in zip(comodels, fetched)
+        for row in rows
+    }
+
+    for field in fields:
+        definition = schema[field]
+        comodel = definition["relation"]
+        for record in records:
+            value = record.get(field)
+            if not value:
+                continue
+            if definition["type"] == "many2one":
+                record[field] = identity_map.get((comodel, value[0]), value)
+            else:
+                record[field] = [identity_map.get((comodel, record_id), record_id) for record_id in value]
+    success("✅ Expanded {} related records into {} {} records", len(identity_map), len(records), model)
+    return records
@@ -1,16 +1,20 @@
 import sys
 import datetime
-import platform
+import json
 import os
-from enum import Enum, auto
+import queue
+import threading
+import time
+import atexit
+from enum import Enum
 from typing import Any, Optional
 
 class LogLevel(Enum):
-    INFO = auto()
-    SUCCESS = auto()
-    WARNING = auto()
-    ERROR = auto()
-    DEBUG = auto()
+    DEBUG = 10
+    INFO = 20
+    SUCCESS = 25
+    WARNING = 30
+    ERROR = 40
 
 # ANSI color codes
 class Colors:
@@ -22,38 +26,187 @@ class Colors:
     MAGENTA = "\033[35m"
     CYAN = "\033[36m"
 
+SOURCE = "odoo-mcp-server"
+
+# Per-level prefix pieces, built once instead of on every call
+LEVEL_INFO = {
+    LogLevel.INFO: ("🌐 ", f"{Colors.GREEN}INFO{Colors.RESET}", "INFO"),
+    LogLevel.SUCCESS: ("✅ ", f"{Colors.GREEN}INFO{Colors.RESET}", "INFO"),
+    LogLevel.WARNING: ("🚀 ", f"{Colors.YELLOW}WARN{Colors.RESET}", "WARN"),
+    LogLevel.ERROR: ("❌ ", f"{Colors.RED}ERROR{Colors.RESET}", "ERROR"),
+    LogLevel.DEBUG: ("🔍 ", f"{Colors.BLUE}DEBUG{Colors.RESET}", "DEBUG"),
+}
+
+LEVEL_NAMES = {"DEBUG": LogLevel.DEBUG, "INFO": LogLevel.INFO, "SUCCESS": LogLevel.SUCCESS,
+               "WARNING": LogLevel.WARNING, "WARN": LogLevel.WARNING, "ERROR": LogLevel.ERROR}
+
+_STOP = object()
+
+# Plain ints for the level checks in the convenience functions below
+_DEBUG = LogLevel.DEBUG.value
+_INFO = LogLevel.INFO.value
+_SUCCESS = LogLevel.SUCCESS.value
+_WARNING = LogLevel.WARNING.value
+
+
+class QueueWriter:
+    """
+    Background writer for log lines.
+
+    Callers only put a tuple on a SimpleQueue; a daemon thread renders the
+    timestamp and writes whatever has accumulated in one ``write`` + ``flush``,
+    so a burst of log lines costs one syscall instead of one per line.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, record):
+        self._queue.put(record)
+
+    def _run(self):
+        while True:
+            record = self._queue.get()
+            batch, markers = [], []
+            while True:
+                if isinstance(record, tuple):
+                    batch.append(record)
+                else:
+                    markers.append(record)
+                try:
+                    record = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+            for marker in markers:
+                if marker is _STOP:
+                    return
+                marker.set()
+
+    def _write(self, batch):
+        try:
+            self.stream.write("".join(_render(*record) for record in batch))
+            self.stream.flush()
+        except (OSError, ValueError):
+            # stderr closed during shutdown; nothing sensible left to do
+            pass
+
+    def flush(self, timeout=2):
+        if self._thread.is_alive():
+            written = threading.Event()
+            self._queue.put(written)
+            written.wait(timeout)
+
+    def close(self):
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join(timeout=2)
+
+
+def _timestamp(created):
+    return datetime.datetime.fromtimestamp(created).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+
+def _render(created, level, message, json_lines):
+    emoji, colored_level, text = LEVEL_INFO[level]
+    if json_lines:
+        return json.dumps({
+            "ts": _timestamp(created),
+            "level": level.name,
+            "source": SOURCE,
+            "message": message,
+        }, ensure_ascii=False) + "\n"
+    return f"{_timestamp(created)} | {colored_level} | {SOURCE:<20} | {emoji}{message}\n"
+
+
+class _Config:
+    level = LogLevel.INFO.value
+    json_lines = False
+    writer: Optional[QueueWriter] = None
+    stream = sys.stderr
+
+
+_config = _Config()
+
+
+def configure(level: Optional[str] = None, fmt: Optional[str] = None,
+              use_queue: Optional[bool] = None, stream=None) -> None:
+    """
+    Configure the logger. Arguments left as None keep their current value.
+
+    Args:
+        level: Minimum level to emit ("DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR")
+        fmt: "text" for colored lines or "json" for JSON lines
+        use_queue: Write from a background thread (True) or synchronously (False)
+        stream: File object to write to (default: stderr)
+    """
+    if level is not None:
+        _config.level = LEVEL_NAMES[level.upper()].value
+    if fmt is not None:
+        _config.json_lines = fmt.lower() == "json"
+    if stream is not None:
+        _config.stream = stream
+        if _config.writer is not None:
+            _config.writer.close()
+            _config.writer = QueueWriter(stream)
+    if use_queue is not None:
+        if use_queue and _config.writer is None:
+            _config.writer = QueueWriter(_config.stream)
+        elif not use_queue and _config.writer is not None:
+            _config.writer.close()
+            _config.writer = None
+
+
+def configure_from_env() -> None:
+    """Apply ODOO_LOG_LEVEL, ODOO_LOG_FORMAT and ODOO_LOG_QUEUE (DEBUG=True still turns on debug output)."""
+    default_level = "DEBUG" if os.environ.get("DEBUG", "").lower() in ("1", "true", "yes") else "INFO"
+    configure(
+        level=os.environ.get("ODOO_LOG_LEVEL", default_level),
+        fmt=os.environ.get("ODOO_LOG_FORMAT", "text"),
+        use_queue=os.environ.get("ODOO_LOG_QUEUE", "1").lower() not in ("0", "false", "no"),
+    )
+
+
+def is_enabled(level: LogLevel) -> bool:
+    """Return True if messages at ``level`` are emitted; use it to guard expensive log arguments."""
+    return level.value >= _config.level
+
+
+def flush() -> None:
+    """Wait until queued log lines have been written."""
+    writer = _config.writer
+    if writer is not None:
+        writer.flush()
+
+
 def log(message: str, level: LogLevel = LogLevel.INFO, *args: Any, **kwargs: Any) -> None:
     """
     Log a message with timestamp, color, emoji, and source context.
 
+    Nothing is formatted when ``level`` is below the configured minimum, so
+    prefer ``debug("read {} rows", n)`` over ``debug(f"read {n} rows")`` on
+    hot paths.
+
     Args:
         message: The message to log
         level: The log level (INFO, SUCCESS, WARNING, ERROR, DEBUG)
         *args, **kwargs: Additional arguments to format the message with
     """
+    if level.value < _config.level:
+        return
     if args or kwargs:
         message = message.format(*args, **kwargs)
 
-    # Get current timestamp
-    timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-
-    # Source context
-    source = "odoo-mcp-server"
-
-    # Select emoji and color based on log level
-    level_info = {
-        LogLevel.INFO: {"emoji": "🌐 ", "color": Colors.GREEN, "text": "INFO"},
-        LogLevel.SUCCESS: {"emoji": "✅ ", "color": Colors.GREEN, "text": "INFO"},
-        LogLevel.WARNING: {"emoji": "🚀 ", "color": Colors.YELLOW, "text": "WARN"},
-        LogLevel.ERROR: {"emoji": "❌ ", "color": Colors.RED, "text": "ERROR"},
-        LogLevel.DEBUG: {"emoji": "🔍 ", "color": Colors.BLUE, "text": "DEBUG"},
-    }.get(level, {"emoji": "", "color": Colors.RESET, "text": "UNKNOWN"})
-
-    # Format the log level with color
-    colored_level = f"{level_info['color']}{level_info['text']}{Colors.RESET}"
-
-    # Print the formatted message to stderr
-    print(f"{timestamp} | {colored_level} | {source:<20} | {level_info['emoji']}{message}", file=sys.stderr)
+    record = (time.time(), level, message, _config.json_lines)
+    writer = _config.writer
+    if writer is not None:
+        writer.put(record)
+    else:
+        _config.stream.write(_render(*record))
 
 # Utility functions for specialized logging
 def divider(char: str = "=", length: int = 80) -> None:
@@ -68,7 +221,7 @@ def log_startup_header() -> None:
     info("📅 Start time: {}", datetime.datetime.now().isoformat())
     info("🐍 Python version: {}", sys.version)
     info("📁 Working directory: {}", os.getcwd())
-    info("🔧 Logging level: {}", 20)  # INFO level is 20
+    info("🔧 Logging level: {}", LogLevel(_config.level).name)
     divider()
 
 def log_env_check(env_vars: dict) -> None:
@@ -86,15 +239,18 @@ def log_env_check(env_vars: dict) -> None:
 # Convenience functions for different log levels
 def info(message: str, *args: Any, **kwargs: Any) -> None:
     """Log an informational message."""
-    log(message, LogLevel.INFO, *args, **kwargs)
+    if _config.level <= _INFO:
+        log(message, LogLevel.INFO, *args, **kwargs)
 
 def success(message: str, *args: Any, **kwargs: Any) -> None:
     """Log a success message."""
-    log(message, LogLevel.SUCCESS, *args, **kwargs)
+    if _config.level <= _SUCCESS:
+        log(message, LogLevel.SUCCESS, *args, **kwargs)
 
 def warning(message: str, *args: Any, **kwargs: Any) -> None:
     """Log a warning message."""
-    log(message, LogLevel.WARNING, *args, **kwargs)
+    if _config.level <= _WARNING:
+        log(message, LogLevel.WARNING, *args, **kwargs)
 
 def error(message: str, *args: Any, **kwargs: Any) -> None:
     """Log an error message."""
@@ -102,4 +258,14 @@ def error(message: str, *args: Any, **kwargs: Any) -> None:
 
 def debug(message: str, *args: Any, **kwargs: Any) -> None:
     """Log a debug message."""
-    log(message, LogLevel.DEBUG, *args, **kwargs)
+    if _config.level <= _DEBUG:
+        log(message, LogLevel.DEBUG, *args, **kwargs)
+
+
+configure_from_env()
+
+
+@atexit.register
+def _shutdown() -> None:
+    if _config.writer is not None:
+        _config.writer.close()
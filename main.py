@@ -2,17 +2,74 @@
 
 import os
 import sys
-import platform
 from dotenv import load_dotenv
+
+# Load environment variables before the logger, which reads ODOO_LOG_* when imported
+load_dotenv()
+
 from mcp.server.stdio import stdio_server
 import anyio
-from logger import info, success, debug, log_startup_header, log_env_check, divider
+from logger import info, success, warning, debug, log_startup_header, log_env_check, divider
 
-# Load environment variables
-load_dotenv()
 info("🏗️  Initializing Odoo MCP Server...")
 
-from server import mcp 
+# Only the MCP side: FastAPI, the tool modules and the Odoo client load later.
+from mcp_server import mcp
+
+
+def _is_initialized(message):
+    # stdio_server yields SessionMessage (JSONRPCMessage in older mcp releases), or an
+    # Exception for a line it could not parse.
+    message = getattr(message, "message", message)
+    return getattr(getattr(message, "root", None), "method", None) == "notifications/initialized"
+
+
+def watch_handshake(reader, initialized):
+    """
+    Put a relay between the stdio reader and the MCP server that sets
+    ``initialized`` once the client has completed the handshake.
+
+    Returns the stream to hand to the server and the coroutine function
+    that pumps messages into it.
+    """
+    send, receive = anyio.create_memory_object_stream(0)
+
+    async def pump():
+        async with send:
+            async for message in reader:
+                await send.send(message)
+                if not initialized.is_set() and _is_initialized(message):
+                    initialized.set()
+
+    return receive, pump
+
+
+def _load_in_background():
+    import tools
+
+    tools.load_all()
+
+
+async def prewarm(initialized):
+    """
+    After the handshake, import the tools, log in to Odoo and fetch the
+    tools' field definitions so the first tool call does not have to.
+    """
+    await initialized.wait()
+    if not (os.environ.get("ODOO_URL") or os.environ.get("ODOO_TENANTS_FILE")):
+        return
+    try:
+        await anyio.to_thread.run_sync(_load_in_background)
+        from odoo_client import get_async_odoo_client
+        from schema import warm_schema
+        client = await get_async_odoo_client()
+        success("✅ Odoo session opened in the background")
+        # Same client (login, connection pool and schema registry) as the tool calls.
+        await warm_schema(client)
+    except Exception as e:
+        # The first tool call will try again and report the error to the client.
+        warning("⚠️ Could not open the Odoo session in the background: {}", e)
+
 
 async def run_mcp_server():
     # Log environment variables
@@ -33,8 +90,14 @@ async def run_mcp_server():
     async with stdio_server() as (reader, writer):
         success("✅ MCP server lifespan context initialized")
         info("📡 MCP stdio connection established")
-        info("🔄 Starting MCP server main loop...")
-        await mcp._mcp_server.run(reader, writer, mcp._mcp_server.create_initialization_options())
+        initialized = anyio.Event()
+        messages, pump = watch_handshake(reader, initialized)
+        async with anyio.create_task_group() as tasks:
+            tasks.start_soon(pump)
+            tasks.start_soon(prewarm, initialized)
+            info("🔄 Starting MCP server main loop...")
+            await mcp._mcp_server.run(messages, writer, mcp._mcp_server.create_initialization_options())
+            tasks.cancel_scope.cancel()
 
 def main():
     anyio.run(run_mcp_server)
@@ -0,0 +1,39 @@
+from typing import Optional, Dict, Any, List
+from mcp.server.fastmcp import FastMCP
+
+from metrics import instrument_tool
+from tools.registry import TOOLS
+from logger import info, success, warning, error, debug
+
+# Only what the MCP protocol needs is imported here, so the stdio server
+# starts without FastAPI or uvicorn. Tools come from the shared registry and
+# each tool module (and with it the Odoo client) is imported on first call.
+
+mcp = FastMCP(
+    "Odoo MCP Server",
+)
+
+
+def mcp_handler(spec):
+    """Build the MCP tool for ``spec``: its declared signature, wrapped as ``{"success", "result"/"error"}``."""
+    async def handler(**arguments) -> Dict[str, Any]:
+        try:
+            result = await spec.load()(**arguments)
+            return {"success": True, "result": result}
+        except Exception as e:
+            error("❌ Error in {}: {}", spec.name, e)
+            return {"success": False, "error": str(e)}
+
+    handler.__name__ = spec.name
+    handler.__qualname__ = spec.name
+    handler.__doc__ = spec.doc
+    handler.__signature__ = spec.signature.replace(return_annotation=Dict[str, Any])
+    return instrument_tool(handler)
+
+
+# Tool name -> instrumented handler, as registered with FastMCP.
+handlers = {}
+for spec in TOOLS:
+    handlers[spec.name] = mcp.tool(name=spec.name, description=spec.description)(mcp_handler(spec))
+
+info("🎯 Odoo Accounting MCP Server initialized with {} tools", len(handlers))
@@ -0,0 +1,264 @@
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from logger import info, success, warning, error, debug
+
+try:
+    import orjson
+except ImportError:  # optional, only speeds up measuring tool result sizes
+    orjson = None
+
+try:
+    from opentelemetry import trace
+except ImportError:  # optional, spans are only emitted when OpenTelemetry is installed
+    trace = None
+
+# Latency buckets in seconds, from a cache hit to a slow report query.
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Payload buckets in bytes, 1 KB to 64 MB.
+BYTE_BUCKETS = tuple(1024 * 4 ** power for power in range(9))
+# Row count buckets, one row to a full export page and beyond.
+ROW_BUCKETS = (1, 10, 50, 100, 500, 1000, 5000, 10000, 50000)
+# FastMCP encodes tool results itself, so measuring their size means encoding
+# them again; only one call in this many per tool is measured (0 disables it).
+SIZE_SAMPLE_EVERY = 10
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter per label set, in the Prometheus text format."""
+
+    kind = "counter"
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labelvalues, amount=1):
+        with self._lock:
+            self._values[labelvalues] = self._values.get(labelvalues, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = list(self._values.items())
+        for labelvalues, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labelvalues)} {value}"
+
+
+class Histogram:
+    """Cumulative bucket histogram per label set, in the Prometheus text format."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labelvalues):
+        with self._lock:
+            state = self._values.get(labelvalues)
+            if state is None:
+                # one slot per bucket plus +Inf, then sum
+                state = self._values[labelvalues] = [0] * (len(self.buckets) + 1) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[index] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = [(labelvalues, list(state)) for labelvalues, state in self._values.items()]
+        for labelvalues, state in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), state):
+                cumulative += count
+                le = f'le="{bound}"'
+                yield f"{self.name}_bucket{_labels(self.labelnames, labelvalues, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labelvalues)} {state[-1]}"
+            yield f"{self.name}_count{_labels(self.labelnames, labelvalues)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name, help, labelnames=()):
+        metric = Counter(name, help, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        metric = Histogram(name, help, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+RPC_SECONDS = REGISTRY.histogram(
+    "odoo_rpc_duration_seconds", "Odoo RPC latency including re-authentication", ("model", "method"))
+RPC_ERRORS = REGISTRY.counter(
+    "odoo_rpc_errors_total", "Odoo RPCs that raised", ("model", "method", "error"))
+RPC_RESPONSE_BYTES = REGISTRY.histogram(
+    "odoo_rpc_response_bytes", "Size of Odoo RPC response bodies", ("model", "method"), BYTE_BUCKETS)
+RPC_DECODE_SECONDS = REGISTRY.histogram(
+    "odoo_rpc_decode_seconds", "Time spent decoding Odoo RPC responses", ("model", "method", "transport"))
+RPC_RETRIES = REGISTRY.counter(
+    "odoo_rpc_retries_total", "Odoo RPCs retried after a transport error", ("model", "method", "error"))
+BREAKER_TRANSITIONS = REGISTRY.counter(
+    "odoo_circuit_breaker_transitions_total", "Circuit breaker state changes per Odoo instance", ("instance", "state"))
+SEARCH_READ_SECONDS = REGISTRY.histogram(
+    "odoo_search_read_duration_seconds", "search_read latency including cache lookups", ("model",))
+SEARCH_READ_ROWS = REGISTRY.histogram(
+    "odoo_search_read_rows", "Rows returned by search_read", ("model",), ROW_BUCKETS)
+TOOL_SECONDS = REGISTRY.histogram(
+    "mcp_tool_duration_seconds", "MCP tool latency", ("tool",))
+TOOL_ERRORS = REGISTRY.counter(
+    "mcp_tool_errors_total", "MCP tool calls that failed", ("tool",))
+TOOL_ROWS = REGISTRY.histogram(
+    "mcp_tool_rows", "Records returned by MCP tools", ("tool",), ROW_BUCKETS)
+TOOL_RESPONSE_BYTES = REGISTRY.histogram(
+    "mcp_tool_response_bytes", "JSON size of MCP tool results (sampled calls)", ("tool",), BYTE_BUCKETS)
+HTTP_SECONDS = REGISTRY.histogram(
+    "http_request_duration_seconds", "FastAPI request latency", ("route", "method", "status"))
+HTTP_RESPONSE_BYTES = REGISTRY.histogram(
+    "http_response_bytes", "FastAPI response body size (non-streaming responses)", ("route",), BYTE_BUCKETS)
+
+_tracer = trace.get_tracer("odoo-mcp-server") if trace is not None else None
+
+
+@contextmanager
+def span(name, **attributes):
+    """Open an OpenTelemetry span if OpenTelemetry is installed; otherwise do nothing."""
+    if _tracer is None:
+        yield None
+        return
+    with _tracer.start_as_current_span(name, attributes=attributes) as current:
+        yield current
+
+
+@contextmanager
+def track_rpc(model, method):
+    """Time an Odoo RPC and count it as an error if it raises."""
+    started = time.perf_counter()
+    try:
+        with span(f"odoo.{method}", **{"odoo.model": model, "odoo.method": method}):
+            yield
+    except Exception as e:
+        RPC_ERRORS.inc(model, method, type(e).__name__)
+        raise
+    finally:
+        RPC_SECONDS.observe(time.perf_counter() - started, model, method)
+
+
+def rpc_labels(method, args):
+    """Return (model, method) for a raw ``execute_kw``/``common`` call."""
+    if method == "execute_kw":
+        return args[3], args[4]
+    return "", method
+
+
+def _json_size(value):
+    if orjson is not None:
+        return len(orjson.dumps(value, default=str))
+    return len(json.dumps(value, default=str))
+
+
+def _result_rows(result):
+    if isinstance(result, dict):
+        for key in ("result", "records", "groups"):
+            value = result.get(key)
+            if isinstance(value, dict) and isinstance(value.get("rows"), list):
+                value = value["rows"]  # columnar response_format
+            if isinstance(value, list):
+                return len(value)
+    return None
+
+
+def instrument_tool(func):
+    """
+    Record latency, returned rows, JSON size and failures of an async MCP tool.
+
+    Tools report failures as ``{"success": False, ...}`` rather than raising,
+    so both count as errors. The JSON size is measured on the first call and
+    then once every ODOO_METRICS_SIZE_SAMPLE calls.
+    """
+    name = func.__name__.removesuffix("_wrapper")
+    every = int(os.environ.get("ODOO_METRICS_SIZE_SAMPLE", SIZE_SAMPLE_EVERY))
+    calls = [0]
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        failed = True
+        try:
+            with span(f"mcp.tool.{name}", **{"mcp.tool": name}):
+                result = await func(*args, **kwargs)
+            failed = isinstance(result, dict) and result.get("success") is False
+            rows = _result_rows(result)
+            if rows is not None:
+                TOOL_ROWS.observe(rows, name)
+            if every and calls[0] % every == 0:
+                TOOL_RESPONSE_BYTES.observe(_json_size(result), name)
+            calls[0] += 1
+            return result
+        finally:
+            TOOL_SECONDS.observe(time.perf_counter() - started, name)
+            if failed:
+                TOOL_ERRORS.inc(name)
+
+    return wrapper
+
+
+async def http_metrics_middleware(request, call_next):
+    """FastAPI middleware timing every request by route template and status."""
+    started = time.perf_counter()
+    response = None
+    try:
+        response = await call_next(request)
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        status = response.status_code if response is not None else 500
+        HTTP_SECONDS.observe(time.perf_counter() - started, path, request.method, status)
+        # Streaming responses (stream=true) have no content-length and are not sized.
+        length = response.headers.get("content-length") if response is not None else None
+        if length is not None:
+            HTTP_RESPONSE_BYTES.observe(int(length), path)
+
+
+def render():
+    return REGISTRY.render()
@@ -0,0 +1,269 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from odoo_client import get_odoo_client
+from tenants import is_default_tenant
+from logger import info, success, warning, error, debug
+
+DEFAULT_INTERVAL = 60
+DEFAULT_MAX_LAG = 300
+SYNC_PAGE_SIZE = 2000
+
+# What is mirrored per model: the fields kept in the row payload, the columns
+# pulled out (and indexed) so domains on them can be answered locally, and
+# the model's default Odoo order, so local results come back in the same order
+# as a live search_read. Text columns (name, code) sort by code point here
+# while PostgreSQL uses the database collation, so rows tied on date can come
+# back in a different order, and a limit can cut such ties differently.
+MIRRORED_MODELS = {
+    "account.move": {
+        "fields": ["name", "date", "invoice_date", "move_type", "state", "amount_total", "journal_id",
+                   "partner_id", "payment_state", "company_id", "ref"],
+        "columns": ["state", "move_type", "date", "name"],
+        "order": "date DESC, name DESC, id DESC",
+    },
+    "res.partner": {
+        "fields": ["name", "email", "phone", "mobile", "street", "city", "zip", "country_id",
+                   "customer_rank", "supplier_rank", "company_id", "category_id", "user_id"],
+        "columns": ["name", "customer_rank", "supplier_rank"],
+        "order": "name ASC, id DESC",
+    },
+    "account.account": {
+        "fields": ["code", "name", "account_type", "company_id", "currency_id", "reconcile"],
+        "columns": ["code", "account_type"],
+        "order": "code ASC, id ASC",
+    },
+}
+
+SQL_OPERATORS = {"=": "=", "!=": "!=", ">": ">", ">=": ">=", "<": "<", "<=": "<=", "in": "IN", "not in": "NOT IN"}
+
+
+def _table(model):
+    return model.replace(".", "_")
+
+
+def _where(domain, columns):
+    """
+    Translate a domain into a SQL WHERE clause over the mirrored columns.
+
+    Only plain AND-ed leaves on mirrored columns are supported; anything else
+    returns None so the caller falls back to Odoo.
+    """
+    clauses, params = [], []
+    for leaf in domain:
+        if not isinstance(leaf, (list, tuple)) or len(leaf) != 3:
+            return None
+        field, operator, value = leaf
+        if (field != "id" and field not in columns) or operator not in SQL_OPERATORS:
+            return None
+        if operator in ("in", "not in"):
+            values = list(value)
+            clauses.append(f'"{field}" {SQL_OPERATORS[operator]} ({", ".join("?" * len(values))})')
+            params.extend(values)
+        elif value is False or value is None:
+            if operator not in ("=", "!="):
+                return None
+            clauses.append(f'"{field}" IS {"NOT " if operator == "!=" else ""}NULL')
+        else:
+            clauses.append(f'"{field}" {SQL_OPERATORS[operator]} ?')
+            params.append(value)
+    return " AND ".join(clauses) or "1", params
+
+
+class LocalMirror:
+    """
+    SQLite mirror of frequently queried Odoo models.
+
+    Each model is synced incrementally: only records whose ``write_date`` is
+    at or after the last watermark are fetched, paged by id. Reads answer
+    simple domains from indexed local tables and return None when they
+    cannot (unsupported domain or fields, or data older than ``max_lag``
+    seconds), so callers fall back to a live query.
+    """
+
+    def __init__(self, path, interval=DEFAULT_INTERVAL, max_lag=DEFAULT_MAX_LAG, models=MIRRORED_MODELS):
+        self.path = path
+        self.interval = interval
+        self.max_lag = max_lag
+        self.models = models
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS mirror_state (model TEXT PRIMARY KEY, watermark TEXT, synced_at REAL)")
+        for model, spec in models.items():
+            table = _table(model)
+            columns = ", ".join(f'"{column}"' for column in spec["columns"])
+            self._db.execute(f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, {columns}, data TEXT)")
+            for column in spec["columns"]:
+                self._db.execute(f'CREATE INDEX IF NOT EXISTS {table}_{column} ON {table} ("{column}")')
+        self._db.commit()
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            os.environ["ODOO_MIRROR_PATH"],
+            interval=float(os.environ.get("ODOO_MIRROR_INTERVAL", DEFAULT_INTERVAL)),
+            max_lag=float(os.environ.get("ODOO_MIRROR_MAX_LAG", DEFAULT_MAX_LAG)),
+        )
+
+    def _state(self, model):
+        row = self._db.execute("SELECT watermark, synced_at FROM mirror_state WHERE model = ?", (model,)).fetchone()
+        return row or (None, None)
+
+    def sync_model(self, client, model):
+        """Pull records of ``model`` changed since the last watermark; returns how many were stored."""
+        spec = self.models[model]
+        table = _table(model)
+        with self._lock:
+            watermark, _ = self._state(model)
+        domain = [["write_date", ">=", watermark]] if watermark else []
+        debug("🔄 Syncing {} mirror from watermark {}", model, watermark)
+
+        started = time.time()
+        placeholders = ", ".join("?" * (len(spec["columns"]) + 2))
+        columns = ", ".join(f'"{column}"' for column in spec["columns"])
+        fields = spec["fields"] + ["write_date"]
+        batch, count, new_watermark = [], 0, watermark
+        for record in client.iter_search_read(model, domain, fields, page_size=SYNC_PAGE_SIZE):
+            values = [record.get(column) if record.get(column) is not False else None for column in spec["columns"]]
+            batch.append([record["id"], *values, json.dumps(record)])
+            if record.get("write_date") and (new_watermark is None or record["write_date"] > new_watermark):
+                new_watermark = record["write_date"]
+            if len(batch) >= SYNC_PAGE_SIZE:
+                count += self._store(table, columns, placeholders, batch)
+                batch = []
+        count += self._store(table, columns, placeholders, batch)
+
+        # write_date never reports deletions (or archiving, which hides records
+        # from search); a count mismatch means some local rows are gone upstream.
+        with self._lock:
+            local_count = self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        if client.search_count(model, []) != local_count:
+            live_ids = set(client.execute_kw(model, "search", [[]]))
+            with self._lock:
+                local_ids = [row[0] for row in self._db.execute(f"SELECT id FROM {table}")]
+                removed = [(record_id,) for record_id in local_ids if record_id not in live_ids]
+                self._db.executemany(f"DELETE FROM {table} WHERE id = ?", removed)
+                self._db.commit()
+            debug("🧹 Removed {} deleted {} records from mirror", len(removed), model)
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO mirror_state (model, watermark, synced_at) VALUES (?, ?, ?)",
+                (model, new_watermark, started),
+            )
+            self._db.commit()
+        return count
+
+    def _store(self, table, columns, placeholders, batch):
+        if not batch:
+            return 0
+        with self._lock:
+            self._db.executemany(f"INSERT OR REPLACE INTO {table} (id, {columns}, data) VALUES ({placeholders})", batch)
+            self._db.commit()
+        return len(batch)
+
+    def sync(self, client):
+        for model in self.models:
+            try:
+                count = self.sync_model(client, model)
+                success("✅ Mirror synced {} changed {} records", count, model)
+            except Exception as e:
+                error("❌ Error syncing {} mirror: {}", model, e)
+
+    def query(self, model, domain, fields, limit=None):
+        """Answer a search_read from the mirror, or return None to fall back to Odoo."""
+        spec = self.models.get(model)
+        if spec is None or (fields and not set(fields) <= set(spec["fields"])):
+            self.misses += 1
+            return None
+        where = _where(domain, spec["columns"])
+        with self._lock:
+            _, synced_at = self._state(model)
+            if where is None or synced_at is None or time.time() - synced_at > self.max_lag:
+                self.misses += 1
+                return None
+            sql = f"SELECT data FROM {_table(model)} WHERE {where[0]} ORDER BY {spec['order']}"
+            if limit:
+                sql += f" LIMIT {int(limit)}"
+            rows = self._db.execute(sql, where[1]).fetchall()
+        self.hits += 1
+        records = [json.loads(data) for (data,) in rows]
+        if fields:
+            records = [{"id": record["id"], **{field: record.get(field, False) for field in fields}} for record in records]
+        return records
+
+    def start(self, client_factory):
+        """Sync every ``interval`` seconds in a daemon thread."""
+        if self._thread is not None:
+            return
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.sync(client_factory())
+                except Exception as e:
+                    error("❌ Mirror sync failed: {}", e)
+                self._stop.wait(self.interval)
+
+        info("🪞 Starting local mirror sync every {}s into {}", self.interval, self.path)
+        self._thread = threading.Thread(target=loop, name="odoo-mirror-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+
+_mirror = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror():
+    """
+    Return the shared mirror, starting its background sync on first use.
+
+    Returns None when ODOO_MIRROR_PATH is not set (the mirror is optional).
+    """
+    global _mirror
+    if not os.environ.get("ODOO_MIRROR_PATH"):
+        return None
+    with _mirror_lock:
+        if _mirror is None:
+            _mirror = LocalMirror.from_env()
+            _mirror.start(get_odoo_client)
+    return _mirror
+
+
+def query_mirror(model, domain, fields, limit=None, tenant=None):
+    """
+    Serve a search_read from the local mirror when it is enabled, fresh and able to answer it.
+
+    The mirror holds the default tenant's data only; other tenants always go to Odoo.
+    """
+    if not is_default_tenant(tenant):
+        return None
+    mirror = get_mirror()
+    if mirror is None:
+        return None
+    records = mirror.query(model, domain, fields, limit)
+    if records is not None:
+        debug("🪞 Served {} {} records from local mirror", len(records), model)
+    return records
+
+
+async def aquery_mirror(model, domain, fields, limit=None, tenant=None):
+    """
+    Async counterpart of query_mirror(). The SQLite query, the JSON decoding
+    and, on first use, opening the mirror run on a worker thread, so the event
+    loop never waits on the lock the sync thread holds while it writes.
+    """
+    if not os.environ.get("ODOO_MIRROR_PATH") or not is_default_tenant(tenant):
+        return None
+    return await asyncio.to_thread(query_mirror, model, domain, fields, limit, tenant)
@@ -1,58 +1,969 @@
+import asyncio
+import itertools
+import json
 import os
+import queue
 import re
 import socket
 import sys
+import threading
+import time
 import urllib.parse
+import http.client
 import xmlrpc.client
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import httpx
+import metrics
+from schema import FINGERPRINT_MODEL, fingerprint, get_schema_registry
+from tenants import resolve_tenant
+from planner import ShardPolicy, sharded_search_read
+from snapshot import get_snapshot_store, snapshot_search_read
+from resilience import (
+    DeadlineHTTPConnection, DeadlineHTTPSConnection, DeadlineXmlRpcTransport, RetryPolicy,
+    acall_with_retries, call_with_retries, get_circuit_breaker,
+)
+from cache import ResultCache, can_revalidate, merge_changes, snapshot_time, HIT, STALE
 from logger import info, success, warning, error, debug
 
+try:
+    import orjson
+except ImportError:  # optional, only speeds up JSON-RPC decoding
+    orjson = None
+
+DEFAULT_POOL_SIZE = 4
+DEFAULT_PAGE_SIZE = 500
+FIELD_ATTRIBUTES = ("string", "type", "relation")
+
+# Fault codes Odoo uses when the uid/password pair is rejected
+# (numeric since Odoo 13, string in older versions, exception name over JSON-RPC).
+ACCESS_DENIED_FAULT_CODES = (3, "AccessDenied", "odoo.exceptions.AccessDenied")
+
+# res.company dates on or before which posted entries are locked for every user
+# (hard_lock_date exists from Odoo 18 on); the latest one that is set applies.
+LOCK_DATE_FIELDS = ("fiscalyear_lock_date", "hard_lock_date")
+
+# ORM methods after which cached search_read results for the model are dropped.
+CACHE_INVALIDATING_METHODS = ("create", "write", "unlink", "copy", "action_archive", "action_unarchive")
+
+
+def _normalize_url(url):
+    if not re.match(r"^https?://", url):
+        url = f"http://{url}"
+    return url.rstrip("/")
+
+
+if orjson is not None:
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+else:
+    json_loads = json.loads
+
+    def json_dumps(value):
+        return json.dumps(value).encode()
+
+
+def _jsonrpc_payload(service, method, args, request_id):
+    return json_dumps({
+        "jsonrpc": "2.0",
+        "method": "call",
+        "params": {"service": service, "method": method, "args": list(args)},
+        "id": request_id,
+    })
+
+
+def _jsonrpc_result(body):
+    if body.get("error"):
+        # Surface JSON-RPC errors like XML-RPC faults so callers handle both the same way.
+        data = body["error"].get("data") or {}
+        raise xmlrpc.client.Fault(
+            data.get("name", body["error"].get("code")),
+            data.get("message", body["error"].get("message")),
+        )
+    return body.get("result")
+
+
+def _is_access_denied(fault):
+    return (
+        fault.faultCode in ACCESS_DENIED_FAULT_CODES
+        or "Access Denied" in str(fault.faultString)
+    )
+
+
+def _copy_rows(rows):
+    return [dict(row) for row in rows]
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesce identical concurrent calls (thread version).
+
+    The first caller for a key runs the call; callers arriving while it is in
+    flight wait for it instead of sending a duplicate RPC to Odoo. Every
+    caller gets its own copy of the rows, so one can modify them without
+    affecting the others.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.followers = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if not leader:
+            debug("🤝 Joined an identical in-flight request")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return _copy_rows(flight.result)
+
+        try:
+            flight.result = func()
+            return _copy_rows(flight.result)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {"leaders": self.leaders, "coalesced": self.followers, "in_flight": len(self._flights)}
+
+
+class AsyncSingleFlight:
+    """
+    asyncio version of SingleFlight.
+
+    The leader's call runs as its own task, so cancelling whichever caller
+    started it does not cancel the followers waiting on the same result.
+    """
+
+    def __init__(self):
+        self.leaders = 0
+        self.followers = 0
+        self._flights = {}
+
+    def _forget(self, key, task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+
+    async def do(self, key, func):
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            task.add_done_callback(lambda _: self._forget(key, task))
+            self._flights[key] = task
+            self.leaders += 1
+            return _copy_rows(await asyncio.shield(task))
+
+        self.followers += 1
+        debug("🤝 Joined an identical in-flight request")
+        return _copy_rows(await asyncio.shield(task))
+
+    def stats(self):
+        return {"leaders": self.leaders, "coalesced": self.followers, "in_flight": len(self._flights)}
+
+
+class XmlRpcTransport:
+    """
+    XML-RPC session against ``/xmlrpc/2/common`` and ``/xmlrpc/2/object``.
+
+    Each proxy owns its transport, and the transport keeps its HTTP
+    connection open between calls, so a session that goes back to the
+    pool is reused without a new TCP/TLS handshake. Connections use the
+    connect and read deadlines of ``policy``.
+    """
+
+    name = "xmlrpc"
+
+    def __init__(self, url, policy):
+        https = url.startswith("https://")
+        self.common = xmlrpc.client.ServerProxy(
+            f"{url}/xmlrpc/2/common", transport=DeadlineXmlRpcTransport(policy, https), allow_none=True
+        )
+        self.models = xmlrpc.client.ServerProxy(
+            f"{url}/xmlrpc/2/object", transport=DeadlineXmlRpcTransport(policy, https), allow_none=True
+        )
+
+    def call(self, service, method, *args):
+        proxy = self.common if service == "common" else self.models
+        return getattr(proxy, method)(*args)
+
+    def close(self):
+        self.common("close")()
+        self.models("close")()
+
+
+class JsonRpcTransport:
+    """
+    JSON-RPC session against ``/jsonrpc`` over one keep-alive HTTP connection.
+
+    Responses are decoded with orjson when it is installed, which is several
+    times faster than XML unmarshalling on large search_read results.
+    """
+
+    name = "jsonrpc"
+
+    def __init__(self, url, policy):
+        parts = urllib.parse.urlsplit(url)
+        connection_class = DeadlineHTTPSConnection if parts.scheme == "https" else DeadlineHTTPConnection
+        self.url = url
+        self._path = f"{parts.path}/jsonrpc"
+        self._connection = connection_class(parts.netloc, policy.connect_timeout, policy.read_timeout)
+        self._request_ids = itertools.count(1)
+
+    def call(self, service, method, *args):
+        payload = _jsonrpc_payload(service, method, args, next(self._request_ids))
+        self._connection.request("POST", self._path, payload, {"Content-Type": "application/json"})
+        response = self._connection.getresponse()
+        body = response.read()
+        if response.status != 200:
+            raise xmlrpc.client.ProtocolError(
+                f"{self.url}/jsonrpc", response.status, response.reason, dict(response.getheaders())
+            )
+        model, orm_method = metrics.rpc_labels(method, args)
+        metrics.RPC_RESPONSE_BYTES.observe(len(body), model, orm_method)
+        started = time.perf_counter()
+        decoded = json_loads(body)
+        metrics.RPC_DECODE_SECONDS.observe(time.perf_counter() - started, model, orm_method, self.name)
+        return _jsonrpc_result(decoded)
+
+    def close(self):
+        self._connection.close()
+
+
+TRANSPORTS = {
+    XmlRpcTransport.name: XmlRpcTransport,
+    JsonRpcTransport.name: JsonRpcTransport,
+}
+
+
+def _resolve_transport(transport):
+    transport = transport or os.environ.get("ODOO_TRANSPORT", "xmlrpc")
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown Odoo transport: {transport}")
+    return transport
+
 
 class OdooClient:
-    def __init__(self, url, db, username, password):
+    """
+    Thread-safe Odoo client backed by a pool of keep-alive sessions.
+
+    The client authenticates once and shares the uid across all sessions.
+    It only re-authenticates when Odoo rejects the cached uid. ``transport``
+    selects the wire protocol (``xmlrpc`` or ``jsonrpc``) and defaults to the
+    ``ODOO_TRANSPORT`` environment variable.
+
+    Every call has connect and read deadlines; idempotent reads are retried
+    on transport errors, and a circuit breaker shared by all clients of the
+    same Odoo instance fails calls fast while it is down (see resilience.py).
+    """
+
+    def __init__(self, url, db, username, password, pool_size=None, transport=None):
         info("🏗️ Initializing Odoo client...")
-        if not re.match(r"^https?://", url):
-            url = f"http://{url}"
-        url = url.rstrip("/")
+        url = _normalize_url(url)
+        transport = _resolve_transport(transport)
 
         self.url = url
         self.db = db
         self.username = username
         self.password = password
         self.uid = None
+        self.transport = transport
+        self.pool_size = pool_size or int(os.environ.get("ODOO_POOL_SIZE", DEFAULT_POOL_SIZE))
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.pool_size)
+        self._auth_lock = threading.Lock()
+        self._auth_generation = 0
+        self.cache = ResultCache.from_env()
+        self.single_flight = SingleFlight()
+        self.schema = get_schema_registry(url, db, username)
+        self._fields = {}
+        self.policy = RetryPolicy.from_env()
+        self.breaker = get_circuit_breaker(url)
 
-        debug(f"🔌 Setting up XML-RPC connection to {url}")
-        self._common = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/common")
-        self._models = xmlrpc.client.ServerProxy(f"{url}/xmlrpc/2/object")
+        debug("🔌 Setting up {} session pool to {} (size: {})", transport, url, self.pool_size)
         self._connect()
 
+    @contextmanager
+    def _session(self):
+        """Check out an idle session, opening a new one if none is free."""
+        self._slots.acquire()
+        try:
+            try:
+                session = self._idle.get_nowait()
+            except queue.Empty:
+                debug("🔌 Opening new {} session to {}", self.transport, self.url)
+                session = TRANSPORTS[self.transport](self.url, self.policy)
+            broken = False
+            try:
+                yield session
+            except (OSError, http.client.HTTPException, xmlrpc.client.ProtocolError):
+                # The connection may be half-closed; do not hand it out again.
+                broken = True
+                session.close()
+                raise
+            finally:
+                if not broken:
+                    self._idle.put(session)
+        finally:
+            self._slots.release()
+
+    def _resilient(self, model, method, func):
+        return call_with_retries(self.policy, self.breaker, model, method, func)
+
     def _connect(self):
+        self._resilient("", "authenticate", self._authenticate)
+
+    def _authenticate(self):
+        info("🔄 Connecting to Odoo server...")
+        with metrics.track_rpc("", "authenticate"), self._session() as session:
+            uid = session.call("common", "authenticate", self.db, self.username, self.password, {})
+        if not uid:
+            error("❌ Odoo authentication failed")
+            raise ValueError("Authentication failed")
+        self.uid = uid
+        self._auth_generation += 1
+        success("✅ Odoo authentication successful")
+
+    def _reauthenticate(self, generation):
+        with self._auth_lock:
+            # Another thread may already have refreshed the session.
+            if self._auth_generation == generation:
+                warning("🔑 Odoo rejected the cached session, re-authenticating")
+                self._authenticate()
+
+    def execute_kw(self, model, method, args, kwargs=None):
+        with metrics.track_rpc(model, method):
+            result = self._resilient(model, method, lambda: self._execute_kw(model, method, args, kwargs))
+        if method in CACHE_INVALIDATING_METHODS:
+            self.cache.invalidate(model)
+        return result
+
+    def _execute_kw(self, model, method, args, kwargs=None):
+        generation = self._auth_generation
+        try:
+            with self._session() as session:
+                return session.call(
+                    "object", "execute_kw", self.db, self.uid, self.password, model, method, args, kwargs or {}
+                )
+        except xmlrpc.client.Fault as e:
+            if not _is_access_denied(e):
+                raise
+        self._reauthenticate(generation)
+        with self._session() as session:
+            return session.call(
+                "object", "execute_kw", self.db, self.uid, self.password, model, method, args, kwargs or {}
+            )
+
+    def version(self):
+        def call():
+            with self._session() as session:
+                return session.call("common", "version")
+        return self._resilient("", "version", call)
+
+    def schema_registry(self):
+        """
+        Return the schema registry, bound to this server's version on first
+        use and revalidated against the fields Odoo knows every so often.
+        """
+        if not self.schema.loaded:
+            self.schema.load(self.version().get("server_version"))
+        if self.schema.needs_check():
+            self.schema.validate(self.schema_fingerprint())
+        return self.schema
+
+    def schema_fingerprint(self):
+        """Fingerprint of ir.model.fields (see schema.fingerprint), or None if it cannot be read."""
+        try:
+            count = self.execute_kw(FINGERPRINT_MODEL, "search_count", [[]])
+            latest = self.execute_kw(FINGERPRINT_MODEL, "search_read", [[]],
+                                     {"fields": ["write_date"], "limit": 1, "order": "write_date desc"})
+        except Exception as e:
+            debug("📚 Cannot fingerprint the schema, keeping it for up to ODOO_SCHEMA_MAX_AGE: {}", e)
+            return None
+        return fingerprint(count, latest)
+
+    def _prepare(self, model, domain, fields=None):
+        """Check ``domain`` and prune ``fields`` against the model's schema before the RPC."""
+        registry = self.schema_registry()
+        if registry.get(model) is None:
+            try:
+                self.fields_get(model)
+            except xmlrpc.client.Fault as e:
+                debug("📚 No schema for {}, sending the query unchecked: {}", model, e.faultString)
+                return fields
+        registry.check_domain(model, domain)
+        return registry.prune_fields(model, fields)
+
+    def lock_dates(self):
+        """Return ``{company_id: date}`` of the latest lock date of each company (None when unlocked)."""
+        schema = self.fields_get("res.company")
+        fields = [field for field in LOCK_DATE_FIELDS if field in schema]
+        companies = self.search_read("res.company", [], fields, limit=None)
+        return {company["id"]: max((company[field] for field in fields if company.get(field)), default=None)
+                for company in companies}
+
+    def search_count(self, model, domain=[]):
+        self._prepare(model, domain)
+        return self.execute_kw(model, "search_count", [domain])
+
+    def search_read(self, model, domain=[], fields=None, limit=10, order=None, use_cache=True):
+        """
+        Run search_read on ``model``.
+
+        Results for models with a cache TTL (reference data such as the chart
+        of accounts) are served from ``self.cache`` until they expire; pass
+        ``use_cache=False`` to always hit Odoo.
+        """
+        started = time.perf_counter()
+        fields = self._prepare(model, domain, fields)
+        rows = self._cached_search_read(model, domain, fields, limit, order, use_cache)
+        metrics.SEARCH_READ_SECONDS.observe(time.perf_counter() - started, model)
+        metrics.SEARCH_READ_ROWS.observe(len(rows), model)
+        return rows
+
+    def _cached_search_read(self, model, domain, fields, limit, order, use_cache):
+        if not (use_cache and self.cache.caches(model)):
+            return self._search_read(model, domain, fields, limit, order)
+
+        key = self.cache.key(self.db, self.uid, model, domain, fields, limit, order)
+        rows, snapshot, state = self.cache.lookup(key)
+        if state == HIT:
+            debug("⚡ Cache hit for search_read on model: {}", model)
+            return rows
+        if state == STALE:
+            if can_revalidate(rows, limit):
+                debug("🔁 Revalidating cached search_read on model: {} (changed since {})", model, snapshot)
+                new_snapshot = snapshot_time()
+                changed = self._search_read(model, domain + [["write_date", ">", snapshot]], fields, None, order)
+                rows = merge_changes(rows, changed, self.search_count(model, domain))
+            else:
+                rows = None
+            self.cache.record_revalidation(rows is not None)
+            if rows is not None:
+                self.cache.put(key, model, rows, new_snapshot)
+                return rows
+
+        new_snapshot = snapshot_time()
+        rows = self._search_read(model, domain, fields, limit, order)
+        self.cache.put(key, model, rows, new_snapshot)
+        return rows
+
+    def _search_read(self, model, domain, fields, limit, order):
+        key = ResultCache.key(self.db, self.uid, model, domain, fields, limit, order)
+        return self.single_flight.do(key, lambda: self._rpc_search_read(model, domain, fields, limit, order))
+
+    def _rpc_search_read(self, model, domain, fields, limit, order):
+        debug("🔍 Executing search_read on model: {}", model)
+        kwargs = {"fields": fields, "limit": limit}
+        if order:
+            kwargs["order"] = order
+        result = self.execute_kw(
+            model,
+            "search_read",
+            [domain],
+            kwargs
+        )
+        success("✅ Retrieved {} records from {}", len(result), model)
+        return result
+
+    def read(self, model, ids, fields=None):
+        debug("🔍 Executing read of {} records on model: {}", len(ids), model)
+        fields = self._prepare(model, [], fields)
+        return self.execute_kw(model, "read", [list(ids)], {"fields": fields})
+
+    def fields_get(self, model, attributes=FIELD_ATTRIBUTES):
+        """
+        Return the field definitions of ``model``; fetched once per model and kept.
+
+        Definitions with the default attributes live in the shared schema
+        registry, which persists them to disk per server version and database.
+        """
+        if tuple(attributes) == FIELD_ATTRIBUTES:
+            registry = self.schema_registry()
+            fields = registry.get(model)
+            if fields is None:
+                fields = self.execute_kw(model, "fields_get", [], {"attributes": list(attributes)})
+                registry.put(model, fields)
+                registry.save()
+            return fields
+        key = (model, tuple(attributes))
+        if key not in self._fields:
+            self._fields[key] = self.execute_kw(model, "fields_get", [], {"attributes": list(attributes)})
+        return self._fields[key]
+
+    def read_group(self, model, domain, fields, groupby, orderby=None, limit=None, lazy=False):
+        """
+        Aggregate ``fields`` (e.g. ``"amount_total:sum"``) over ``groupby``
+        (e.g. ``["partner_id", "date:month"]``) in Odoo's SQL.
+        """
+        debug("🔍 Executing read_group on model: {} by {}", model, groupby)
+        self._prepare(model, domain)
+        kwargs = {"lazy": lazy}
+        if orderby:
+            kwargs["orderby"] = orderby
+        if limit:
+            kwargs["limit"] = limit
+        result = self.execute_kw(model, "read_group", [domain, fields, groupby], kwargs)
+        success("✅ Retrieved {} groups from {}", len(result), model)
+        return result
+
+    def _read_page(self, model, domain, fields, after_id, page_size):
+        return self._search_read(model, domain + [["id", ">", after_id]], fields, page_size, "id asc")
+
+    def iter_search_read(self, model, domain=[], fields=None, page_size=DEFAULT_PAGE_SIZE, limit=None):
+        """
+        Yield every matching record, one page at a time.
+
+        Pages are cut by ``id`` keyset (``id > last_id``) rather than offset,
+        so deep pages stay as cheap as the first one. The next page is fetched
+        in the background while the caller consumes the current one. Records
+        come back in ``id`` order; ``limit`` caps the total number yielded.
+        """
+        fields = self._prepare(model, domain, fields)
+        remaining = limit or None
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            size = min(page_size, remaining) if remaining else page_size
+            pending = prefetcher.submit(self._read_page, model, domain, fields, 0, size)
+            while pending is not None:
+                page = pending.result()
+                pending = None
+                if remaining:
+                    remaining -= len(page)
+                if len(page) == size and remaining != 0:
+                    size = min(page_size, remaining) if remaining else page_size
+                    pending = prefetcher.submit(self._read_page, model, domain, fields, page[-1]["id"], size)
+                yield from page
+
+    def stats(self):
+        return {
+            "cache": self.cache.stats(),
+            "single_flight": self.single_flight.stats(),
+            "circuit_breaker": self.breaker.stats(),
+        }
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_odoo_client(tenant=None):
+    """
+    Return the shared client for ``tenant`` (see tenants.py), by default the
+    Odoo instance configured in the environment.
+
+    Clients are pooled per (url, db, username), so every tool call reuses the
+    same authenticated sessions instead of logging in again, and each tenant
+    gets its own sessions and cache.
+    """
+    tenant = resolve_tenant(tenant)
+    url = _normalize_url(tenant.url)
+    password = tenant.password
+    key = (url, tenant.db, tenant.username)
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None or client.password != password:
+            info("🔧 Creating Odoo client for tenant {}", tenant.name)
+            if client is not None:
+                client.close()
+            client = OdooClient(url=url, db=tenant.db, username=tenant.username, password=password,
+                                pool_size=tenant.max_concurrency, transport=tenant.transport)
+            _clients[key] = client
+    return client
+
+
+class AsyncOdooClient:
+    """
+    asyncio counterpart of OdooClient with the same public API.
+
+    Calls go over a shared httpx connection pool and speak either XML-RPC
+    (``/xmlrpc/2/*``) or JSON-RPC (``/jsonrpc``), chosen like OdooClient's. A semaphore bounds the
+    number of in-flight calls per Odoo instance, so a burst of tool calls
+    queues on the event loop instead of opening unbounded connections.
+    """
+
+    def __init__(self, url, db, username, password, pool_size=None, transport=None):
+        info("🏗️ Initializing async Odoo client...")
+        url = _normalize_url(url)
+        transport = _resolve_transport(transport)
+
+        self.url = url
+        self.db = db
+        self.username = username
+        self.password = password
+        self.transport = transport
+        self.uid = None
+        self.pool_size = pool_size or int(os.environ.get("ODOO_POOL_SIZE", DEFAULT_POOL_SIZE))
+
+        self._slots = asyncio.Semaphore(self.pool_size)
+        self._auth_lock = asyncio.Lock()
+        self._auth_generation = 0
+        self._request_ids = itertools.count(1)
+        self.cache = ResultCache.from_env()
+        self.single_flight = AsyncSingleFlight()
+        self.schema = get_schema_registry(url, db, username)
+        self._fields = {}
+        self.policy = RetryPolicy.from_env()
+        self.breaker = get_circuit_breaker(url)
+        self.shard_policy = ShardPolicy.from_env()
+        self.snapshots = get_snapshot_store(url, db)
+
+        debug("🔌 Setting up async {} connection pool to {} (size: {})", transport, url, self.pool_size)
+        self._http = httpx.AsyncClient(
+            base_url=url,
+            timeout=self.policy.httpx_timeout(),
+            limits=httpx.Limits(
+                max_connections=self.pool_size,
+                max_keepalive_connections=self.pool_size,
+            ),
+        )
+
+    async def _call(self, service, method, *args):
+        async with self._slots:
+            if self.transport == "jsonrpc":
+                return await self._call_jsonrpc(service, method, args)
+            return await self._call_xmlrpc(service, method, args)
+
+    async def _call_xmlrpc(self, service, method, args):
+        path = f"/xmlrpc/2/{service}"
+        payload = xmlrpc.client.dumps(args, method, allow_none=True)
+        response = await self._http.post(path, content=payload, headers={"Content-Type": "text/xml"},
+                                         timeout=self.policy.httpx_timeout())
+        if response.status_code != 200:
+            raise xmlrpc.client.ProtocolError(
+                f"{self.url}{path}", response.status_code, response.reason_phrase, dict(response.headers)
+            )
+        model, orm_method = metrics.rpc_labels(method, args)
+        metrics.RPC_RESPONSE_BYTES.observe(len(response.content), model, orm_method)
+        started = time.perf_counter()
+        try:
+            # loads() raises xmlrpc.client.Fault for <fault> responses.
+            result, _ = xmlrpc.client.loads(response.content)
+        finally:
+            metrics.RPC_DECODE_SECONDS.observe(time.perf_counter() - started, model, orm_method, "xmlrpc")
+        return result[0]
+
+    async def _call_jsonrpc(self, service, method, args):
+        payload = _jsonrpc_payload(service, method, args, next(self._request_ids))
+        response = await self._http.post("/jsonrpc", content=payload, headers={"Content-Type": "application/json"},
+                                         timeout=self.policy.httpx_timeout())
+        if response.status_code != 200:
+            raise xmlrpc.client.ProtocolError(
+                f"{self.url}/jsonrpc", response.status_code, response.reason_phrase, dict(response.headers)
+            )
+        model, orm_method = metrics.rpc_labels(method, args)
+        metrics.RPC_RESPONSE_BYTES.observe(len(response.content), model, orm_method)
+        started = time.perf_counter()
+        decoded = json_loads(response.content)
+        metrics.RPC_DECODE_SECONDS.observe(time.perf_counter() - started, model, orm_method, "jsonrpc")
+        return _jsonrpc_result(decoded)
+
+    async def _resilient(self, model, method, func):
+        return await acall_with_retries(self.policy, self.breaker, model, method, func)
+
+    async def connect(self):
+        await self._resilient("", "authenticate", self._authenticate)
+        return self
+
+    async def _authenticate(self):
         info("🔄 Connecting to Odoo server...")
-        self.uid = self._common.authenticate(self.db, self.username, self.password, {})
-        if not self.uid:
+        with metrics.track_rpc("", "authenticate"):
+            uid = await self._call("common", "authenticate", self.db, self.username, self.password, {})
+        if not uid:
             error("❌ Odoo authentication failed")
             raise ValueError("Authentication failed")
+        self.uid = uid
+        self._auth_generation += 1
         success("✅ Odoo authentication successful")
 
-    def search_read(self, model, domain=[], fields=None, limit=10):
-        debug(f"🔍 Executing search_read on model: {model}")
-        result = self._models.execute_kw(
-            self.db,
-            self.uid,
-            self.password,
+    async def _reauthenticate(self, generation):
+        async with self._auth_lock:
+            if self._auth_generation == generation:
+                warning("🔑 Odoo rejected the cached session, re-authenticating")
+                await self._authenticate()
+
+    async def execute_kw(self, model, method, args, kwargs=None):
+        with metrics.track_rpc(model, method):
+            result = await self._resilient(model, method, lambda: self._execute_kw(model, method, args, kwargs))
+        if method in CACHE_INVALIDATING_METHODS:
+            self.cache.invalidate(model)
+        return result
+
+    async def _execute_kw(self, model, method, args, kwargs=None):
+        generation = self._auth_generation
+        try:
+            return await self._call(
+                "object", "execute_kw", self.db, self.uid, self.password, model, method, args, kwargs or {}
+            )
+        except xmlrpc.client.Fault as e:
+            if not _is_access_denied(e):
+                raise
+        await self._reauthenticate(generation)
+        return await self._call(
+            "object", "execute_kw", self.db, self.uid, self.password, model, method, args, kwargs or {}
+        )
+
+    async def version(self):
+        return await self._resilient("", "version", lambda: self._call("common", "version"))
+
+    async def schema_registry(self):
+        if not self.schema.loaded:
+            self.schema.load((await self.version()).get("server_version"))
+        if self.schema.needs_check():
+            self.schema.validate(await self.schema_fingerprint())
+        return self.schema
+
+    async def schema_fingerprint(self):
+        try:
+            count, latest = await asyncio.gather(
+                self.execute_kw(FINGERPRINT_MODEL, "search_count", [[]]),
+                self.execute_kw(FINGERPRINT_MODEL, "search_read", [[]],
+                                {"fields": ["write_date"], "limit": 1, "order": "write_date desc"}),
+            )
+        except Exception as e:
+            debug("📚 Cannot fingerprint the schema, keeping it for up to ODOO_SCHEMA_MAX_AGE: {}", e)
+            return None
+        return fingerprint(count, latest)
+
+    async def _prepare(self, model, domain, fields=None):
+        registry = await self.schema_registry()
+        if registry.get(model) is None:
+            try:
+                await self.fields_get(model)
+            except xmlrpc.client.Fault as e:
+                debug("📚 No schema for {}, sending the query unchecked: {}", model, e.faultString)
+                return fields
+        registry.check_domain(model, domain)
+        return registry.prune_fields(model, fields)
+
+    async def lock_dates(self):
+        schema = await self.fields_get("res.company")
+        fields = [field for field in LOCK_DATE_FIELDS if field in schema]
+        companies = await self.search_read("res.company", [], fields, limit=None)
+        return {company["id"]: max((company[field] for field in fields if company.get(field)), default=None)
+                for company in companies}
+
+    async def search_count(self, model, domain=[]):
+        await self._prepare(model, domain)
+        return await self.execute_kw(model, "search_count", [domain])
+
+    async def search_read(self, model, domain=[], fields=None, limit=10, order=None, use_cache=True):
+        started = time.perf_counter()
+        fields = await self._prepare(model, domain, fields)
+        rows = await self._cached_search_read(model, domain, fields, limit, order, use_cache)
+        metrics.SEARCH_READ_SECONDS.observe(time.perf_counter() - started, model)
+        metrics.SEARCH_READ_ROWS.observe(len(rows), model)
+        return rows
+
+    async def _cached_search_read(self, model, domain, fields, limit, order, use_cache):
+        if not (use_cache and self.cache.caches(model)):
+            return await self._search_read(model, domain, fields, limit, order)
+
+        key = self.cache.key(self.db, self.uid, model, domain, fields, limit, order)
+        rows, snapshot, state = self.cache.lookup(key)
+        if state == HIT:
+            debug("⚡ Cache hit for search_read on model: {}", model)
+            return rows
+        if state == STALE:
+            if can_revalidate(rows, limit):
+                debug("🔁 Revalidating cached search_read on model: {} (changed since {})", model, snapshot)
+                new_snapshot = snapshot_time()
+                changed = await self._search_read(model, domain + [["write_date", ">", snapshot]], fields, None, order)
+                rows = merge_changes(rows, changed, await self.search_count(model, domain))
+            else:
+                rows = None
+            self.cache.record_revalidation(rows is not None)
+            if rows is not None:
+                self.cache.put(key, model, rows, new_snapshot)
+                return rows
+
+        new_snapshot = snapshot_time()
+        rows = await self._search_read(model, domain, fields, limit, order)
+        self.cache.put(key, model, rows, new_snapshot)
+        return rows
+
+    async def planned_search_read(self, model, domain=[], fields=None, limit=10, order=None):
+        """
+        search_read that serves posted entries of locked periods from the
+        snapshot store (see snapshot.py) and splits large date-range or
+        multi-company reads into shards run concurrently (see planner.py),
+        with the same rows, order and limit as a single query.
+        """
+        rows = await snapshot_search_read(self, self.snapshots, model, domain, fields, limit, order,
+                                          self._live_search_read)
+        if rows is None:
+            rows = await self._live_search_read(model, domain, fields, limit, order)
+        return rows
+
+    async def _live_search_read(self, model, domain, fields, limit, order):
+        rows = await sharded_search_read(self, self.shard_policy, model, domain, fields, limit, order)
+        if rows is None:
+            rows = await self.search_read(model, domain, fields, limit, order)
+        return rows
+
+    async def _search_read(self, model, domain, fields, limit, order):
+        key = ResultCache.key(self.db, self.uid, model, domain, fields, limit, order)
+        return await self.single_flight.do(key, lambda: self._rpc_search_read(model, domain, fields, limit, order))
+
+    async def _rpc_search_read(self, model, domain, fields, limit, order):
+        debug("🔍 Executing search_read on model: {}", model)
+        kwargs = {"fields": fields, "limit": limit}
+        if order:
+            kwargs["order"] = order
+        result = await self.execute_kw(
             model,
             "search_read",
             [domain],
-            {"fields": fields, "limit": limit}
+            kwargs
         )
-        success(f"✅ Retrieved {len(result)} records from {model}")
+        success("✅ Retrieved {} records from {}", len(result), model)
         return result
 
+    async def read(self, model, ids, fields=None):
+        debug("🔍 Executing read of {} records on model: {}", len(ids), model)
+        fields = await self._prepare(model, [], fields)
+        return await self.execute_kw(model, "read", [list(ids)], {"fields": fields})
 
-def get_odoo_client():
-    info("🔧 Creating Odoo client from environment variables")
-    return OdooClient(
-        url=os.environ["ODOO_URL"],
-        db=os.environ["ODOO_DB"],
-        username=os.environ["ODOO_USERNAME"],
-        password=os.environ["ODOO_PASSWORD"]
-    )
+    async def fields_get(self, model, attributes=FIELD_ATTRIBUTES):
+        if tuple(attributes) == FIELD_ATTRIBUTES:
+            registry = await self.schema_registry()
+            fields = registry.get(model)
+            if fields is None:
+                fields = await self.execute_kw(model, "fields_get", [], {"attributes": list(attributes)})
+                registry.put(model, fields)
+                registry.save()
+            return fields
+        key = (model, tuple(attributes))
+        if key not in self._fields:
+            self._fields[key] = await self.execute_kw(model, "fields_get", [], {"attributes": list(attributes)})
+        return self._fields[key]
+
+    async def read_group(self, model, domain, fields, groupby, orderby=None, limit=None, lazy=False):
+        debug("🔍 Executing read_group on model: {} by {}", model, groupby)
+        await self._prepare(model, domain)
+        kwargs = {"lazy": lazy}
+        if orderby:
+            kwargs["orderby"] = orderby
+        if limit:
+            kwargs["limit"] = limit
+        result = await self.execute_kw(model, "read_group", [domain, fields, groupby], kwargs)
+        success("✅ Retrieved {} groups from {}", len(result), model)
+        return result
+
+    async def _read_page(self, model, domain, fields, after_id, page_size):
+        return await self._search_read(model, domain + [["id", ">", after_id]], fields, page_size, "id asc")
+
+    async def iter_search_read(self, model, domain=[], fields=None, page_size=DEFAULT_PAGE_SIZE, limit=None):
+        """Async generator counterpart of OdooClient.iter_search_read."""
+        fields = await self._prepare(model, domain, fields)
+        remaining = limit or None
+        size = min(page_size, remaining) if remaining else page_size
+        pending = asyncio.ensure_future(self._read_page(model, domain, fields, 0, size))
+        try:
+            while pending is not None:
+                page = await pending
+                pending = None
+                if remaining:
+                    remaining -= len(page)
+                if len(page) == size and remaining != 0:
+                    size = min(page_size, remaining) if remaining else page_size
+                    pending = asyncio.ensure_future(self._read_page(model, domain, fields, page[-1]["id"], size))
+                for record in page:
+                    yield record
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    def stats(self):
+        return {
+            "cache": self.cache.stats(),
+            "single_flight": self.single_flight.stats(),
+            "circuit_breaker": self.breaker.stats(),
+        }
+
+    async def aclose(self):
+        await self._http.aclose()
+
+
+_async_clients = {}
+
+
+async def _close_async_client(loop, client, task):
+    """Close a replaced client's connection pool on the loop it belongs to."""
+    try:
+        if loop is asyncio.get_running_loop():
+            task.cancel()
+            await client.aclose()
+        elif loop.is_running():
+            loop.call_soon_threadsafe(task.cancel)
+            asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        else:
+            # The old loop is gone; drop what is left of the pool from here.
+            await client.aclose()
+    except Exception as e:
+        debug("🔌 Could not close the replaced Odoo client: {}", e)
+
+
+async def get_async_odoo_client(tenant=None):
+    """
+    Async counterpart of get_odoo_client().
+
+    The first caller for a given (url, db, username) starts the login and
+    every concurrent caller awaits that same login instead of starting its own.
+    """
+    tenant = resolve_tenant(tenant)
+    url = _normalize_url(tenant.url)
+    password = tenant.password
+    key = (url, tenant.db, tenant.username)
+    loop = asyncio.get_running_loop()
+
+    entry = _async_clients.get(key)
+    # httpx clients and asyncio primitives are bound to the loop that created them.
+    if entry is None or entry[0] is not loop or entry[1] != password:
+        info("🔧 Creating async Odoo client for tenant {}", tenant.name)
+        stale = entry
+        client = AsyncOdooClient(url=url, db=tenant.db, username=tenant.username, password=password,
+                                 pool_size=tenant.max_concurrency, transport=tenant.transport)
+        entry = (loop, password, loop.create_task(client.connect()), client)
+        _async_clients[key] = entry
+        if stale is not None:
+            await _close_async_client(stale[0], stale[3], stale[2])
+
+    try:
+        return await asyncio.shield(entry[2])
+    except Exception:
+        if _async_clients.get(key) is entry:
+            del _async_clients[key]
+        raise
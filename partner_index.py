@@ -0,0 +1,288 @@
+import array
+import asyncio
+import os
+import re
+import time
+import unicodedata
+import numpy as np
+from logger import info, success, warning, error, debug
+
+# Fields of res.partner kept in the index; write_date drives incremental refreshes.
+INDEX_FIELDS = ["name", "email", "phone", "mobile", "vat", "city", "write_date"]
+RESULT_FIELDS = ["name", "email", "phone", "mobile", "vat", "city"]
+LOAD_PAGE_SIZE = 2000
+DEFAULT_INTERVAL = 60
+
+# Phone numbers match on their last digits, so "+32 475 12 34 56" finds "0475123456".
+PHONE_DIGITS = 9
+MIN_PHONE_DIGITS = 6
+
+# A fuzzy query takes its candidates from its rarest trigrams' posting lists,
+# up to this many postings; the RERANK candidates sharing the most of them are
+# then counted in the longer lists (common trigrams such as " sa") by binary search.
+CANDIDATE_POSTINGS = 4000
+RERANK = 200
+
+# Rebuild the arrays once this share of positions belongs to replaced partners.
+COMPACT_RATIO = 0.25
+
+
+def normalize(text):
+    """Lowercase ASCII words of ``text``: accents dropped, punctuation turned into spaces."""
+    text = unicodedata.normalize("NFKD", str(text or "")).encode("ascii", "ignore").decode().lower()
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+def trigrams(text):
+    """Trigrams of each word of ``text``, padded like PostgreSQL's pg_trgm (two spaces before, one after)."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def email_key(value):
+    value = str(value or "").strip().lower()
+    return value if "@" in value else None
+
+
+def vat_keys(value):
+    """Uppercase alphanumerics of a VAT number, with and without its country prefix."""
+    key = re.sub(r"[^A-Za-z0-9]", "", str(value or "")).upper()
+    if len(key) < 4:
+        return []
+    if key[:2].isalpha() and not key[2:].isalpha():
+        return [key, key[2:]]
+    return [key]
+
+
+def phone_key(value):
+    digits = re.sub(r"\D", "", str(value or ""))
+    return digits[-PHONE_DIGITS:] if len(digits) >= MIN_PHONE_DIGITS else None
+
+
+class PartnerIndex:
+    """
+    In-memory search index over res.partner.
+
+    Names are split into trigrams with one sorted posting list (an ``array``
+    of positions) per trigram; a fuzzy query counts the trigrams candidates
+    share with it in NumPy and ranks them by Dice similarity. Emails, VAT
+    numbers and phone numbers are exact hash maps to partner ids, and each
+    position has a city code to filter on. A changed partner gets a new
+    position and its old one is marked dead; compact() rebuilds once too many
+    are.
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.positions = {}
+        self.alive = bytearray()
+        self.lengths = array.array("H")
+        self.postings = {}
+        self.emails = {}
+        self.vats = {}
+        self.phones = {}
+        self.cities = {}
+        self.city_codes = array.array("i")
+        self.dead = 0
+        self.watermark = None
+        self.refreshed_at = None
+
+    def __len__(self):
+        return len(self.positions)
+
+    def _keys(self, row):
+        key = email_key(row.get("email"))
+        if key:
+            yield self.emails, key
+        for key in vat_keys(row.get("vat")):
+            yield self.vats, key
+        for field in ("phone", "mobile"):
+            key = phone_key(row.get(field))
+            if key:
+                yield self.phones, key
+
+    def add(self, record):
+        """Index ``record`` (a res.partner row), replacing the partner's previous version."""
+        partner = record["id"]
+        row = {"id": partner, **{field: record.get(field, False) for field in RESULT_FIELDS}}
+        if record.get("write_date") and (self.watermark is None or record["write_date"] > self.watermark):
+            self.watermark = record["write_date"]
+        if partner in self.positions:
+            if self.rows[self.positions[partner]] == row:
+                return
+            self.remove(partner)
+        position = len(self.rows)
+        self.rows.append(row)
+        self.positions[partner] = position
+        self.alive.append(1)
+        grams = trigrams(normalize(row["name"]))
+        self.lengths.append(min(len(grams), 0xFFFF))
+        self.city_codes.append(self.cities.setdefault(normalize(row["city"]), len(self.cities)))
+        for gram in grams:
+            postings = self.postings.get(gram)
+            if postings is None:
+                postings = self.postings[gram] = array.array("i")
+            postings.append(position)
+        for index, key in self._keys(row):
+            index.setdefault(key, set()).add(partner)
+
+    def remove(self, partner):
+        position = self.positions.pop(partner, None)
+        if position is None:
+            return
+        self.alive[position] = 0
+        self.dead += 1
+        for index, key in self._keys(self.rows[position]):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(partner)
+                if not ids:
+                    del index[key]
+
+    def needs_compaction(self):
+        return self.dead > COMPACT_RATIO * max(len(self.rows), 1)
+
+    def compact(self):
+        """Return a new index of the live partners only, without dead positions."""
+        index = PartnerIndex()
+        for position, row in enumerate(self.rows):
+            if self.alive[position]:
+                index.add(row)
+        index.watermark = self.watermark
+        index.refreshed_at = self.refreshed_at
+        return index
+
+    def _exact(self, query):
+        """Ids of partners whose email, VAT or phone number is ``query``."""
+        ids = set()
+        key = email_key(query)
+        if key:
+            ids |= self.emails.get(key, set())
+        for key in vat_keys(query):
+            ids |= self.vats.get(key, set())
+        if re.fullmatch(r"[\d\s+().-]+", query):
+            key = phone_key(query)
+            if key:
+                ids |= self.phones.get(key, set())
+        return ids
+
+    def _fuzzy(self, query, code=None):
+        """(positions, scores) of live partners (of city ``code``) whose name shares trigrams with ``query``."""
+        grams = trigrams(normalize(query))
+        lists = sorted((self.postings[gram] for gram in grams if gram in self.postings), key=len)
+        if not lists:
+            return np.empty(0, dtype=np.intp), np.empty(0)
+        lists = [np.frombuffer(postings, dtype=np.intc) for postings in lists]
+        taken, total = 1, len(lists[0])
+        while taken < len(lists) and total + len(lists[taken]) <= CANDIDATE_POSTINGS:
+            total += len(lists[taken])
+            taken += 1
+        positions, counts = np.unique(np.concatenate(lists[:taken]), return_counts=True)
+        live = np.frombuffer(self.alive, dtype=np.uint8)[positions] == 1
+        if code is not None:
+            live &= np.frombuffer(self.city_codes, dtype=np.intc)[positions] == code
+        positions, counts = positions[live], counts[live]
+        lengths = np.frombuffer(self.lengths, dtype=np.uint16)[positions]
+        if taken < len(lists) and len(positions) > RERANK:
+            best = np.argpartition(-(counts / (len(grams) + lengths)), RERANK - 1)[:RERANK]
+            positions, counts, lengths = positions[best], counts[best], lengths[best]
+        for postings in lists[taken:]:
+            found = np.minimum(np.searchsorted(postings, positions), len(postings) - 1)
+            counts += postings[found] == positions
+        return positions, 2.0 * counts / (len(grams) + lengths)
+
+    def search(self, query, city=None, limit=10):
+        """
+        Rank partners for ``query``: exact email, VAT or phone matches first
+        (score 1.0), then names by trigram similarity. ``city`` restricts the
+        results to partners of that city.
+        """
+        query = str(query or "").strip()
+        code = self.cities.get(normalize(city), -1) if city else None
+        codes = np.frombuffer(self.city_codes, dtype=np.intc)
+        results = [(1.0, self.positions[partner]) for partner in self._exact(query)
+                   if code is None or codes[self.positions[partner]] == code]
+
+        positions, scores = self._fuzzy(query, code)
+        wanted = limit + len(results)
+        if len(positions) > wanted:
+            top = np.argpartition(-scores, wanted - 1)[:wanted]
+            positions, scores = positions[top], scores[top]
+        seen = {position for _, position in results}
+        results.extend((float(score), int(position)) for score, position in zip(scores, positions)
+                       if int(position) not in seen)
+
+        results.sort(key=lambda result: (-result[0], self.rows[result[1]]["name"] or ""))
+        return [{**self.rows[position], "score": round(score, 3)} for score, position in results[:limit]]
+
+    def stats(self):
+        return {"partners": len(self), "positions": len(self.rows), "trigrams": len(self.postings),
+                "watermark": self.watermark}
+
+
+async def _load(client, index, domain):
+    count = 0
+    async for record in client.iter_search_read("res.partner", domain, INDEX_FIELDS, page_size=LOAD_PAGE_SIZE):
+        index.add(record)
+        count += 1
+    return count
+
+
+async def build_partner_index(client):
+    """Bulk-load every partner visible to ``client`` into a new PartnerIndex."""
+    started = time.perf_counter()
+    info("🗂️ Building partner search index")
+    index = PartnerIndex()
+    await _load(client, index, [])
+    index.refreshed_at = time.monotonic()
+    success("✅ Indexed {} partners ({} trigrams) in {:.1f}s", len(index), len(index.postings),
+            time.perf_counter() - started)
+    return index
+
+
+async def refresh_partner_index(client, index):
+    """
+    Apply partners written since the index's watermark, and return the index
+    to use from now on: the same one, a compacted copy, or a full rebuild when
+    partners were archived or deleted (the live count no longer matches).
+    """
+    domain = [["write_date", ">=", index.watermark]] if index.watermark else []
+    changed = await _load(client, index, domain)
+    total = await client.search_count("res.partner", [])
+    if total != len(index):
+        info("🗂️ Partner count changed ({} in Odoo, {} indexed), rebuilding the index", total, len(index))
+        return await build_partner_index(client)
+    if index.needs_compaction():
+        index = index.compact()
+    index.refreshed_at = time.monotonic()
+    debug("🔁 Refreshed partner index: {} partners changed since {}", changed, index.watermark)
+    return index
+
+
+# (url, db, username) -> PartnerIndex, and the asyncio.Lock serializing its refreshes
+_indexes = {}
+_refreshing = {}
+
+
+async def get_partner_index(client):
+    """
+    Return the partner index of ``client``'s database, built on first use and
+    refreshed incrementally once it is older than ODOO_PARTNER_INDEX_INTERVAL
+    seconds.
+    """
+    interval = float(os.environ.get("ODOO_PARTNER_INDEX_INTERVAL", DEFAULT_INTERVAL))
+    key = (client.url, client.db, client.username)
+    index = _indexes.get(key)
+    if index is not None and time.monotonic() - index.refreshed_at < interval:
+        return index
+    lock = _refreshing.setdefault(key, asyncio.Lock())
+    async with lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = await build_partner_index(client)
+        elif time.monotonic() - index.refreshed_at >= interval:
+            index = _indexes[key] = await refresh_partner_index(client, index)
+    return index
@@ -0,0 +1,234 @@
+import asyncio
+import datetime
+import heapq
+import math
+import os
+from logger import info, success, warning, error, debug
+
+DEFAULT_MIN_LIMIT = 500
+DEFAULT_SHARD_DAYS = 90
+DEFAULT_MAX_SHARDS = 12
+DEFAULT_PARALLELISM = 4
+SHARD_MODES = ("auto", "date", "company", "off")
+
+# Odoo's _order for the models whose queries get sharded; a merge needs the real order.
+DEFAULT_ORDERS = {
+    "account.move": "date desc, name desc, id desc",
+    "account.move.line": "date desc, move_name desc, id desc",
+}
+
+# Field types whose Python ordering matches PostgreSQL's, so shards can be merged on them.
+# Text (char, selection) sorts by the database collation, which Python does not
+# reproduce; reads ordered on text are only split by date when date leads the order.
+SCALAR_TYPES = ("date", "datetime", "integer", "float", "monetary", "boolean")
+
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def parse_order(order):
+    """``"date desc, id"`` -> ``[("date", True), ("id", False)]``."""
+    spec = []
+    for part in (order or "").split(","):
+        words = part.split()
+        if words:
+            spec.append((words[0], len(words) > 1 and words[1].lower() == "desc"))
+    return spec
+
+
+def date_bounds(domain, field="date"):
+    """Return (start, end) from top-level ``field >= start`` and ``field <= end`` leaves, or None."""
+    start = end = None
+    for leaf in domain:
+        if isinstance(leaf, (list, tuple)) and len(leaf) == 3 and leaf[0] == field:
+            if leaf[1] == ">=":
+                start = leaf[2]
+            elif leaf[1] == "<=":
+                end = leaf[2]
+    if start is None or end is None:
+        return None
+    return start, end
+
+
+def date_shards(start, end, shard_days, max_shards):
+    """
+    Split the inclusive ``[start, end]`` date range into contiguous, disjoint
+    ``(first, last)`` ranges of about ``shard_days`` days, at most ``max_shards``.
+    """
+    first = datetime.datetime.strptime(start, DATE_FORMAT).date()
+    last = datetime.datetime.strptime(end, DATE_FORMAT).date()
+    days = (last - first).days + 1
+    if days <= 0:
+        return []
+    count = min(max_shards, math.ceil(days / shard_days))
+    step = math.ceil(days / count)
+    shards = []
+    while first <= last:
+        shard_last = min(last, first + datetime.timedelta(days=step - 1))
+        shards.append((first.strftime(DATE_FORMAT), shard_last.strftime(DATE_FORMAT)))
+        first = shard_last + datetime.timedelta(days=1)
+    return shards
+
+
+class _Descending:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+
+def order_key(spec, types):
+    """
+    Sort key reproducing an Odoo ``order`` on fetched rows.
+
+    NULLs (``False`` on non-boolean fields) sort last ascending and first
+    descending, as in PostgreSQL.
+    """
+    def key(row):
+        parts = []
+        for field, descending in spec:
+            value = row.get(field)
+            if value is False and types.get(field) != "boolean" or value is None:
+                part = (1, 0)
+            else:
+                part = (0, value)
+            parts.append(_Descending(part) if descending else part)
+        return parts
+
+    return key
+
+
+class ShardPolicy:
+    """
+    When and how to split a search_read into shards.
+
+    Only large reads are split: an unbounded ``limit`` or one of at least
+    ``min_limit`` rows. ``mode`` picks the shard key: ``date`` splits the
+    query's own ``date`` range into ``shard_days`` slices, ``company`` runs
+    one query per company, ``auto`` tries date then company, ``off`` never
+    shards. At most ``parallelism`` shards run at once.
+    """
+
+    def __init__(self, mode="auto", min_limit=DEFAULT_MIN_LIMIT, shard_days=DEFAULT_SHARD_DAYS,
+                 max_shards=DEFAULT_MAX_SHARDS, parallelism=DEFAULT_PARALLELISM):
+        if mode not in SHARD_MODES:
+            raise ValueError(f"Invalid shard mode '{mode}', expected one of: {', '.join(SHARD_MODES)}")
+        self.mode = mode
+        self.min_limit = min_limit
+        self.shard_days = shard_days
+        self.max_shards = max_shards
+        self.parallelism = parallelism
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            mode=os.environ.get("ODOO_SHARD_BY", "auto"),
+            min_limit=int(os.environ.get("ODOO_SHARD_MIN_LIMIT", DEFAULT_MIN_LIMIT)),
+            shard_days=int(os.environ.get("ODOO_SHARD_DAYS", DEFAULT_SHARD_DAYS)),
+            max_shards=int(os.environ.get("ODOO_SHARD_MAX", DEFAULT_MAX_SHARDS)),
+            parallelism=int(os.environ.get("ODOO_SHARD_PARALLELISM", DEFAULT_PARALLELISM)),
+        )
+
+    def wants(self, limit):
+        return self.mode != "off" and (not limit or limit >= self.min_limit)
+
+
+class Plan:
+    """Shard domains of one query, and whether they are disjoint slices of the order's leading date."""
+
+    def __init__(self, kind, domains, ordered):
+        self.kind = kind
+        self.domains = domains
+        self.ordered = ordered
+
+
+def _mergeable(spec, schema):
+    return bool(spec) and all(schema.get(field, {}).get("type") in SCALAR_TYPES or field == "id"
+                              for field, _ in spec)
+
+
+async def make_plan(client, policy, model, domain, order):
+    """Return a Plan for a search_read on ``model``, or None to run it as a single query."""
+    schema = await client.fields_get(model)
+    spec = parse_order(order)
+
+    if policy.mode in ("auto", "date") and schema.get("date", {}).get("type") == "date":
+        bounds = date_bounds(domain)
+        if bounds is not None:
+            shards = date_shards(*bounds, policy.shard_days, policy.max_shards)
+            # Disjoint date slices come out in order when the order leads with date;
+            # otherwise the merge has to compare every order field.
+            ordered = bool(spec) and spec[0][0] == "date"
+            if len(shards) > 1 and (ordered or _mergeable(spec, schema)):
+                if ordered and spec[0][1]:
+                    shards.reverse()
+                return Plan("date", [domain + [["date", ">=", first], ["date", "<=", last]]
+                                     for first, last in shards], ordered)
+
+    if policy.mode in ("auto", "company") and "company_id" in schema and _mergeable(spec, schema):
+        groups = await client.read_group(model, domain, ["company_id"], ["company_id"])
+        companies = [group["company_id"][0] if group["company_id"] else False for group in groups]
+        if len(companies) > 1:
+            return Plan("company", [domain + [["company_id", "=", company]] for company in companies], False)
+    return None
+
+
+async def sharded_search_read(client, policy, model, domain, fields, limit, order):
+    """
+    Run a search_read as a set of shards and merge them into the exact result
+    of the unsharded query: the same rows in the same ``order``, cut at ``limit``.
+
+    Returns None when the query is not worth splitting or cannot be merged.
+    """
+    order = order or DEFAULT_ORDERS.get(model)
+    if not policy.wants(limit) or not order:
+        return None
+    plan = await make_plan(client, policy, model, domain, order)
+    if plan is None:
+        return None
+
+    spec = parse_order(order)
+    extra = [field for field, _ in spec if fields is not None and field not in fields and field != "id"]
+    fetch_fields = fields + extra if fields is not None else None
+    info("🧩 Splitting search_read on {} into {} {} shards ({} at a time)",
+         model, len(plan.domains), plan.kind, policy.parallelism)
+
+    async def fetch(shard_domain, shard_limit):
+        return await client.search_read(model, shard_domain, fetch_fields, limit=shard_limit, order=order)
+
+    if plan.ordered:
+        # Shards are already in result order: run them in waves and stop once the limit is reached.
+        rows = []
+        for start in range(0, len(plan.domains), policy.parallelism):
+            wave = plan.domains[start:start + policy.parallelism]
+            remaining = limit - len(rows) if limit else None
+            for page in await asyncio.gather(*(fetch(shard, remaining) for shard in wave)):
+                rows.extend(page)
+            if limit and len(rows) >= limit:
+                break
+    else:
+        # Every shard may hold the first rows: fetch up to ``limit`` from each and k-way merge.
+        slots = asyncio.Semaphore(policy.parallelism)
+
+        async def bounded(shard):
+            async with slots:
+                return await fetch(shard, limit or None)
+
+        pages = await asyncio.gather(*(bounded(shard) for shard in plan.domains))
+        key = order_key(spec, {field: definition.get("type") for field, definition in
+                               (await client.fields_get(model)).items()})
+        rows = list(heapq.merge(*pages, key=key))
+
+    if limit:
+        rows = rows[:limit]
+    if extra:
+        for row in rows:
+            for field in extra:
+                row.pop(field, None)
+    success("✅ Merged {} records from {} shards of {}", len(rows), len(plan.domains), model)
+    return rows
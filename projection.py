@@ -0,0 +1,79 @@
+from logger import info, success, warning, error, debug
+
+PROFILES = ("minimal", "standard", "full")
+RESPONSE_FORMATS = ("records", "columns")
+
+# Just enough to identify a record; models not listed get display_name.
+MINIMAL_FIELDS = {
+    "account.move": ["name", "date", "amount_total"],
+    "account.move.line": ["name", "date", "balance"],
+    "res.partner": ["name"],
+    "account.account": ["code", "name"],
+    "account.journal": ["name", "code"],
+    "account.analytic.account": ["name", "code"],
+}
+
+# Field types left out of the "full" profile: file contents are never useful to an agent.
+FULL_PROFILE_EXCLUDED_TYPES = ("binary",)
+
+
+def parse_fields(fields):
+    """Accept a comma-separated string or a list of field names."""
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    return [field.strip() for field in fields or [] if field.strip()]
+
+
+async def resolve_fields(odoo, model, standard, requested=None):
+    """
+    Turn a ``fields`` argument into the field list to send to Odoo.
+
+    ``requested`` is a profile name or an explicit field list:
+    - None or "standard": ``standard``, the tool's own field list
+    - "minimal": the few fields that identify a record
+    - "full": every non-binary field of the model, from ``fields_get``
+    - a list or comma-separated string: those fields, validated against
+      ``fields_get`` so a typo fails here instead of in Odoo
+    """
+    if requested is None or requested == "standard":
+        return standard
+    if requested == "minimal":
+        return MINIMAL_FIELDS.get(model, ["display_name"])
+
+    schema = await odoo.fields_get(model)
+    if requested == "full":
+        return [field for field, definition in schema.items()
+                if definition.get("type") not in FULL_PROFILE_EXCLUDED_TYPES]
+
+    fields = parse_fields(requested)
+    if not fields:
+        raise ValueError(f"Expected a profile ({', '.join(PROFILES)}) or a list of fields")
+    unknown = [field for field in fields if field not in schema and field != "id"]
+    if unknown:
+        raise ValueError(f"Unknown fields for {model}: {', '.join(unknown)}")
+    debug("✂️ Projecting {} on {} fields: {}", model, len(fields), ", ".join(fields))
+    return fields
+
+
+def to_columns(records, fields=None):
+    """
+    Columnar layout: field names once, then one array per record.
+
+    ``{"fields": ["id", "name"], "rows": [[1, "A"], [2, "B"]]}`` repeats no
+    keys, so large result sets are smaller and faster to serialize.
+    """
+    if fields is None:
+        fields = list(dict.fromkeys(key for record in records for key in record))
+    else:
+        # search_read always returns the id, whatever fields were asked for
+        fields = ["id"] + [field for field in fields if field != "id"]
+    return {"fields": fields, "rows": [[record.get(field, False) for field in fields] for record in records]}
+
+
+def shape(records, fields=None, response_format=None):
+    """Return ``records`` unchanged or in the columnar layout."""
+    if response_format in (None, "records"):
+        return records
+    if response_format == "columns":
+        return to_columns(records, fields)
+    raise ValueError(f"Invalid response_format '{response_format}', expected one of: {', '.join(RESPONSE_FORMATS)}")
@@ -0,0 +1,276 @@
+import bisect
+import datetime
+import re
+import numpy as np
+from logger import info, success, warning, error, debug
+
+RECONCILABLE_ACCOUNT_TYPES = ["asset_receivable", "liability_payable"]
+ITEM_FIELDS = ["move_id", "move_name", "name", "ref", "partner_id", "account_id", "date", "date_maturity",
+               "amount_residual"]
+STATEMENT_LINE_FIELDS = ["date", "amount", "partner_id", "payment_ref", "journal_id"]
+PAGE_SIZE = 2000
+
+DEFAULT_WINDOW_DAYS = 90
+DEFAULT_TOLERANCE = 0.01
+
+# Weight of each component of a proposal's score.
+WEIGHTS = {"amount": 0.4, "partner": 0.25, "reference": 0.25, "date": 0.1}
+MIN_SCORE = 0.45
+# Every item beyond the first lowers a many-to-one proposal's score by this factor.
+COMBINATION_PENALTY = 0.95
+
+# Open items looked at per statement line: the ones of the right amount and,
+# for many-to-one matches, the partner's items nearest in date.
+MAX_AMOUNT_CANDIDATES = 50
+MAX_SUBSET_ITEMS = 30
+MAX_SUBSET_SIZE = 4
+# Search steps of one subset-sum; past this the line gets no more many-to-one proposals.
+SUBSET_BUDGET = 5000
+# One-to-one proposals at least this good skip the subset search.
+GOOD_SCORE = 0.7
+
+# Words of a payment reference shorter than this ("INV", "EUR") match too many items.
+MIN_REFERENCE_LENGTH = 4
+SEPARATORS = re.compile(r"[\s,;]+")
+PUNCTUATION = re.compile(r"[^0-9A-Z]")
+
+EPOCH = datetime.date(1970, 1, 1)
+
+
+def _days(value):
+    if not value:
+        return None
+    return (datetime.date.fromisoformat(str(value)[:10]) - EPOCH).days
+
+
+def _cents(value):
+    return int(round((value or 0.0) * 100))
+
+
+def reference_tokens(text):
+    """Normalized words of a payment reference or document number: ``INV/2024/0012`` -> ``INV20240012``."""
+    tokens = {PUNCTUATION.sub("", word) for word in SEPARATORS.split(str(text or "").upper())}
+    return {token for token in tokens if len(token) >= MIN_REFERENCE_LENGTH}
+
+
+class OpenItems:
+    """
+    Unreconciled receivable and payable journal items as NumPy columns, indexed
+    by residual amount (a sorted array, searched with a tolerance), by partner
+    (positions sorted by date) and by normalized document number and reference.
+    """
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.cents = np.array([_cents(row["amount_residual"]) for row in rows], dtype=np.int64)
+        self.days = np.array([str(row.get("date_maturity") or row["date"])[:10] for row in rows],
+                             dtype="datetime64[D]").astype(np.int64)
+        self.partners = np.array([row["partner_id"][0] if row["partner_id"] else 0 for row in rows], dtype=np.int64)
+
+        self.by_amount = np.argsort(self.cents, kind="stable")
+        self.sorted_cents = self.cents[self.by_amount]
+
+        by_partner = np.lexsort((self.days, self.partners))
+        partners, starts = np.unique(self.partners[by_partner], return_index=True)
+        self.by_partner = dict(zip(partners.tolist(), np.split(by_partner, starts[1:])))
+
+        self.by_reference = {}
+        for position, row in enumerate(rows):
+            move = row["move_id"][1] if row["move_id"] else None
+            for token in reference_tokens(f"{row.get('move_name') or move or ''} {row.get('ref') or ''}"):
+                self.by_reference.setdefault(token, []).append(position)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def amount_ranges(self, targets, tolerance):
+        """(start, end) slices of ``by_amount`` within ``tolerance`` cents of each target, for all targets at once."""
+        return (np.searchsorted(self.sorted_cents, targets - tolerance, side="left"),
+                np.searchsorted(self.sorted_cents, targets + tolerance, side="right"))
+
+    def near(self, partner, day, window):
+        """Positions of ``partner``'s items dated within ``window`` days of ``day``, nearest first."""
+        positions = self.by_partner.get(partner)
+        if positions is None:
+            return positions
+        days = self.days[positions]
+        start, end = np.searchsorted(days, day - window), np.searchsorted(days, day + window, side="right")
+        positions = positions[start:end]
+        return positions[np.argsort(np.abs(self.days[positions] - day), kind="stable")]
+
+    def describe(self, position):
+        row = self.rows[position]
+        return {
+            "id": row["id"],
+            "move_id": row["move_id"],
+            "partner_id": row["partner_id"],
+            "account_id": row["account_id"],
+            "date": row.get("date_maturity") or row["date"],
+            "amount_residual": row["amount_residual"],
+        }
+
+
+def subset_sums(values, target, tolerance, max_size=MAX_SUBSET_SIZE, budget=SUBSET_BUDGET, limit=3):
+    """
+    Up to ``limit`` combinations of 2 to ``max_size`` indices of ``values``
+    (cents) summing to ``target`` within ``tolerance``. A depth-first search
+    picks all but the last value in ascending order of magnitude and finds
+    the last one by binary search, pruning branches that can only overshoot,
+    and gives up after ``budget`` steps.
+    """
+    sign = 1 if target > 0 else -1
+    order = sorted((index for index, value in enumerate(values) if 0 < value * sign <= abs(target) + tolerance),
+                   key=lambda index: values[index] * sign)
+    magnitudes = [values[index] * sign for index in order]
+    steps = [budget]
+    found = []
+
+    def search(start, chosen, remaining):
+        if chosen:
+            end = bisect.bisect_right(magnitudes, remaining + tolerance, start)
+            for last in range(bisect.bisect_left(magnitudes, remaining - tolerance, start), end):
+                found.append(tuple(order[at] for at in chosen + [last]))
+                if len(found) >= limit:
+                    return
+        if len(chosen) + 2 > max_size:
+            return
+        for at in range(start, len(order)):
+            steps[0] -= 1
+            left = remaining - magnitudes[at]
+            # The values after this one are at least as large: none of them can complete the sum.
+            if steps[0] < 0 or len(found) >= limit or left + tolerance < magnitudes[at]:
+                return
+            search(at + 1, chosen + [at], left)
+
+    search(0, [], abs(target))
+    return found
+
+
+def _statement_line(row):
+    return {
+        "statement_line_id": [row["id"], row.get("payment_ref") or ""],
+        "date": row["date"],
+        "amount": row["amount"],
+        "partner_id": row["partner_id"],
+    }
+
+
+def suggest(items, lines, window=DEFAULT_WINDOW_DAYS, tolerance=DEFAULT_TOLERANCE, min_score=MIN_SCORE):
+    """
+    Propose open items for each statement line: one-to-one matches found
+    through the amount index and the references the line's label mentions,
+    and many-to-one matches of several of the partner's items whose residuals
+    add up to the line's amount. Proposals are then accepted best first, so
+    no statement line or open item is used twice.
+    """
+    tolerance = _cents(tolerance)
+    targets = np.array([_cents(line["amount"]) for line in lines], dtype=np.int64)
+    starts, ends = items.amount_ranges(targets, tolerance)
+    # Scoring looks at a handful of items at a time, faster on Python ints than on NumPy scalars.
+    cents, days, partners = items.cents.tolist(), items.days.tolist(), items.partners.tolist()
+    proposals = []
+
+    for index, line in enumerate(lines):
+        target, day = int(targets[index]), _days(line["date"])
+        if not target or day is None:
+            continue
+        partner = line["partner_id"][0] if line["partner_id"] else 0
+        referenced = set()
+        for token in reference_tokens(line.get("payment_ref")):
+            positions = items.by_reference.get(token, ())
+            # A word many items share (a customer code, a year) identifies none of them.
+            if len(positions) <= MAX_AMOUNT_CANDIDATES:
+                referenced.update(positions)
+
+        def score(positions):
+            difference = abs(sum(cents[p] for p in positions) - target)
+            if difference > tolerance:
+                return None
+            dates = [abs(days[p] - day) for p in positions]
+            if max(dates) > window:
+                return None
+            value = (WEIGHTS["amount"] * (1.0 - difference / (tolerance + 1))
+                     + WEIGHTS["partner"] * all(partner and partners[p] == partner for p in positions)
+                     + WEIGHTS["reference"] * sum(p in referenced for p in positions) / len(positions)
+                     + WEIGHTS["date"] * (1 - sum(dates) / len(dates) / (window + 1)))
+            return value * COMBINATION_PENALTY ** (len(positions) - 1)
+
+        candidates = items.by_amount[starts[index]:ends[index]]
+        if len(candidates) > MAX_AMOUNT_CANDIDATES:
+            nearest = np.argpartition(np.abs(items.days[candidates] - day), MAX_AMOUNT_CANDIDATES - 1)
+            candidates = candidates[nearest[:MAX_AMOUNT_CANDIDATES]]
+        best = 0.0
+        for position in set(candidates.tolist()) | referenced:
+            value = score((position,))
+            if value is not None and value >= min_score:
+                proposals.append((value, index, (position,)))
+                best = max(best, value)
+
+        if partner and best < GOOD_SCORE:
+            near = items.near(partner, day, window)
+            if near is not None and len(near) >= 2:
+                near = near[:MAX_SUBSET_ITEMS]
+                for combination in subset_sums(items.cents[near].tolist(), target, tolerance):
+                    positions = tuple(int(near[at]) for at in combination)
+                    value = score(positions)
+                    if value is not None and value >= min_score:
+                        proposals.append((value, index, positions))
+
+    proposals.sort(key=lambda proposal: -proposal[0])
+    used_lines, used_items, accepted = set(), set(), []
+    for value, index, positions in proposals:
+        if index in used_lines or used_items.intersection(positions):
+            continue
+        used_lines.add(index)
+        used_items.update(positions)
+        accepted.append({
+            **_statement_line(lines[index]),
+            "match": "one_to_one" if len(positions) == 1 else "many_to_one",
+            "score": round(value, 3),
+            "difference": (int(targets[index]) - sum(cents[p] for p in positions)) / 100,
+            "items": [items.describe(position) for position in positions],
+        })
+    return accepted
+
+
+async def _load(client, model, domain, fields):
+    return [row async for row in client.iter_search_read(model, domain, fields, page_size=PAGE_SIZE)]
+
+
+async def load_open_items(client, company_id=None, partner_id=None):
+    """Posted, unreconciled receivable and payable journal items with a residual, as OpenItems."""
+    accounts = await client.search_read("account.account", [["account_type", "in", RECONCILABLE_ACCOUNT_TYPES]],
+                                        ["id"], limit=None)
+    domain = [["parent_state", "=", "posted"], ["reconciled", "=", False],
+              ["account_id", "in", [account["id"] for account in accounts]], ["amount_residual", "!=", 0]]
+    if company_id:
+        domain.append(["company_id", "=", company_id])
+    if partner_id:
+        domain.append(["partner_id", "=", partner_id])
+    return OpenItems(await _load(client, "account.move.line", domain, ITEM_FIELDS))
+
+
+async def load_statement_lines(client, start_date=None, end_date=None, journal_id=None, company_id=None, partner_id=None):
+    domain = [["is_reconciled", "=", False]]
+    if start_date:
+        domain.append(["date", ">=", start_date])
+    if end_date:
+        domain.append(["date", "<=", end_date])
+    if journal_id:
+        domain.append(["journal_id", "=", journal_id])
+    if company_id:
+        domain.append(["company_id", "=", company_id])
+    if partner_id:
+        domain.append(["partner_id", "=", partner_id])
+    return await _load(client, "account.bank.statement.line", domain, STATEMENT_LINE_FIELDS)
+
+
+async def suggest_matches(client, start_date=None, end_date=None, journal_id=None, company_id=None, partner_id=None,
+                          window=DEFAULT_WINDOW_DAYS, tolerance=DEFAULT_TOLERANCE, min_score=MIN_SCORE):
+    """Load open items and unreconciled statement lines, and return (proposals, statement line count, open item count)."""
+    lines = await load_statement_lines(client, start_date, end_date, journal_id, company_id, partner_id)
+    items = await load_open_items(client, company_id, partner_id)
+    info("🔗 Matching {} statement lines against {} open items", len(lines), len(items))
+    proposals = suggest(items, lines, window, tolerance, min_score)
+    success("✅ Proposed {} reconciliations for {} statement lines", len(proposals), len(lines))
+    return proposals, len(lines), len(items)
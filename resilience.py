@@ -0,0 +1,328 @@
+import asyncio
+import contextvars
+import http.client
+import os
+import random
+import threading
+import time
+import xmlrpc.client
+import httpx
+import metrics
+from logger import info, success, warning, error, debug
+
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.2
+DEFAULT_MAX_BACKOFF = 5.0
+DEFAULT_DEADLINE = 120.0
+DEFAULT_BREAKER_THRESHOLD = 5
+DEFAULT_BREAKER_COOLDOWN = 30.0
+
+# Calls that only read, so sending them twice is harmless.
+IDEMPOTENT_METHODS = frozenset({
+    "search", "search_read", "search_count", "read", "read_group", "fields_get",
+    "name_search", "name_get", "default_get", "check_access_rights",
+    "authenticate", "version",
+})
+
+# HTTP statuses a proxy in front of Odoo returns while it is overloaded or restarting.
+TRANSIENT_STATUSES = (429, 502, 503, 504)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Monotonic time by which the call_with_retries / acall_with_retries call in progress must be done.
+_call_deadline = contextvars.ContextVar("odoo_call_deadline", default=None)
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling Odoo while its circuit breaker is open."""
+
+
+def capped_timeout(timeout):
+    """``timeout``, cut down to the time left before the deadline of the call in progress."""
+    deadline = _call_deadline.get()
+    if deadline is None:
+        return timeout
+    # Never 0: a socket with a zero timeout is non-blocking and fails at once.
+    return max(0.001, min(timeout, deadline - time.monotonic()))
+
+
+class _DeadlineConnectionMixin:
+    """
+    Connect within ``connect_timeout``, then switch the socket to
+    ``read_timeout`` for the response. Both are capped by the deadline of the
+    call in progress, so the last attempt cannot run past it.
+    """
+
+    def __init__(self, host, connect_timeout, read_timeout, **kwargs):
+        super().__init__(host, timeout=connect_timeout, **kwargs)
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+
+    def connect(self):
+        self.timeout = capped_timeout(self.connect_timeout)
+        super().connect()
+        self.sock.settimeout(capped_timeout(self.read_timeout))
+
+    def putrequest(self, *args, **kwargs):
+        # A keep-alive socket still has the timeout of the previous call.
+        if self.sock is not None:
+            self.sock.settimeout(capped_timeout(self.read_timeout))
+        super().putrequest(*args, **kwargs)
+
+
+class DeadlineHTTPConnection(_DeadlineConnectionMixin, http.client.HTTPConnection):
+    pass
+
+
+class DeadlineHTTPSConnection(_DeadlineConnectionMixin, http.client.HTTPSConnection):
+    pass
+
+
+class DeadlineXmlRpcTransport(xmlrpc.client.Transport):
+    """xmlrpc.client transport whose keep-alive connection has connect and read deadlines."""
+
+    def __init__(self, policy, https=False):
+        super().__init__()
+        self.policy = policy
+        self.https = https
+
+    def make_connection(self, host):
+        if self._connection and host == self._connection[0]:
+            return self._connection[1]
+        chost, self._extra_headers, _ = self.get_host_info(host)
+        connection_class = DeadlineHTTPSConnection if self.https else DeadlineHTTPConnection
+        self._connection = host, connection_class(
+            chost, self.policy.connect_timeout, self.policy.read_timeout
+        )
+        return self._connection[1]
+
+
+class RetryPolicy:
+    """
+    Deadlines and retry rules for Odoo RPCs.
+
+    Each call connects within ``connect_timeout`` and waits at most
+    ``read_timeout`` for the response, or less once the attempt would end
+    past ``deadline``. Idempotent reads that fail with a
+    transport error are retried up to ``retries`` times with full-jitter
+    exponential backoff, as long as the total time stays under ``deadline``.
+    Calls that never reached Odoo (connection refused or timed out while
+    connecting) are retried whatever the method.
+    """
+
+    def __init__(self, connect_timeout=DEFAULT_CONNECT_TIMEOUT, read_timeout=DEFAULT_READ_TIMEOUT,
+                 retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, max_backoff=DEFAULT_MAX_BACKOFF,
+                 deadline=DEFAULT_DEADLINE):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            connect_timeout=float(os.environ.get("ODOO_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT)),
+            read_timeout=float(os.environ.get("ODOO_READ_TIMEOUT", DEFAULT_READ_TIMEOUT)),
+            retries=int(os.environ.get("ODOO_RETRIES", DEFAULT_RETRIES)),
+            backoff=float(os.environ.get("ODOO_RETRY_BACKOFF", DEFAULT_BACKOFF)),
+            max_backoff=float(os.environ.get("ODOO_RETRY_MAX_BACKOFF", DEFAULT_MAX_BACKOFF)),
+            deadline=float(os.environ.get("ODOO_RPC_DEADLINE", DEFAULT_DEADLINE)),
+        )
+
+    def httpx_timeout(self):
+        return httpx.Timeout(capped_timeout(self.read_timeout), connect=capped_timeout(self.connect_timeout))
+
+    def delay(self, attempt):
+        """Full jitter: uniform between 0 and the capped exponential backoff."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    @staticmethod
+    def is_transient(exc):
+        """True for transport failures, as opposed to Odoo answering with a fault."""
+        if isinstance(exc, xmlrpc.client.ProtocolError):
+            return exc.errcode in TRANSIENT_STATUSES
+        if isinstance(exc, CircuitOpenError):
+            return False
+        return isinstance(exc, (OSError, http.client.HTTPException, httpx.TransportError))
+
+    @staticmethod
+    def never_sent(exc):
+        """True if the request cannot have reached Odoo, so even a write is safe to resend."""
+        return isinstance(exc, (ConnectionRefusedError, httpx.ConnectError, httpx.ConnectTimeout))
+
+    def should_retry(self, exc, method, attempt, elapsed, delay):
+        if attempt >= self.retries or elapsed + delay > self.deadline:
+            return False
+        if not self.is_transient(exc):
+            return False
+        return method in IDEMPOTENT_METHODS or self.never_sent(exc)
+
+
+class CircuitBreaker:
+    """
+    Per Odoo instance breaker that fails fast while Odoo is unreachable.
+
+    ``threshold`` consecutive transport failures open the circuit; calls
+    then raise CircuitOpenError without touching the network. After
+    ``cooldown`` seconds one probe call is let through (half-open): success
+    closes the circuit, failure opens it for another cooldown. Faults count
+    as success, since Odoo answered.
+    """
+
+    def __init__(self, name, threshold=DEFAULT_BREAKER_THRESHOLD, cooldown=DEFAULT_BREAKER_COOLDOWN):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, name):
+        return cls(
+            name,
+            threshold=int(os.environ.get("ODOO_BREAKER_THRESHOLD", DEFAULT_BREAKER_THRESHOLD)),
+            cooldown=float(os.environ.get("ODOO_BREAKER_COOLDOWN", DEFAULT_BREAKER_COOLDOWN)),
+        )
+
+    def _transition(self, state):
+        self.state = state
+        metrics.BREAKER_TRANSITIONS.inc(self.name, state)
+
+    def before_call(self):
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+                self._transition(HALF_OPEN)
+            now = time.monotonic()
+            # A probe that never reported back (e.g. a cancelled task) is replaced after a cooldown.
+            if self.state == HALF_OPEN and (self._probe_started is None or now - self._probe_started >= self.cooldown):
+                self._probe_started = now
+                return
+            retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+        raise CircuitOpenError(f"Odoo at {self.name} is unavailable, not retrying for {retry_in:.0f}s")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probe_started = None
+            if self.state != CLOSED:
+                info("🟢 Odoo at {} is reachable again, closing the circuit", self.name)
+                self._transition(CLOSED)
+
+    def record_failure(self):
+        if self.threshold <= 0:
+            return
+        with self._lock:
+            self.failures += 1
+            self._probe_started = None
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.failures >= self.threshold):
+                warning("🔴 Odoo at {} failed {} calls in a row, failing fast for {}s",
+                        self.name, self.failures, self.cooldown)
+                self.opened_at = time.monotonic()
+                self._transition(OPEN)
+
+    def stats(self):
+        return {"state": self.state, "consecutive_failures": self.failures}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(url):
+    """Return the breaker shared by every client (sync or async) of the Odoo instance at ``url``."""
+    with _breakers_lock:
+        breaker = _breakers.get(url)
+        if breaker is None:
+            breaker = _breakers[url] = CircuitBreaker.from_env(url)
+    return breaker
+
+
+def _settle(breaker, exc):
+    if RetryPolicy.is_transient(exc):
+        breaker.record_failure()
+    elif not isinstance(exc, CircuitOpenError):
+        breaker.record_success()
+
+
+def _log_retry(exc, model, method, attempt, retries, delay):
+    metrics.RPC_RETRIES.inc(model, method, type(exc).__name__)
+    warning("🔁 {} on {} {}, retry {}/{} in {:.2f}s", type(exc).__name__, model or "common", method,
+            attempt, retries, delay)
+
+
+def _start_deadline(policy, started):
+    """Set the deadline of a call starting now; a nested call never extends its caller's."""
+    deadline = started + policy.deadline
+    outer = _call_deadline.get()
+    return _call_deadline.set(deadline if outer is None else min(outer, deadline))
+
+
+def call_with_retries(policy, breaker, model, method, func):
+    """Run ``func()`` behind ``breaker``, retrying it as ``policy`` allows."""
+    started = time.monotonic()
+    token = _start_deadline(policy, started)
+    try:
+        return _call_with_retries(policy, breaker, model, method, func, started)
+    finally:
+        _call_deadline.reset(token)
+
+
+def _call_with_retries(policy, breaker, model, method, func, started):
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            result = func()
+        except Exception as e:
+            _settle(breaker, e)
+            delay = policy.delay(attempt)
+            if not policy.should_retry(e, method, attempt, time.monotonic() - started, delay):
+                raise
+            attempt += 1
+            _log_retry(e, model, method, attempt, policy.retries, delay)
+            time.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
+
+
+async def acall_with_retries(policy, breaker, model, method, func):
+    """asyncio version of call_with_retries; ``func()`` returns an awaitable."""
+    started = time.monotonic()
+    token = _start_deadline(policy, started)
+    try:
+        return await _acall_with_retries(policy, breaker, model, method, func, started)
+    finally:
+        _call_deadline.reset(token)
+
+
+async def _acall_with_retries(policy, breaker, model, method, func, started):
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            result = await func()
+        except Exception as e:
+            _settle(breaker, e)
+            delay = policy.delay(attempt)
+            if not policy.should_retry(e, method, attempt, time.monotonic() - started, delay):
+                raise
+            attempt += 1
+            _log_retry(e, model, method, attempt, policy.retries, delay)
+            await asyncio.sleep(delay)
+        else:
+            breaker.record_success()
+            return result
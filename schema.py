@@ -0,0 +1,264 @@
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from logger import info, success, warning, error, debug
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "odoo-mcp-server", "schema")
+# Seconds between checks that the fields known to Odoo did not change (a module
+# was installed or upgraded), and the maximum age of cached definitions when
+# that cannot be checked (no read access to ir.model.fields).
+DEFAULT_CHECK_INTERVAL = 300
+DEFAULT_MAX_AGE = 86400
+
+# Models the tools query; warmed in the background at startup.
+WARM_MODELS = [
+    "account.move",
+    "account.move.line",
+    "account.account",
+    "account.journal",
+    "account.analytic.account",
+    "res.partner",
+]
+
+# Domain leaves may use these without them being listed by fields_get.
+IMPLICIT_FIELDS = ("id",)
+
+
+def _safe(value):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(value))
+
+
+class SchemaRegistry:
+    """
+    Field definitions per model, fetched with ``fields_get`` once and kept.
+
+    Definitions are persisted to ``<cache_dir>/<host>-<db>-<user>-<server_version>.json``
+    so a restart (or an upgrade to a new Odoo version, which gets a new file)
+    does not need to ask Odoo again. They are per user, since field access
+    rights differ between users. Installing or upgrading a module adds fields
+    without changing the server version, so the clients compare a fingerprint
+    of ``ir.model.fields`` (see fingerprint()) every ``check_interval``
+    seconds and the definitions are dropped and fetched again when it changed.
+    Clients use the registry to drop fields a model does not have from field
+    lists and to reject domains on unknown fields before sending the RPC.
+    """
+
+    def __init__(self, url, db, username=None, cache_dir=DEFAULT_CACHE_DIR, check_interval=DEFAULT_CHECK_INTERVAL,
+                 max_age=DEFAULT_MAX_AGE):
+        self.url = url
+        self.db = db
+        self.username = username
+        self.cache_dir = cache_dir
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self.server_version = None
+        self.fingerprint = None
+        self.fetched_at = None
+        self.checked_at = None
+        self.models = {}
+        self._pruned = set()
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        if not self.cache_dir or self.server_version is None:
+            return None
+        host = urllib.parse.urlsplit(self.url).netloc or self.url
+        name = "-".join(_safe(part) for part in (host, self.db, self.username or "", self.server_version))
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    @property
+    def loaded(self):
+        return self.server_version is not None
+
+    def load(self, server_version):
+        """Bind the registry to ``server_version`` and read its on-disk cache, if any."""
+        with self._lock:
+            if self.server_version == server_version:
+                return
+            self.server_version = server_version
+            self.models = {}
+            self.fingerprint = self.fetched_at = self.checked_at = None
+            path = self.path
+            if path is None or not os.path.exists(path):
+                return
+            try:
+                with open(path) as f:
+                    data = json.load(f)
+                self.models = data.get("models", {})
+                self.fingerprint = data.get("fingerprint")
+                self.fetched_at = data.get("fetched_at")
+                info("📚 Loaded schema of {} models from {}", len(self.models), path)
+            except (OSError, ValueError) as e:
+                warning("⚠️ Ignoring unreadable schema cache {}: {}", path, e)
+
+    def save(self):
+        path = self.path
+        if path is None:
+            return
+        with self._lock:
+            data = {"server_version": self.server_version, "db": self.db, "username": self.username,
+                    "fingerprint": self.fingerprint, "fetched_at": self.fetched_at, "models": self.models}
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write then rename, so a crash never leaves a half-written cache
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            warning("⚠️ Could not write schema cache {}: {}", path, e)
+
+    def get(self, model):
+        return self.models.get(model)
+
+    def put(self, model, fields):
+        with self._lock:
+            if not self.models:
+                self.fetched_at = time.time()
+            self.models[model] = fields
+
+    def needs_check(self):
+        """
+        True once every ``check_interval`` seconds, for the caller that should
+        compare the fingerprint (see validate()); concurrent callers get False.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self.checked_at is not None and now - self.checked_at < self.check_interval:
+                return False
+            self.checked_at = now
+            return True
+
+    def validate(self, fingerprint):
+        """
+        Drop the cached definitions when ``fingerprint`` differs from the one
+        they were fetched under, or, when it could not be computed (None),
+        once they are older than ``max_age`` seconds.
+        """
+        with self._lock:
+            if fingerprint is not None:
+                stale = self.fingerprint is not None and fingerprint != self.fingerprint
+            else:
+                stale = self.fetched_at is not None and time.time() - self.fetched_at > self.max_age
+            if stale and self.models:
+                info("📚 Fields changed on the Odoo server, fetching the schema of {} models again", len(self.models))
+                self.models = {}
+                self._pruned.clear()
+                self.fetched_at = None
+            changed = fingerprint != self.fingerprint
+            self.fingerprint = fingerprint
+        if stale or changed:
+            self.save()
+
+    def missing(self, models):
+        return [model for model in models if model not in self.models]
+
+    def prune_fields(self, model, fields):
+        """Return ``fields`` without the ones ``model`` does not have (unknown models pass through)."""
+        schema = self.models.get(model)
+        if schema is None or not fields:
+            return fields
+        kept = [field for field in fields if field in schema or field in IMPLICIT_FIELDS]
+        if len(kept) != len(fields):
+            dropped = [field for field in fields if field not in kept]
+            key = (model, tuple(dropped))
+            if key not in self._pruned:
+                self._pruned.add(key)
+                warning("✂️ Dropping {} from {} queries: not present on this Odoo server", ", ".join(dropped), model)
+        return kept
+
+    def check_domain(self, model, domain):
+        """
+        Raise ValueError if a domain leaf names a field ``model`` does not have.
+
+        Dotted paths (``account_id.account_type``) are followed through the
+        relation as long as the related model's schema is known.
+        """
+        for leaf in domain:
+            if not isinstance(leaf, (list, tuple)) or len(leaf) != 3:
+                continue
+            current = model
+            for name in str(leaf[0]).split("."):
+                schema = self.models.get(current)
+                if schema is None:
+                    break
+                if name not in schema and name not in IMPLICIT_FIELDS:
+                    raise ValueError(f"Unknown field '{leaf[0]}' in domain for {model}")
+                current = schema.get(name, {}).get("relation")
+                if current is None:
+                    break
+
+    def stats(self):
+        return {"server_version": self.server_version, "models": len(self.models), "path": self.path,
+                "fingerprint": self.fingerprint}
+
+
+# What the fingerprint reads: the number of field definitions and the latest change to one.
+FINGERPRINT_MODEL = "ir.model.fields"
+
+
+def fingerprint(count, latest):
+    """Fingerprint of the server's fields from ``search_count`` and the newest ``write_date`` of ir.model.fields."""
+    return f"{count}:{latest[0]['write_date'] if latest else ''}"
+
+
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_schema_registry(url, db, username=None):
+    """
+    Return the registry shared by every client of ``username`` on the Odoo
+    database at ``url``.
+
+    ODOO_SCHEMA_CACHE_DIR overrides where schemas are persisted; set it to
+    an empty string to keep them in memory only. ODOO_SCHEMA_CHECK_INTERVAL
+    and ODOO_SCHEMA_MAX_AGE override how often the cache is revalidated and
+    how long it is kept when it cannot be.
+    """
+    key = (url, db, username)
+    with _registries_lock:
+        registry = _registries.get(key)
+        if registry is None:
+            registry = _registries[key] = SchemaRegistry(
+                url, db, username,
+                cache_dir=os.environ.get("ODOO_SCHEMA_CACHE_DIR", DEFAULT_CACHE_DIR),
+                check_interval=float(os.environ.get("ODOO_SCHEMA_CHECK_INTERVAL", DEFAULT_CHECK_INTERVAL)),
+                max_age=float(os.environ.get("ODOO_SCHEMA_MAX_AGE", DEFAULT_MAX_AGE)),
+            )
+    return registry
+
+
+async def warm_schema(client, models=WARM_MODELS):
+    """Fetch and persist the schema of ``models`` that are not cached yet, through the tools' async client."""
+    registry = await client.schema_registry()
+
+    async def fetch(model):
+        try:
+            await client.fields_get(model)
+        except Exception as e:
+            # The user may not have access to every model; the others are still useful.
+            warning("⚠️ Could not fetch the schema of {}: {}", model, e)
+
+    await asyncio.gather(*(fetch(model) for model in registry.missing(models)))
+    success("✅ Schema registry ready: {} models for Odoo {}", len(registry.models), registry.server_version)
+
+
+def start_schema_warmup(client_factory, models=WARM_MODELS):
+    """
+    Warm the schema registry in a background task of the running event loop,
+    so startup does not wait for Odoo. ``client_factory`` is awaited for the
+    client, e.g. get_async_odoo_client.
+    """
+    async def run():
+        try:
+            await warm_schema(await client_factory(), models)
+        except Exception as e:
+            warning("⚠️ Schema warm-up failed: {}", e)
+
+    return asyncio.get_running_loop().create_task(run())
@@ -1,30 +1,43 @@
-import json
-import sys
-from mcp.server.fastmcp import Context
+import contextlib
+import inspect
+import os
 from typing import Optional, Dict, Any, List
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 import uvicorn
-from mcp.server.fastmcp import FastMCP
 
-from odoo_client import get_odoo_client
+from odoo_client import get_async_odoo_client, json_dumps
+from projection import resolve_fields
+from schema import start_schema_warmup
+from mcp_server import mcp
+from metrics import http_metrics_middleware, render as render_metrics
 from logger import info, success, warning, error, debug, divider
-from tools import (
-    get_accounts, get_chart_of_accounts,
-    get_invoices_api, get_invoices,
-    get_journals_api, get_journals,
-    get_partners_api, get_partners,
-    get_account_moves, get_recent_journal_entries
-)
+from tools.registry import TOOLS
 
+MCP_HTTP_TRANSPORTS = ("off", "streamable-http", "sse")
+MCP_HTTP = os.environ.get("ODOO_MCP_HTTP", "off")
 
-mcp = FastMCP(
-    "Odoo MCP Server",
-)
-info("🎯 Odoo Accounting MCP Server initialized")
 
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    # Log in and fetch the tools' field definitions in the background, on the loop serving the requests.
+    warmup = None
+    if os.environ.get("ODOO_URL") or os.environ.get("ODOO_TENANTS_FILE"):
+        warmup = start_schema_warmup(get_async_odoo_client)
+    try:
+        # Starlette does not run a mounted app's lifespan; the streamable HTTP session manager needs one.
+        if MCP_HTTP == "streamable-http":
+            async with mcp.session_manager.run():
+                yield
+        else:
+            yield
+    finally:
+        if warmup is not None:
+            warmup.cancel()
 
-app = FastAPI(title="Odoo Accounting MCP Server")
+
+app = FastAPI(title="Odoo Accounting MCP Server", lifespan=lifespan)
 
 # CORS (Claude Desktop needs this)
 app.add_middleware(
@@ -34,167 +47,97 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-info("🌐 FastAPI app configured with CORS middleware")
-
-
-@app.get("/mcp/odoo/accounting")
-def get_account_moves_endpoint():
-    return get_account_moves()
-
-
-@app.get("/mcp/odoo/invoices")
-def get_invoices_endpoint(invoice_type: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, limit: int = 20):
-    return get_invoices_api(invoice_type, start_date, end_date, limit)
-
-
-@app.get("/mcp/odoo/accounts")
-def get_accounts_endpoint(account_type: Optional[str] = None, include_zero_balance: bool = False, limit: int = 100):
-    return get_accounts(account_type, include_zero_balance, limit)
-
-
-@app.get("/mcp/odoo/partners")
-def get_partners_endpoint(partner_type: Optional[str] = None, limit: int = 50):
-    return get_partners_api(partner_type, limit)
-
-
-@app.get("/mcp/odoo/journals")
-def get_journals_endpoint(journal_type: Optional[str] = None, limit: int = 20):
-    return get_journals_api(journal_type, limit)
-
+app.middleware("http")(http_metrics_middleware)
+info("🌐 FastAPI app configured with CORS and metrics middleware")
 
-@app.get("/mcp/odoo/analytic_accounts")
-def get_analytic_accounts_endpoint(account_type: Optional[str] = None, limit: int = 50):
-    return get_analytic_accounts_api(account_type, limit)
 
-
-
-@mcp.tool(description="🎯 Get recent journal entries for AI audit")
-def get_recent_journal_entries_wrapper(
-    ctx: Context,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    limit: int = 20
-) -> Dict[str, Any]:
+async def stream_records(model, domain, fields, limit=None, requested_fields=None, tenant=None):
     """
-    Fetches recent journal entries (account.move) for AI analysis.
-    Allows optional filtering by date.
-    """
-    return get_recent_journal_entries(ctx, start_date, end_date, limit)
-
+    Stream search_read results as NDJSON, one record per line.
 
-@mcp.tool(description="📄 Get invoices and bills for AI analysis")
-def get_invoices_wrapper(
-    ctx: Context,
-    invoice_type: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    limit: int = 20
-) -> Dict[str, Any]:
+    Records are paged from Odoo by id and written as they arrive, so memory
+    stays flat however many rows are exported. A limit of 0 or None streams
+    every matching record. ``requested_fields`` is the route's ``fields``
+    profile or list; it is resolved before the response starts so a bad field
+    fails the request instead of the stream.
     """
-    Fetches invoices and bills (account.move) for AI analysis.
-
-    Parameters:
-    - invoice_type: Type of invoice to retrieve. Options:
-      - "customer_invoices" for Customer Invoices (move_type = 'out_invoice')
-      - "vendor_bills" for Vendor Bills (move_type = 'in_invoice')
-      - "credit_notes" for Credit Notes (move_type = 'out_refund' or 'in_refund')
-      - If not specified, returns all types
-    - start_date: Optional start date filter (format: YYYY-MM-DD)
-    - end_date: Optional end date filter (format: YYYY-MM-DD)
-    - limit: Maximum number of records to return (default: 20)
-    """
-    return get_invoices(ctx, invoice_type, start_date, end_date, limit)
+    client = await get_async_odoo_client(tenant)
+    fields = await resolve_fields(client, model, fields, requested_fields)
 
+    async def lines():
+        count = 0
+        async for record in client.iter_search_read(model, domain, fields, limit=limit):
+            count += 1
+            yield json_dumps(record) + b"\n"
+        success("✅ Streamed {} records from {}", count, model)
 
-@mcp.tool(description="📊 Get chart of accounts for AI analysis")
-def get_chart_of_accounts_wrapper(
-    ctx: Context,
-    account_type: Optional[str] = None,
-    include_zero_balance: bool = False,
-    limit: int = 100
-) -> Dict[str, Any]:
-    """
-    Fetches chart of accounts (account.account) for AI analysis.
-
-    Parameters:
-    - account_type: Optional filter for specific account types. Common types include:
-      - "asset_receivable" for Receivable Accounts
-      - "asset_cash" for Bank & Cash Accounts
-      - "asset_current" for Current Assets
-      - "asset_non_current" for Non-current Assets
-      - "liability_payable" for Payable Accounts
-      - "liability_current" for Current Liabilities
-      - "equity" for Equity Accounts
-      - "income" for Income Accounts
-      - "expense" for Expense Accounts
-      - If not specified, returns all account types
-    - include_zero_balance: Parameter kept for API compatibility but not used (balance field not available)
-    - limit: Maximum number of records to return (default: 100)
-    """
-    return get_chart_of_accounts(ctx, account_type, include_zero_balance, limit)
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
-@mcp.tool(description="👥 Get partners for AI analysis")
-def get_partners_wrapper(
-    ctx: Context,
-    partner_type: Optional[str] = None,
-    limit: int = 50
-) -> Dict[str, Any]:
-    """
-    Fetches partners (res.partner) for AI analysis.
-
-    Parameters:
-    - partner_type: Type of partners to retrieve. Options:
-      - "customer" for Customers (customer_rank > 0)
-      - "vendor" for Vendors (supplier_rank > 0)
-      - If not specified, returns all partners
-    - limit: Maximum number of records to return (default: 50)
-    """
-    return get_partners(ctx, partner_type, limit)
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Latency, row, payload and error metrics in the Prometheus text format."""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
 
 
-@mcp.tool(description="📒 Get journals for AI analysis")
-def get_journals_wrapper(
-    ctx: Context,
-    journal_type: Optional[str] = None,
-    limit: int = 20
-) -> Dict[str, Any]:
-    """
-    Fetches journals (account.journal) for AI analysis.
-
-    Parameters:
-    - journal_type: Type of journal to retrieve. Common types include:
-      - "sale" for Sales Journals
-      - "purchase" for Purchase Journals
-      - "cash" for Cash Journals
-      - "bank" for Bank Journals
-      - "general" for Miscellaneous Operations Journals
-      - If not specified, returns all journal types
-    - limit: Maximum number of records to return (default: 20)
+def route_handler(spec):
     """
-    return get_journals(ctx, journal_type, limit)
+    Build the HTTP route for ``spec``: its declared arguments become query
+    parameters (or the JSON body, for lists), plus ``stream`` for tools with a
+    query builder. Results are wrapped as ``{"records": ...}``.
 
-
-@mcp.tool(description="📊 Get analytic accounts for AI analysis")
-def get_analytic_accounts_wrapper(
-    ctx: Context,
-    account_type: Optional[str] = None,
-    limit: int = 50
-) -> Dict[str, Any]:
+    On streaming routes ``limit`` has no default: a stream without one exports
+    every matching record, and the tool's default page size only applies when
+    ``stream`` is off.
+    """
+    limit = spec.signature.parameters.get("limit") if spec.query else None
+
+    async def endpoint(**arguments):
+        try:
+            if arguments.pop("stream", False):
+                model, domain, fields = spec.build_query(arguments)
+                return await stream_records(model, domain, fields, limit=arguments.get("limit"),
+                                            requested_fields=arguments.get("fields"), tenant=arguments.get("tenant"))
+            if limit is not None and arguments["limit"] is None:
+                arguments["limit"] = limit.default
+            result = await spec.load()(**arguments)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Encoded like Odoo responses (orjson when installed), skipping FastAPI's jsonable_encoder pass.
+        return Response(json_dumps({"records": result}), media_type="application/json")
+
+    parameters = [
+        parameter.replace(default=None, annotation=Optional[parameter.annotation]) if parameter is limit else parameter
+        for parameter in spec.signature.parameters.values()
+    ]
+    if spec.query:
+        parameters.append(inspect.Parameter("stream", inspect.Parameter.KEYWORD_ONLY, default=False, annotation=bool))
+    endpoint.__name__ = f"{spec.name}_endpoint"
+    endpoint.__doc__ = spec.doc
+    endpoint.__signature__ = spec.signature.replace(parameters=parameters)
+    return endpoint
+
+
+for spec in TOOLS:
+    app.add_api_route(spec.path, route_handler(spec), methods=[spec.method], summary=spec.description)
+
+
+def mount_mcp(app, transport):
     """
-    Fetches analytic accounts (account.analytic.account) for AI analysis.
-
-    Parameters:
-    - account_type: Type of analytic account to retrieve. This can be used to filter by:
-      - Project names
-      - Cost centers
-      - Department names
-      - Any other grouping used in your Odoo instance
-      - If not specified, returns all analytic accounts
-    - limit: Maximum number of records to return (default: 50)
+    Serve the MCP tools over HTTP from this app as well, so one process and
+    one set of warm Odoo sessions answer both: ``streamable-http`` at
+    ``/mcp``, ``sse`` at ``/sse`` (messages posted to ``/messages/``).
     """
-    return get_analytic_accounts(ctx, account_type, limit)
+    if transport not in MCP_HTTP_TRANSPORTS:
+        raise ValueError(f"Invalid ODOO_MCP_HTTP '{transport}', expected one of: {', '.join(MCP_HTTP_TRANSPORTS)}")
+    if transport == "off":
+        return
+    # Mounted last and at the root, so the routes above take precedence.
+    app.mount("/", mcp.streamable_http_app() if transport == "streamable-http" else mcp.sse_app())
+    info("🔗 MCP {} transport mounted on the HTTP server", transport)
+
 
+mount_mcp(app, MCP_HTTP)
 
 def main():
     divider()
@@ -0,0 +1,352 @@
+import asyncio
+import calendar
+import collections
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+import urllib.parse
+from planner import DEFAULT_ORDERS, parse_order
+from logger import info, success, warning, error, debug
+
+DEFAULT_SNAPSHOT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "odoo-mcp-server", "snapshots")
+
+# Loaded snapshot files kept in memory; the least recently used are evicted first.
+DEFAULT_MEMORY_ENTRIES = 48
+
+# Fields Odoo refuses to change on a posted entry dated on or before the lock
+# date. Others (payment_state, amount_residual, reconciliation) still move when
+# a later payment is matched, so they are always read live.
+FROZEN_FIELDS = {
+    "account.move": {
+        "id", "name", "date", "ref", "move_type", "state", "journal_id", "company_id", "currency_id",
+        "partner_id", "commercial_partner_id", "invoice_date", "invoice_date_due", "invoice_origin",
+        "amount_untaxed", "amount_tax", "amount_total", "amount_untaxed_signed", "amount_tax_signed",
+        "amount_total_signed",
+    },
+    "account.move.line": {
+        "id", "move_id", "move_name", "name", "ref", "date", "parent_state", "journal_id", "company_id",
+        "account_id", "partner_id", "currency_id", "debit", "credit", "balance", "amount_currency",
+        "tax_line_id", "analytic_distribution",
+    },
+}
+
+# Only posted entries are protected by the lock date; a query must filter on this leaf.
+POSTED_LEAVES = {
+    "account.move": ["state", "=", "posted"],
+    "account.move.line": ["parent_state", "=", "posted"],
+}
+
+SEARCH_READ = "search_read"
+LOCKS = "locks"
+DATE_FORMAT = "%Y-%m-%d"
+
+
+def _safe(value):
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", str(value))
+
+
+def month_start(date):
+    return date[:8] + "01"
+
+
+def month_end(date):
+    year, month = int(date[:4]), int(date[5:7])
+    return f"{date[:8]}{calendar.monthrange(year, month)[1]:02d}"
+
+
+def closed_until(lock_date):
+    """Last day of the last month that is entirely on or before ``lock_date``, or None."""
+    if not lock_date:
+        return None
+    if lock_date == month_end(lock_date):
+        return lock_date
+    first = datetime.datetime.strptime(month_start(lock_date), DATE_FORMAT).date()
+    return (first - datetime.timedelta(days=1)).strftime(DATE_FORMAT)
+
+
+def months_between(first, last):
+    """``YYYY-MM`` labels of every month from the one of ``first`` to the one of ``last``."""
+    year, month = int(first[:4]), int(first[5:7])
+    months = []
+    while f"{year:04d}-{month:02d}" <= last[:7]:
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+class SnapshotStore:
+    """
+    Query results and aggregates of locked periods, kept on disk with no expiry.
+
+    Entries live in ``<snapshot_dir>/<host>-<db>/<kind>/<signature>/<name>.json``
+    where ``name`` is the month (``YYYY-MM``) or the date the entry covers up
+    to. Everything dated on or before a company's lock date is final in Odoo,
+    so an entry stays valid until the lock date is moved back: observe()
+    notices that and drops the entries after the new date.
+    """
+
+    def __init__(self, url, db, snapshot_dir=DEFAULT_SNAPSHOT_DIR, memory_entries=DEFAULT_MEMORY_ENTRIES):
+        self.url = url
+        self.db = db
+        self.snapshot_dir = snapshot_dir
+        self.memory_entries = memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = collections.OrderedDict()
+        self._locks = None
+        self._lock = threading.Lock()
+
+    @property
+    def root(self):
+        host = urllib.parse.urlsplit(self.url).netloc or self.url
+        return os.path.join(self.snapshot_dir, f"{_safe(host)}-{_safe(self.db)}")
+
+    @staticmethod
+    def signature(*parts):
+        """Stable short hash of the JSON-serializable ``parts`` identifying a query."""
+        text = json.dumps(parts, sort_keys=True, default=str)
+        return hashlib.sha1(text.encode()).hexdigest()[:20]
+
+    def _path(self, kind, signature, name):
+        return os.path.join(self.root, kind, signature, f"{_safe(name)}.json")
+
+    def load(self, kind, signature, name):
+        """Return the stored value, or None."""
+        path = self._path(kind, signature, name)
+        with self._lock:
+            if path in self._memory:
+                self._memory.move_to_end(path)
+                self.hits += 1
+                return self._memory[path]
+        try:
+            with open(path) as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError) as e:
+            warning("⚠️ Ignoring unreadable snapshot {}: {}", path, e)
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._remember(path, value)
+        return value
+
+    def save(self, kind, signature, name, value):
+        path = self._path(kind, signature, name)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write then rename, so a crash never leaves a half-written snapshot
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(value, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            warning("⚠️ Could not write snapshot {}: {}", path, e)
+        self._remember(path, value)
+
+    def _remember(self, path, value):
+        with self._lock:
+            self._memory[path] = value
+            self._memory.move_to_end(path)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def latest(self, kind, signature, until):
+        """Return ``(name, value)`` of the entry with the greatest name not after ``until``, or None."""
+        try:
+            names = sorted(entry[:-5] for entry in os.listdir(os.path.join(self.root, kind, signature))
+                           if entry.endswith(".json"))
+        except OSError:
+            return None
+        for name in reversed(names):
+            if name <= until:
+                value = self.load(kind, signature, name)
+                if value is not None:
+                    return name, value
+        return None
+
+    def forget_after(self, date):
+        """Drop every entry whose name sorts after ``date`` (months and dates alike)."""
+        removed = 0
+        with self._lock:
+            for path in [path for path in self._memory if os.path.basename(path)[:-5] > date]:
+                del self._memory[path]
+        for directory, _, files in os.walk(self.root):
+            for entry in files:
+                if entry.endswith(".json") and entry[:-5] > date and os.path.basename(directory) != LOCKS:
+                    try:
+                        os.remove(os.path.join(directory, entry))
+                        removed += 1
+                    except OSError as e:
+                        warning("⚠️ Could not remove snapshot {}: {}", entry, e)
+        return removed
+
+    def observe(self, lock_dates):
+        """
+        Record the closed date of every company in ``lock_dates`` (company id
+        -> lock date) and drop the entries a lock date moved back has reopened.
+        """
+        closed = {str(company): closed_until(lock_date) for company, lock_date in lock_dates.items()}
+        if self._locks is None:
+            self._locks = self.load(LOCKS, LOCKS, LOCKS) or {}
+        reopened = [closed[company] or "" for company, date in self._locks.items()
+                    if company in closed and date and (closed[company] or "") < date]
+        if reopened:
+            after = min(reopened)
+            removed = self.forget_after(after)
+            warning("⚠️ Lock date moved back to {}: dropped {} snapshots after it", after or "none", removed)
+        if any(self._locks.get(company) != date for company, date in closed.items()):
+            self._locks = {**self._locks, **closed}
+            self.save(LOCKS, LOCKS, LOCKS, self._locks)
+
+    def stats(self):
+        return {"path": self.root, "hits": self.hits, "misses": self.misses, "in_memory": len(self._memory)}
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_snapshot_store(url, db):
+    """
+    Return the snapshot store shared by every client of the Odoo database at
+    ``url``, or None when ODOO_SNAPSHOT_DIR is set to an empty string.
+    """
+    snapshot_dir = os.environ.get("ODOO_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR)
+    if not snapshot_dir:
+        return None
+    key = (url, db)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = SnapshotStore(url, db, os.path.expanduser(snapshot_dir))
+    return store
+
+
+def split_dates(domain, field="date"):
+    """Return (start, end, rest): the bounds of top-level ``>=``/``<=`` leaves on ``field`` and the other leaves."""
+    start = end = None
+    rest = []
+    for leaf in domain:
+        if isinstance(leaf, (list, tuple)) and len(leaf) == 3 and leaf[0] == field and leaf[1] in (">=", "<="):
+            if leaf[1] == ">=":
+                start = leaf[2] if start is None else max(start, leaf[2])
+            else:
+                end = leaf[2] if end is None else min(end, leaf[2])
+        else:
+            rest.append(leaf)
+    return start, end, rest
+
+
+def frozen_until(lock_dates, domain):
+    """
+    Last date whose entries are final for every company ``domain`` can match,
+    or None when one of them has no lock date.
+    """
+    companies = list(lock_dates)
+    for leaf in domain:
+        if isinstance(leaf, (list, tuple)) and len(leaf) == 3 and leaf[0] == "company_id" and leaf[1] == "=":
+            companies = [leaf[2]]
+    dates = [closed_until(lock_dates.get(company)) for company in companies]
+    if not dates or not all(dates):
+        return None
+    return min(dates)
+
+
+async def snapshot_search_read(client, store, model, domain, fields, limit, order, live):
+    """
+    Run a search_read of posted entries as a frozen part, read month by month
+    from ``store``, and a live part after the lock date, fetched with
+    ``live(model, domain, fields, limit, order)``; the rows, order and limit
+    are those of the single query.
+
+    Frozen months missing from the store are fetched whole once and kept.
+    Fields that can still change on locked entries are re-read live by id.
+    Returns None when the query cannot be split this way.
+    """
+    order = order or DEFAULT_ORDERS.get(model)
+    spec = parse_order(order)
+    if (store is None or model not in FROZEN_FIELDS or fields is None or not spec or spec[0][0] != "date"
+            or POSTED_LEAVES[model] not in domain
+            or not all(isinstance(leaf, (list, tuple)) for leaf in domain)):
+        return None
+
+    start, end, rest = split_dates(domain)
+    lock_dates = await client.lock_dates()
+    store.observe(lock_dates)
+    until = frozen_until(lock_dates, rest)
+    if until is None or (start and start > until):
+        return None
+
+    descending = spec[0][1]
+    stored = sorted({field for field in fields if field in FROZEN_FIELDS[model]} | {"date"})
+    overlay = [field for field in fields if field not in FROZEN_FIELDS[model]]
+    signature = store.signature(client.uid, model, rest, stored, order)
+
+    async def live_rows(remaining):
+        if end and end <= until:
+            return []
+        live_domain = rest + [["date", ">", until]] + ([["date", "<=", end]] if end else [])
+        return await live(model, live_domain, fields, remaining, order)
+
+    async def month_rows(month):
+        rows = store.load(SEARCH_READ, signature, month)
+        if rows is None:
+            first = month + "-01"
+            rows = await client.search_read(model, rest + [["date", ">=", first], ["date", "<=", month_end(first)]],
+                                            stored, limit=None, order=order)
+            store.save(SEARCH_READ, signature, month, rows)
+        return rows
+
+    async def frozen_rows(remaining):
+        first = start
+        if first is None:
+            oldest = await client.search_read(model, rest, ["date"], limit=1, order="date asc")
+            if not oldest:
+                return []
+            first = oldest[0]["date"]
+        last = min(end, until) if end else until
+        months = months_between(first, last) if first <= last else []
+        if descending:
+            months.reverse()
+        rows = []
+        parallelism = client.shard_policy.parallelism
+        for wave_start in range(0, len(months), parallelism):
+            wave = months[wave_start:wave_start + parallelism]
+            for page in await asyncio.gather(*(month_rows(month) for month in wave)):
+                rows.extend(row for row in page if first <= row["date"] <= last)
+            if remaining and len(rows) >= remaining:
+                break
+        return rows
+
+    # The live part is newer than every frozen row: first when descending, last when ascending.
+    if descending:
+        rows = await live_rows(limit)
+        if not limit or len(rows) < limit:
+            rows += await frozen_rows(limit - len(rows) if limit else None)
+    else:
+        rows = await frozen_rows(limit)
+        if not limit or len(rows) < limit:
+            rows += await live_rows(limit - len(rows) if limit else None)
+    if limit:
+        rows = rows[:limit]
+
+    frozen = [row for row in rows if row["date"] <= until]
+    if overlay and frozen:
+        current = {row["id"]: row for row in await client.read(model, [row["id"] for row in frozen], overlay)}
+    else:
+        current = {}
+    wanted = set(fields) | {"id"}
+    result = []
+    for row in rows:
+        if row["date"] <= until:
+            row = {field: value for field, value in row.items() if field in wanted}
+            row.update({field: value for field, value in current.get(row["id"], {}).items() if field in wanted})
+        result.append(row)
+    success("✅ Served {} records of {} from snapshots up to {} and {} live", len(frozen), model,
+            until, len(result) - len(frozen))
+    return result
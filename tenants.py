@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+from logger import info, success, warning, error, debug
+
+# Name of the tenant built from ODOO_URL, ODOO_DB, ODOO_USERNAME and ODOO_PASSWORD.
+ENV_TENANT = "default"
+
+
+class Tenant:
+    """
+    Connection settings of one Odoo database.
+
+    ``max_concurrency`` caps the Odoo calls in flight for this tenant: each
+    tenant gets its own client, session pool and cache, so a tenant that
+    floods the server queues on its own slots and leaves the others alone.
+    """
+
+    def __init__(self, name, url, db, username, password, max_concurrency=None, transport=None):
+        self.name = name
+        self.url = url
+        self.db = db
+        self.username = username
+        self.password = password
+        self.max_concurrency = max_concurrency
+        self.transport = transport
+
+    @classmethod
+    def from_config(cls, name, config):
+        missing = [key for key in ("url", "db", "username") if not config.get(key)]
+        if missing:
+            raise ValueError(f"Tenant '{name}' is missing: {', '.join(missing)}")
+        # Keep secrets out of the file by naming the environment variable that holds them.
+        password = config.get("password")
+        if password is None and config.get("password_env"):
+            password = os.environ.get(config["password_env"])
+        if password is None:
+            raise ValueError(f"Tenant '{name}' has no password or password_env")
+        return cls(
+            name,
+            config["url"],
+            config["db"],
+            config["username"],
+            password,
+            max_concurrency=config.get("max_concurrency"),
+            transport=config.get("transport"),
+        )
+
+    @classmethod
+    def from_env(cls):
+        if not os.environ.get("ODOO_URL"):
+            return None
+        return cls(
+            ENV_TENANT,
+            os.environ["ODOO_URL"],
+            os.environ["ODOO_DB"],
+            os.environ["ODOO_USERNAME"],
+            os.environ["ODOO_PASSWORD"],
+        )
+
+
+class TenantRegistry:
+    """
+    The Odoo databases this server can reach, by tenant name.
+
+    Tenants come from the JSON file named by ODOO_TENANTS_FILE::
+
+        {
+          "default": "acme",
+          "tenants": {
+            "acme": {"url": "https://acme.odoo.com", "db": "acme", "username": "bot",
+                     "password_env": "ACME_ODOO_PASSWORD", "max_concurrency": 8},
+            "globex": {"url": "https://erp.globex.test", "db": "globex", "username": "bot",
+                       "password_env": "GLOBEX_ODOO_PASSWORD", "transport": "jsonrpc"}
+          }
+        }
+
+    plus the ``default`` tenant from ODOO_URL & co when those are set. Tools
+    called without a ``tenant`` use ODOO_DEFAULT_TENANT, else the file's
+    ``default``, else the environment tenant.
+    """
+
+    def __init__(self, tenants=None, default=None):
+        self.tenants = dict(tenants or {})
+        self.default = default
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path) as f:
+            config = json.load(f)
+        tenants = {name: Tenant.from_config(name, settings) for name, settings in config.get("tenants", {}).items()}
+        info("🏢 Loaded {} tenants from {}", len(tenants), path)
+        return cls(tenants, config.get("default"))
+
+    @classmethod
+    def from_env(cls):
+        path = os.environ.get("ODOO_TENANTS_FILE")
+        registry = cls.from_file(path) if path else cls()
+        if os.environ.get("ODOO_DEFAULT_TENANT"):
+            registry.default = os.environ["ODOO_DEFAULT_TENANT"]
+        return registry
+
+    def names(self):
+        names = list(self.tenants)
+        if ENV_TENANT not in names and os.environ.get("ODOO_URL"):
+            names.append(ENV_TENANT)
+        return names
+
+    def resolve(self, name=None):
+        """Return the Tenant called ``name``, or the default tenant when ``name`` is empty."""
+        name = name or self.default or ENV_TENANT
+        tenant = self.tenants.get(name)
+        if tenant is None and name == ENV_TENANT:
+            # Read on every call, so changed credentials are picked up like before tenants existed.
+            tenant = Tenant.from_env()
+        if tenant is None:
+            if not self.names():
+                raise ValueError("No Odoo tenant configured: set ODOO_URL, ODOO_DB, ODOO_USERNAME and "
+                                 "ODOO_PASSWORD, or ODOO_TENANTS_FILE")
+            raise ValueError(f"Unknown tenant '{name}', expected one of: {', '.join(self.names())}")
+        return tenant
+
+    def is_default(self, name):
+        return not name or name == (self.default or ENV_TENANT)
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_tenant_registry():
+    """Return the tenant registry, reading ODOO_TENANTS_FILE on first use."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = TenantRegistry.from_env()
+    return _registry
+
+
+def resolve_tenant(name=None):
+    return get_tenant_registry().resolve(name)
+
+
+def is_default_tenant(name):
+    return get_tenant_registry().is_default(name)
@@ -0,0 +1,40 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Keep fields_get schemas and locked-period snapshots out of the user's cache directory.
+os.environ["ODOO_SCHEMA_CACHE_DIR"] = ""
+os.environ["ODOO_SNAPSHOT_DIR"] = ""
+os.environ.setdefault("ODOO_LOG_LEVEL", "ERROR")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_odoo import DB, PASSWORD, USERNAME, make_datasets, start_mock_odoo  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def mock_odoo():
+    """A mock Odoo serving 1200 journal entries (2020-2024, locked up to 2023-12-31) and their journal items."""
+    server = start_mock_odoo(make_datasets(moves=1200, partners=100, accounts=40))
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture
+def run_client(mock_odoo):
+    """Run ``test(client)`` on a new event loop with a logged-in AsyncOdooClient of the mock."""
+    from odoo_client import AsyncOdooClient
+
+    def run(test):
+        async def main():
+            client = AsyncOdooClient(url=mock_odoo.url, db=DB, username=USERNAME, password=PASSWORD)
+            try:
+                await client.connect()
+                return await test(client)
+            finally:
+                await client.aclose()
+
+        return asyncio.run(main())
+
+    return run
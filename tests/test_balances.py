@@ -0,0 +1,100 @@
+import collections
+
+import pytest
+
+import balances
+from benchmarks.mock_odoo import DB
+from snapshot import SnapshotStore
+from tools.balances.balances import account_balances
+
+RANGES = [
+    (None, None),
+    ("2021-03-15", "2023-06-30"),  # locked months, cut mid-month at the start
+    ("2023-12-01", "2024-03-31"),  # across the lock date
+    ("2022-01-01", None),
+    (None, "2023-12-31"),  # up to the lock date
+]
+
+
+def _expected(lines, start, end):
+    """Brute-force opening balance, debit, credit and closing balance per account id."""
+    totals = collections.defaultdict(lambda: [0.0, 0.0, 0.0])
+    for line in lines:
+        if line["parent_state"] != "posted" or (end and line["date"] > end):
+            continue
+        account = totals[line["account_id"][0]]
+        if start and line["date"] < start:
+            account[0] += line["debit"] - line["credit"]
+        else:
+            account[1] += line["debit"]
+            account[2] += line["credit"]
+    return {account: (opening, debit, credit, opening + debit - credit)
+            for account, (opening, debit, credit) in totals.items()}
+
+
+def _check(run_client, lines, store=None):
+    async def test(client):
+        client.snapshots = store
+        for start, end in RANGES:
+            rows = await account_balances(client, start, end)
+            expected = _expected(lines, start, end)
+            assert {row["account_id"][0] for row in rows} == set(expected), (start, end)
+            for row in rows:
+                values = (row["opening_balance"], row["debit"], row["credit"], row["closing_balance"])
+                assert values == pytest.approx(expected[row["account_id"][0]], abs=0.01), (start, end, row)
+
+    run_client(test)
+
+
+def test_balances_match_brute_force(run_client, mock_odoo, tmp_path):
+    lines = mock_odoo.odoo.datasets["account.move.line"]
+    balances._closed.clear()
+    store = SnapshotStore("http://mock", DB, str(tmp_path))
+    _check(run_client, lines, store)
+    # Locked months now come from the process cache...
+    assert balances._closed
+    _check(run_client, lines, store)
+    # ...and, after a restart, from the snapshot store.
+    balances._closed.clear()
+    _check(run_client, lines, SnapshotStore("http://mock", DB, str(tmp_path)))
+
+
+def test_include_zero_balance(run_client, mock_odoo):
+    accounts = mock_odoo.odoo.datasets["account.account"]
+    lines = mock_odoo.odoo.datasets["account.move.line"]
+    used = {line["account_id"][0] for line in lines if line["parent_state"] == "posted"}
+    unused = dict(accounts[-1], id=len(accounts) + 1, code="999999", name="Unused", display_name="999999 Unused")
+
+    async def test(client):
+        client.snapshots = None
+        rows = await account_balances(client, include_zero_balance=True)
+        assert {row["account_id"][0] for row in rows} == {account["id"] for account in accounts}
+        assert unused["id"] not in used
+        rows = await account_balances(client)
+        assert {row["account_id"][0] for row in rows} == used
+
+    accounts.append(unused)
+    try:
+        run_client(test)
+    finally:
+        accounts.remove(unused)
+
+
+def test_chart_of_accounts_balances(run_client, mock_odoo, monkeypatch):
+    from benchmarks.mock_odoo import PASSWORD, USERNAME
+    from tools.accounts.accounts import get_chart_of_accounts
+
+    for name, value in (("ODOO_URL", mock_odoo.url), ("ODOO_DB", DB), ("ODOO_USERNAME", USERNAME),
+                        ("ODOO_PASSWORD", PASSWORD), ("ODOO_TENANTS_FILE", "")):
+        monkeypatch.setenv(name, value)
+    accounts = mock_odoo.odoo.datasets["account.account"]
+    expected = {account: values[3] for account, values in
+                _expected(mock_odoo.odoo.datasets["account.move.line"], None, None).items() if round(values[3], 2)}
+
+    async def test(client):
+        every = await get_chart_of_accounts(limit=None)
+        assert len(every) == len(accounts)
+        nonzero = await get_chart_of_accounts(include_zero_balance=False, limit=None)
+        assert {record["id"]: record["balance"] for record in nonzero} == pytest.approx(expected, abs=0.01)
+
+    run_client(test)
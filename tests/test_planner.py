@@ -0,0 +1,48 @@
+import pytest
+
+from planner import ShardPolicy, sharded_search_read
+
+FIELDS = ["name", "date", "amount_total"]
+RANGES = [
+    ("2020-01-01", "2024-12-31"),
+    ("2021-03-15", "2021-09-10"),
+    ("2023-11-20", "2024-02-10"),
+    ("2022-02-01", "2022-02-28"),
+]
+LIMITS = [None, 1, 37, 300]
+ORDERS = ["date desc, name desc, id desc", "date asc, id asc", "amount_total desc, id asc"]
+
+
+def _domain(start, end):
+    return [["state", "=", "posted"], ["date", ">=", start], ["date", "<=", end]]
+
+
+@pytest.mark.parametrize("order", ORDERS)
+def test_planned_search_read_matches_single_query(run_client, order):
+    async def test(client):
+        client.snapshots = None
+        client.shard_policy = ShardPolicy(mode="date", min_limit=1, shard_days=20, max_shards=12, parallelism=3)
+        sharded = 0
+        for start, end in RANGES:
+            domain = _domain(start, end)
+            for limit in LIMITS:
+                expected = await client.search_read("account.move", domain, FIELDS, limit=limit, order=order)
+                rows = await client.planned_search_read("account.move", domain, FIELDS, limit=limit, order=order)
+                assert rows == expected, (start, end, limit)
+                if await sharded_search_read(client, client.shard_policy, "account.move", domain, FIELDS,
+                                             limit, order) is not None:
+                    sharded += 1
+        # Every range spans more than one shard, so each read really went through the fan-out.
+        assert sharded == len(RANGES) * len(LIMITS)
+
+    run_client(test)
+
+
+def test_text_order_is_not_merged(run_client):
+    async def test(client):
+        client.shard_policy = ShardPolicy(mode="date", min_limit=1, shard_days=20)
+        rows = await sharded_search_read(client, client.shard_policy, "account.move",
+                                         _domain("2021-01-01", "2021-12-31"), FIELDS, None, "name asc, id asc")
+        assert rows is None
+
+    run_client(test)
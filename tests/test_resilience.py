@@ -0,0 +1,63 @@
+import asyncio
+import socket
+import threading
+import time
+
+import httpx
+import pytest
+
+from resilience import CircuitBreaker, DeadlineHTTPConnection, RetryPolicy, acall_with_retries, call_with_retries
+
+POLICY = RetryPolicy(connect_timeout=5.0, read_timeout=5.0, retries=0, deadline=0.5)
+
+
+@pytest.fixture
+def silent_server():
+    """A TCP server that accepts connections and never answers."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    accepted = []
+
+    def serve():
+        while True:
+            try:
+                accepted.append(listener.accept()[0])
+            except OSError:
+                return
+
+    threading.Thread(target=serve, daemon=True).start()
+    yield listener.getsockname()
+    listener.close()
+    for connection in accepted:
+        connection.close()
+
+
+def test_sync_attempt_stops_at_the_deadline(silent_server):
+    host, port = silent_server
+    connection = DeadlineHTTPConnection(f"{host}:{port}", POLICY.connect_timeout, POLICY.read_timeout)
+
+    def call():
+        connection.request("POST", "/jsonrpc", b"{}")
+        return connection.getresponse()
+
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        call_with_retries(POLICY, CircuitBreaker("sync", threshold=0), "res.partner", "read", call)
+    assert time.monotonic() - started < POLICY.read_timeout / 2
+
+
+def test_async_attempt_stops_at_the_deadline(silent_server):
+    host, port = silent_server
+
+    async def main():
+        async with httpx.AsyncClient(base_url=f"http://{host}:{port}", timeout=POLICY.read_timeout) as http:
+            async def call():
+                return await http.post("/jsonrpc", content=b"{}", timeout=POLICY.httpx_timeout())
+
+            await acall_with_retries(POLICY, CircuitBreaker("async", threshold=0), "res.partner", "read", call)
+
+    started = time.monotonic()
+    with pytest.raises(httpx.ReadTimeout):
+        asyncio.run(main())
+    assert time.monotonic() - started < POLICY.read_timeout / 2
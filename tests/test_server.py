@@ -0,0 +1,27 @@
+import pytest
+
+from benchmarks.mock_odoo import DB, PASSWORD, USERNAME
+
+
+@pytest.fixture
+def http(mock_odoo, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    for name, value in (("ODOO_URL", mock_odoo.url), ("ODOO_DB", DB), ("ODOO_USERNAME", USERNAME),
+                        ("ODOO_PASSWORD", PASSWORD), ("ODOO_TENANTS_FILE", "")):
+        monkeypatch.setenv(name, value)
+    import server
+
+    with TestClient(server.app) as client:
+        yield client
+
+
+def test_stream_exports_every_record_by_default(http, mock_odoo):
+    posted = sum(move["state"] == "posted" for move in mock_odoo.odoo.datasets["account.move"])
+    assert len(http.get("/mcp/odoo/accounting", params={"stream": "true"}).text.splitlines()) == posted
+    assert len(http.get("/mcp/odoo/accounting", params={"stream": "true", "limit": 5}).text.splitlines()) == 5
+
+
+def test_default_limit_without_stream(http):
+    assert len(http.get("/mcp/odoo/accounting").json()["records"]) == 20
+    assert len(http.get("/mcp/odoo/accounting", params={"limit": 7}).json()["records"]) == 7
@@ -0,0 +1,74 @@
+import os
+
+from benchmarks.mock_odoo import DB
+from snapshot import SnapshotStore
+
+ORDERS = ["date desc, name desc, id desc", "date asc, id asc"]
+FIELD_SETS = [["name", "date", "amount_total", "partner_id"], ["name", "date", "payment_state", "amount_residual"]]
+RANGES = [
+    ("2020-01-01", "2024-12-31"),  # locked and open months
+    ("2021-03-15", "2021-09-10"),  # locked only, cut mid-month on both sides
+    ("2023-11-20", "2024-02-10"),  # across the lock date
+    ("2022-06-01", None),
+]
+LIMITS = [None, 1, 40]
+
+
+def _domain(start, end):
+    domain = [["state", "=", "posted"], ["date", ">=", start]]
+    return domain + [["date", "<=", end]] if end else domain
+
+
+def _compare(run_client, store):
+    """Check every snapshot read against a plain search_read; return the number of search_read RPCs made."""
+    async def test(client):
+        client.snapshots = store
+        calls = []
+        execute_kw = client.execute_kw
+
+        async def counting(model, method, args, kwargs=None):
+            calls.append(method)
+            return await execute_kw(model, method, args, kwargs)
+
+        for order in ORDERS:
+            for fields in FIELD_SETS:
+                for start, end in RANGES:
+                    for limit in LIMITS:
+                        domain = _domain(start, end)
+                        expected = await client.search_read("account.move", domain, fields, limit=limit, order=order)
+                        client.execute_kw = counting
+                        rows = await client.planned_search_read("account.move", domain, fields, limit=limit, order=order)
+                        client.execute_kw = execute_kw
+                        assert rows == expected, (order, fields, start, end, limit)
+        return calls.count("search_read")
+
+    return run_client(test)
+
+
+def test_snapshot_reads_match_live_reads(run_client, tmp_path):
+    cold = _compare(run_client, SnapshotStore("http://mock", DB, str(tmp_path)))
+    assert any(files for _, _, files in os.walk(tmp_path))
+    # A new store on the same directory (as after a restart) reads the locked months from disk.
+    warm = _compare(run_client, SnapshotStore("http://mock", DB, str(tmp_path)))
+    assert warm < cold
+
+
+def test_mutable_fields_are_read_live(run_client, mock_odoo, tmp_path):
+    move = next(move for move in mock_odoo.odoo.datasets["account.move"] if move["date"].startswith("2021-05"))
+    domain = _domain("2021-05-01", "2021-05-31")
+    fields = ["name", "date", "payment_state"]
+    order = "date desc, name desc, id desc"
+
+    async def read(client):
+        client.snapshots = SnapshotStore("http://mock", DB, str(tmp_path))
+        rows = await client.planned_search_read("account.move", domain, fields, limit=None, order=order)
+        return {row["id"]: row["payment_state"] for row in rows}
+
+    assert run_client(read)[move["id"]] == move["payment_state"]
+    original = move["payment_state"]
+    move["payment_state"] = "in_payment"
+    try:
+        # The month now comes from the snapshot; payment_state is not frozen and must be current.
+        assert run_client(read)[move["id"]] == "in_payment"
+    finally:
+        move["payment_state"] = original
@@ -0,0 +1,18 @@
+import importlib
+
+import pytest
+
+import tools
+
+
+@pytest.mark.parametrize("module", list(tools._EXPORTS))
+def test_tool_module_exports(module):
+    imported = importlib.import_module(module)
+    for name in tools._EXPORTS[module]:
+        assert hasattr(imported, name), f"{module} has no {name}"
+
+
+def test_load_all():
+    tools.load_all()
+    for name in tools.__all__:
+        assert callable(getattr(tools, name))
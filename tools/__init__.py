@@ -1,6 +1,36 @@
-from tools.accounts.accounts import get_accounts, get_chart_of_accounts
-from tools.invoices.invoices import get_invoices_api, get_invoices
-from tools.journals.journals import get_journals_api, get_journals
-from tools.partners.partners import get_partners_api, get_partners
-from tools.moves.moves import get_account_moves, get_recent_journal_entries
-from tools.analytic_accounts.analytic_accounts import get_analytic_accounts_api, get_analytic_accounts
+import importlib
+
+# Public names per tool module. Modules are imported on first access, so the
+# stdio server only loads a tool (and the Odoo client behind it) when it is called.
+_EXPORTS = {
+    "tools.accounts.accounts": ("get_chart_of_accounts", "accounts_query"),
+    "tools.invoices.invoices": ("get_invoices", "invoices_query"),
+    "tools.journals.journals": ("get_journals", "journals_query"),
+    "tools.partners.partners": ("get_partners", "partners_query", "search_partners"),
+    "tools.moves.moves": ("get_recent_journal_entries", "journal_entries_query"),
+    "tools.analytic_accounts.analytic_accounts": ("get_analytic_accounts", "analytic_accounts_query"),
+    "tools.aggregates.aggregates": ("get_invoice_totals", "get_move_totals", "get_account_balances"),
+    "tools.balances.balances": ("get_trial_balance",),
+    "tools.audit.audit": ("audit_journal_entries",),
+    "tools.reconcile.reconcile": ("suggest_reconciliations",),
+    "tools.batch.batch": ("batch_query",),
+    "tools.tenants.tenants": ("list_tenants",),
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module 'tools' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def load_all():
+    """Import every tool module, e.g. in the background once the server is up."""
+    for module in _EXPORTS:
+        importlib.import_module(module)
@@ -0,0 +1,115 @@
+from typing import Optional, Dict, Any, List
+from odoo_client import get_async_odoo_client
+from projection import shape
+from logger import info, success, warning, error, debug
+from tools.invoices.invoices import invoices_query
+from tools.moves.moves import journal_entries_query
+
+DATE_GRANULARITIES = ("day", "week", "month", "quarter", "year")
+
+INVOICE_TOTAL_FIELDS = ["amount_untaxed_signed:sum", "amount_total_signed:sum"]
+MOVE_TOTAL_FIELDS = ["amount_total_signed:sum"]
+BALANCE_FIELDS = ["debit:sum", "credit:sum", "balance:sum"]
+
+
+def _groupby(groupby: Optional[str], date_field: str, granularity: Optional[str]) -> List[str]:
+    """
+    Turns a comma-separated groupby string and a date granularity into a read_group groupby list.
+    """
+    fields = [field.strip() for field in (groupby or "").split(",") if field.strip()]
+    if granularity:
+        if granularity not in DATE_GRANULARITIES:
+            raise ValueError(f"Invalid granularity '{granularity}', expected one of: {', '.join(DATE_GRANULARITIES)}")
+        fields.append(f"{date_field}:{granularity}")
+    if not fields:
+        raise ValueError("At least one groupby field or a date granularity is required")
+    return fields
+
+
+def _clean_groups(groups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Drops read_group internals (__domain, __context, ...) and exposes the record count as "count".
+    """
+    cleaned = []
+    for group in groups:
+        row = {key: value for key, value in group.items() if not key.startswith("__")}
+        row["count"] = group.get("__count", 0)
+        cleaned.append(row)
+    return cleaned
+
+
+def invoice_totals_query(invoice_type: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                         groupby: Optional[str] = "partner_id", granularity: Optional[str] = "month"):
+    """
+    Builds the (model, domain, fields, groupby) aggregation for posted invoices and bills.
+    """
+    model, domain, _ = invoices_query(invoice_type, start_date, end_date)
+    return model, domain, INVOICE_TOTAL_FIELDS, _groupby(groupby, "date", granularity)
+
+
+def move_totals_query(start_date: Optional[str] = None, end_date: Optional[str] = None,
+                      groupby: Optional[str] = "journal_id", granularity: Optional[str] = "month"):
+    """
+    Builds the (model, domain, fields, groupby) aggregation for posted journal entries.
+    """
+    model, domain, _ = journal_entries_query(start_date, end_date)
+    return model, domain, MOVE_TOTAL_FIELDS, _groupby(groupby, "date", granularity)
+
+
+def account_balances_query(start_date: Optional[str] = None, end_date: Optional[str] = None, account_type: Optional[str] = None,
+                           groupby: Optional[str] = "account_id", granularity: Optional[str] = None):
+    """
+    Builds the (model, domain, fields, groupby) aggregation of posted journal items (account.move.line).
+    """
+    domain = [["parent_state", "=", "posted"]]
+    if account_type:
+        domain.append(["account_id.account_type", "=", account_type])
+        info("🔍 Filtering for account type: {}", account_type)
+    if start_date:
+        domain.append(["date", ">=", start_date])
+    if end_date:
+        domain.append(["date", "<=", end_date])
+
+    return "account.move.line", domain, BALANCE_FIELDS, _groupby(groupby, "date", granularity)
+
+
+async def _read_groups(model, domain, fields, groupby, limit, tenant=None):
+    odoo = await get_async_odoo_client(tenant)
+    groups = await odoo.read_group(model, domain, fields, groupby, limit=limit)
+    return _clean_groups(groups)
+
+
+async def get_invoice_totals(invoice_type: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None,
+                             groupby: Optional[str] = "partner_id", granularity: Optional[str] = "month", limit: Optional[int] = None,
+                             response_format: Optional[str] = None, tenant: Optional[str] = None):
+    """
+    Aggregates posted invoices and bills (account.move) in Odoo instead of returning raw rows.
+    """
+    debug("🔍 Executing invoice aggregation by {} per {}", groupby, granularity)
+    groups = await _read_groups(*invoice_totals_query(invoice_type, start_date, end_date, groupby, granularity), limit, tenant)
+    success("✅ Retrieved {} invoice groups", len(groups))
+    return shape(groups, response_format=response_format)
+
+
+async def get_move_totals(start_date: Optional[str] = None, end_date: Optional[str] = None,
+                          groupby: Optional[str] = "journal_id", granularity: Optional[str] = "month", limit: Optional[int] = None,
+                          response_format: Optional[str] = None, tenant: Optional[str] = None):
+    """
+    Totals posted journal entries (account.move) by journal and period, computed in Odoo.
+    """
+    debug("🔍 Executing journal entry aggregation by {} per {}", groupby, granularity)
+    groups = await _read_groups(*move_totals_query(start_date, end_date, groupby, granularity), limit, tenant)
+    success("✅ Retrieved {} journal entry groups", len(groups))
+    return shape(groups, response_format=response_format)
+
+
+async def get_account_balances(start_date: Optional[str] = None, end_date: Optional[str] = None, account_type: Optional[str] = None,
+                               groupby: Optional[str] = "account_id", granularity: Optional[str] = None, limit: Optional[int] = None,
+                               response_format: Optional[str] = None, tenant: Optional[str] = None):
+    """
+    Sums debit, credit and balance of posted journal items (account.move.line) in Odoo.
+    """
+    debug("🔍 Executing account balance aggregation by {} per {}", groupby, granularity)
+    groups = await _read_groups(*account_balances_query(start_date, end_date, account_type, groupby, granularity), limit, tenant)
+    success("✅ Retrieved {} account balance groups", len(groups))
+    return shape(groups, response_format=response_format)
@@ -1 +0,0 @@
-from tools.analytic_accounts.analytic_accounts import get_analytic_accounts_api, get_analytic_accounts
\ No newline at end of file
@@ -1,77 +1,42 @@
 from typing import Optional, Dict, Any, List
-from mcp.server.fastmcp import Context
-from odoo_client import get_odoo_client
+from odoo_client import get_async_odoo_client
+from expansion import expand_records
+from projection import resolve_fields, shape
 from logger import info, success, warning, error, debug
 
+ANALYTIC_ACCOUNT_FIELDS = ["name", "code", "partner_id", "group_id", "company_id", "active", "balance", "plan_id", "root_plan_id"]
 
-def get_analytic_accounts_api(account_type: Optional[str] = None, limit: int = 50):
+
+def analytic_accounts_query(account_type: Optional[str] = None):
     """
-    Fetches analytic accounts (account.analytic.account) for API endpoint.
-    
-    Parameters:
-    - account_type: Type of analytic account to retrieve
-    - limit: Maximum number of records to return (default: 50)
+    Builds the (model, domain, fields) search for analytic accounts.
     """
-    debug(f"🔍 API endpoint /mcp/odoo/analytic_accounts called with type: {account_type}")
-    client = get_odoo_client()
-
     # Initialize domain with no filters
     domain = []
 
     # Add account_type filter if provided
     if account_type:
         domain.append(["group_id.name", "ilike", account_type])
+        info("🔍 Filtering for analytic account type: {}", account_type)
 
-    records = client.search_read(
-        model="account.analytic.account",
-        domain=domain,
-        fields=["name", "code", "partner_id", "group_id", "company_id", "active", "balance", "plan_id", "root_plan_id"],
-        limit=limit
-    )
-    success(f"✅ Returning {len(records)} analytic accounts")
-    return {"records": records}
+    return "account.analytic.account", domain, ANALYTIC_ACCOUNT_FIELDS
 
 
-def get_analytic_accounts(
-    ctx: Context,
-    account_type: Optional[str] = None,
-    limit: int = 50
-) -> Dict[str, Any]:
+async def get_analytic_accounts(account_type: Optional[str] = None, limit: int = 50, expand: Optional[str] = None, fields: Optional[str] = None, response_format: Optional[str] = None, tenant: Optional[str] = None):
     """
-    Fetches analytic accounts (account.analytic.account) for AI analysis.
-
-    Parameters:
-    - account_type: Type of analytic account to retrieve. This can be used to filter by:
-      - Project names
-      - Cost centers
-      - Department names
-      - Any other grouping used in your Odoo instance
-      - If not specified, returns all analytic accounts
-    - limit: Maximum number of records to return (default: 50)
+    Fetches analytic accounts (account.analytic.account).
     """
-    debug("🔍 Environment Configuration Check")
-    # Get Odoo client directly instead of from context
-    odoo = get_odoo_client()
-    info("✅ Odoo client initialized")
-
-    # Initialize domain with no filters
-    domain = []
-
-    # Add account_type filter if provided
-    if account_type:
-        domain.append(["group_id.name", "ilike", account_type])
-        info(f"🔍 Filtering for analytic account type: {account_type}")
-
-    try:
-        debug(f"🔍 Executing analytic accounts search with type: {account_type}")
-        results = odoo.search_read(
-            model="account.analytic.account",
-            domain=domain,
-            fields=["name", "code", "partner_id", "group_id", "company_id", "active", "balance", "plan_id", "root_plan_id"],
-            limit=limit
-        )
-        success(f"✅ Retrieved {len(results)} analytic accounts")
-        return {"success": True, "result": results}
-    except Exception as e:
-        error(f"❌ Error retrieving analytic accounts: {str(e)}")
-        return {"success": False, "error": str(e)}
\ No newline at end of file
+    odoo = await get_async_odoo_client(tenant)
+    model, domain, default_fields = analytic_accounts_query(account_type)
+    fields = await resolve_fields(odoo, model, default_fields, fields)
+    debug("🔍 Executing analytic accounts search with type: {}", account_type)
+    results = await odoo.search_read(
+        model=model,
+        domain=domain,
+        fields=fields,
+        limit=limit
+    )
+    if expand:
+        results = await expand_records(odoo, model, results, expand)
+    success("✅ Retrieved {} analytic accounts", len(results))
+    return shape(results, fields, response_format)
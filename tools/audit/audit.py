@@ -0,0 +1,42 @@
+import zoneinfo
+from typing import Optional, Dict, Any, List
+from odoo_client import get_async_odoo_client
+from audit import CHECKS, audit_entries
+from projection import parse_fields, shape
+from logger import info, success, warning, error, debug
+
+
+def _checks(checks: Optional[str]) -> List[str]:
+    """
+    Turns a comma-separated list of checks into the checks to run (default: all of them).
+    """
+    selected = parse_fields(checks) or list(CHECKS)
+    unknown = [check for check in selected if check not in CHECKS]
+    if unknown:
+        raise ValueError(f"Invalid checks: {', '.join(unknown)}, expected some of: {', '.join(CHECKS)}")
+    return selected
+
+
+async def audit_journal_entries(start_date: Optional[str] = None, end_date: Optional[str] = None, journal_id: Optional[int] = None,
+                                checks: Optional[str] = None, timezone: str = "UTC", limit: int = 100,
+                                response_format: Optional[str] = None, tenant: Optional[str] = None):
+    """
+    Audits posted journal entries (account.move) and journal items (account.move.line) of a period.
+    """
+    selected = _checks(checks)
+    try:
+        zoneinfo.ZoneInfo(timezone)
+    except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+        raise ValueError(f"Unknown timezone '{timezone}'")
+    odoo = await get_async_odoo_client(tenant)
+    debug("🔍 Auditing journal entries from {} to {}", start_date, end_date)
+    findings, entries, items = await audit_entries(odoo, start_date, end_date, journal_id, selected, timezone)
+    flagged = {check: 0 for check in selected}
+    for finding in findings:
+        flagged[finding["check"]] += 1
+    return {
+        "entries": entries,
+        "journal_items": items,
+        "flagged": flagged,
+        "findings": shape(findings[:limit] if limit else findings, response_format=response_format),
+    }
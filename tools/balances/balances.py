@@ -0,0 +1,45 @@
+from typing import Optional, Dict, Any, List
+from odoo_client import get_async_odoo_client
+from balances import balance_rows, compute_balances
+from projection import shape
+from logger import info, success, warning, error, debug
+
+GRANULARITIES = ("month",)
+
+
+async def _accounts(odoo, account_type: Optional[str] = None):
+    """[id, display name] of every account, or of those of ``account_type``."""
+    domain = [["account_type", "=", account_type]] if account_type else []
+    records = await odoo.search_read("account.account", domain, ["display_name"], limit=None)
+    return [[record["id"], record["display_name"]] for record in records]
+
+
+async def account_balances(odoo, start_date: Optional[str] = None, end_date: Optional[str] = None, granularity: Optional[str] = None,
+                           account_type: Optional[str] = None, company_id: Optional[int] = None, include_zero_balance: bool = False):
+    """
+    Opening, period and closing balance rows per account, from posted journal items.
+    """
+    if granularity and granularity not in GRANULARITIES:
+        raise ValueError(f"Invalid granularity '{granularity}', expected one of: {', '.join(GRANULARITIES)}")
+    sums = await compute_balances(odoo, start_date, end_date, company_id)
+    account_ids = None
+    if account_type or include_zero_balance:
+        accounts = await _accounts(odoo, account_type)
+        if include_zero_balance:
+            sums.add_accounts(accounts)
+        if account_type:
+            account_ids = [account[0] for account in accounts]
+    return balance_rows(sums, by_month=bool(granularity), include_zero_balance=include_zero_balance, account_ids=account_ids)
+
+
+async def get_trial_balance(start_date: Optional[str] = None, end_date: Optional[str] = None, granularity: Optional[str] = None,
+                            account_type: Optional[str] = None, company_id: Optional[int] = None, include_zero_balance: bool = False,
+                            response_format: Optional[str] = None, tenant: Optional[str] = None):
+    """
+    Computes a trial balance from posted journal items (account.move.line).
+    """
+    odoo = await get_async_odoo_client(tenant)
+    debug("🔍 Computing trial balance from {} to {} by {}", start_date, end_date, granularity)
+    rows = await account_balances(odoo, start_date, end_date, granularity, account_type, company_id, include_zero_balance)
+    success("✅ Computed balances of {} accounts", len(rows))
+    return shape(rows, response_format=response_format)
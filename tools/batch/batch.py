@@ -0,0 +1,64 @@
+import asyncio
+from typing import Optional, Dict, Any, List
+from odoo_client import get_async_odoo_client
+from projection import resolve_fields, shape
+from logger import info, success, warning, error, debug
+
+MAX_BATCH_SIZE = 50
+DEFAULT_BATCH_LIMIT = 100
+
+
+def _batch_keys(queries: List[Dict[str, Any]]) -> List[str]:
+    """
+    Names each query by its "key", falling back to its position in the list.
+    """
+    keys = []
+    for index, query in enumerate(queries):
+        if not query.get("model"):
+            raise ValueError(f"Query {index} has no model")
+        key = str(query.get("key") or index)
+        if key in keys:
+            raise ValueError(f"Duplicate query key: {key}")
+        keys.append(key)
+    return keys
+
+
+async def run_batch(queries: List[Dict[str, Any]], response_format: Optional[str] = None, tenant: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs several search_read queries concurrently and returns their results by key.
+
+    Every query goes through the shared client, so they run in parallel over its
+    pooled connections (bounded by the tenant's max_concurrency) and still benefit from its
+    cache and request coalescing. One failing query does not fail the others.
+    """
+    if len(queries) > MAX_BATCH_SIZE:
+        raise ValueError(f"A batch can hold at most {MAX_BATCH_SIZE} queries")
+    keys = _batch_keys(queries)
+    odoo = await get_async_odoo_client(tenant)
+
+    async def run(query):
+        try:
+            fields = await resolve_fields(odoo, query["model"], None, query.get("fields"))
+            records = await odoo.search_read(
+                model=query["model"],
+                domain=query.get("domain") or [],
+                fields=fields,
+                limit=query.get("limit", DEFAULT_BATCH_LIMIT)
+            )
+            return {"success": True, "result": shape(records, fields, response_format)}
+        except Exception as e:
+            error("❌ Error in batch query on {}: {}", query["model"], e)
+            return {"success": False, "error": str(e)}
+
+    results = await asyncio.gather(*(run(query) for query in queries))
+    return dict(zip(keys, results))
+
+
+async def batch_query(queries: List[Dict[str, Any]], response_format: Optional[str] = None, tenant: Optional[str] = None):
+    """
+    Runs several Odoo queries at once and returns all results keyed by query.
+    """
+    debug("🔍 Executing batch of {} queries", len(queries))
+    results = await run_batch(queries, response_format, tenant)
+    success("✅ Retrieved results for {} queries", len(results))
+    return results
@@ -1,78 +1,17 @@
 from typing import Optional, Dict, Any, List
-from mcp.server.fastmcp import Context
-from odoo_client import get_odoo_client
+from odoo_client import get_async_odoo_client
+from expansion import expand_records
+from projection import resolve_fields, shape
+from mirror import aquery_mirror
 from logger import info, success, warning, error, debug
 
+INVOICE_FIELDS = ["name", "date", "move_type", "amount_total", "journal_id", "partner_id", "invoice_date", "payment_state"]
 
-def get_invoices_api(invoice_type: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, limit: int = 20):
-    """
-    Fetches invoices and bills (account.move) for API endpoint.
-    
-    Parameters:
-    - invoice_type: Type of invoice to retrieve. Options:
-      - "customer_invoices" for Customer Invoices
-      - "vendor_bills" for Vendor Bills
-      - "credit_notes" for Credit Notes
-      - If not specified, returns all types
-    - start_date: Optional start date filter (format: YYYY-MM-DD)
-    - end_date: Optional end date filter (format: YYYY-MM-DD)
-    - limit: Maximum number of records to return (default: 20)
-    """
-    debug(f"🔍 API endpoint /mcp/odoo/invoices called with type: {invoice_type}")
-    client = get_odoo_client()
-
-    # Base domain - only get posted documents
-    domain = [["state", "=", "posted"]]
-
-    # Add move_type filter based on invoice_type parameter
-    if invoice_type == "customer_invoices":
-        domain.append(["move_type", "=", "out_invoice"])
-    elif invoice_type == "vendor_bills":
-        domain.append(["move_type", "=", "in_invoice"])
-    elif invoice_type == "credit_notes":
-        domain.append(["move_type", "in", ["out_refund", "in_refund"]])
 
-    # Add date filters if provided
-    if start_date:
-        domain.append(["date", ">=", start_date])
-    if end_date:
-        domain.append(["date", "<=", end_date])
-
-    records = client.search_read(
-        model="account.move",
-        domain=domain,
-        fields=["name", "date", "move_type", "amount_total", "journal_id", "partner_id", "invoice_date", "payment_state"],
-        limit=limit
-    )
-    success(f"✅ Returning {len(records)} invoices/bills")
-    return {"records": records}
-
-
-def get_invoices(
-    ctx: Context,
-    invoice_type: Optional[str] = None,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    limit: int = 20
-) -> Dict[str, Any]:
+def invoices_query(invoice_type: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None):
     """
-    Fetches invoices and bills (account.move) for AI analysis.
-
-    Parameters:
-    - invoice_type: Type of invoice to retrieve. Options:
-      - "customer_invoices" for Customer Invoices (move_type = 'out_invoice')
-      - "vendor_bills" for Vendor Bills (move_type = 'in_invoice')
-      - "credit_notes" for Credit Notes (move_type = 'out_refund' or 'in_refund')
-      - If not specified, returns all types
-    - start_date: Optional start date filter (format: YYYY-MM-DD)
-    - end_date: Optional end date filter (format: YYYY-MM-DD)
-    - limit: Maximum number of records to return (default: 20)
+    Builds the (model, domain, fields) search for invoices and bills.
     """
-    debug("🔍 Environment Configuration Check")
-    # Get Odoo client directly instead of from context
-    odoo = get_odoo_client()
-    info("✅ Odoo client initialized")
-
     # Base domain - only get posted documents
     domain = [["state", "=", "posted"]]
 
@@ -93,16 +32,26 @@ def get_invoices(
     if end_date:
         domain.append(["date", "<=", end_date])
 
-    try:
-        debug(f"🔍 Executing invoice search with type: {invoice_type}, date range: {start_date} to {end_date}")
-        results = odoo.search_read(
-            model="account.move",
+    return "account.move", domain, INVOICE_FIELDS
+
+
+async def get_invoices(invoice_type: Optional[str] = None, start_date: Optional[str] = None, end_date: Optional[str] = None, limit: int = 20, expand: Optional[str] = None, fields: Optional[str] = None, response_format: Optional[str] = None, tenant: Optional[str] = None):
+    """
+    Fetches invoices and bills (account.move).
+    """
+    odoo = await get_async_odoo_client(tenant)
+    model, domain, default_fields = invoices_query(invoice_type, start_date, end_date)
+    fields = await resolve_fields(odoo, model, default_fields, fields)
+    debug("🔍 Executing invoice search with type: {}, date range: {} to {}", invoice_type, start_date, end_date)
+    results = await aquery_mirror(model, domain, fields, limit, tenant)
+    if results is None:
+        results = await odoo.planned_search_read(
+            model=model,
             domain=domain,
-            fields=["name", "date", "move_type", "amount_total", "journal_id", "partner_id", "invoice_date", "payment_state"],
+            fields=fields,
             limit=limit
         )
-        success(f"✅ Retrieved {len(results)} invoices/bills")
-        return {"success": True, "result": results}
-    except Exception as e:
-        error(f"❌ Error retrieving invoices: {str(e)}")
-        return {"success": False, "error": str(e)}
\ No newline at end of file
+    if expand:
+        results = await expand_records(odoo, model, results, expand)
+    success("✅ Retrieved {} invoices/bills", len(results))
+    return shape(results, fields, response_format)
@@ -1,56 +1,43 @@
 from typing import Optional, Dict, Any, List
-from mcp.server.fastmcp import Context
-from odoo_client import get_odoo_client
+from odoo_client import get_async_odoo_client
+from expansion import expand_records
+from projection import resolve_fields, shape
+from mirror import aquery_mirror
 from logger import info, success, warning, error, debug
 
+JOURNAL_ENTRY_FIELDS = ["name", "date", "move_type", "amount_total", "journal_id", "partner_id"]
 
-def get_account_moves():
-    """
-    Fetches recent account moves for API endpoint.
-    """
-    debug("🔍 API endpoint /mcp/odoo/accounting called")
-    client = get_odoo_client()
-    records = client.search_read(
-        model="account.move",
-        domain=[["state", "=", "posted"]],
-        fields=["name", "date", "journal_id", "amount_total"],
-        limit=10
-    )
-    success(f"✅ Returning {len(records)} account moves")
-    return {"records": records}
 
-
-def get_recent_journal_entries(
-    ctx: Context,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    limit: int = 20
-) -> Dict[str, Any]:
+def journal_entries_query(start_date: Optional[str] = None, end_date: Optional[str] = None):
     """
-    Fetches recent journal entries (account.move) for AI analysis.
-    Allows optional filtering by date.
+    Builds the (model, domain, fields) search for posted journal entries in a date range.
     """
-    debug("🔍 Environment Configuration Check")
-    # Get Odoo client directly instead of from context
-    odoo = get_odoo_client()
-    info("✅ Odoo client initialized")
-
     domain = [["state", "=", "posted"]]
     if start_date:
         domain.append(["date", ">=", start_date])
     if end_date:
         domain.append(["date", "<=", end_date])
 
-    try:
-        debug(f"🔍 Executing journal entries search with date range: {start_date} to {end_date}")
-        results = odoo.search_read(
-            model="account.move",
+    return "account.move", domain, JOURNAL_ENTRY_FIELDS
+
+
+async def get_recent_journal_entries(start_date: Optional[str] = None, end_date: Optional[str] = None, limit: int = 20, expand: Optional[str] = None, fields: Optional[str] = None, response_format: Optional[str] = None, tenant: Optional[str] = None):
+    """
+    Fetches recent journal entries (account.move).
+    """
+    odoo = await get_async_odoo_client(tenant)
+    model, domain, default_fields = journal_entries_query(start_date, end_date)
+    fields = await resolve_fields(odoo, model, default_fields, fields)
+    debug("🔍 Executing journal entries search with date range: {} to {}", start_date, end_date)
+    results = await aquery_mirror(model, domain, fields, limit, tenant)
+    if results is None:
+        results = await odoo.planned_search_read(
+            model=model,
             domain=domain,
-            fields=["name", "date", "move_type", "amount_total", "journal_id", "partner_id"],
+            fields=fields,
             limit=limit
         )
-        success(f"✅ Retrieved {len(results)} journal entries")
-        return {"success": True, "result": results}
-    except Exception as e:
-        error(f"❌ Error retrieving journal entries: {str(e)}")
-        return {"success": False, "error": str(e)}
\ No newline at end of file
+    if expand:
+        results = await expand_records(odoo, model, results, expand)
+    success("✅ Retrieved {} journal entries", len(results))
+    return shape(results, fields, response_format)
@@ -1,82 +1,59 @@
 from typing import Optional, Dict, Any, List
-from mcp.server.fastmcp import Context
-from odoo_client import get_odoo_client
+from odoo_client import get_async_odoo_client
+from expansion import expand_records
+from projection import resolve_fields, shape
+from partner_index import get_partner_index
 from logger import info, success, warning, error, debug
 
+PARTNER_FIELDS = ["name", "email", "phone", "mobile", "street", "city", "zip", "country_id",
+                  "customer_rank", "supplier_rank", "company_id", "category_id", "user_id"]
 
-def get_partners_api(partner_type: Optional[str] = None, limit: int = 50):
+
+def partners_query(partner_type: Optional[str] = None):
     """
-    Fetches partners (res.partner) for API endpoint.
-    
-    Parameters:
-    - partner_type: Type of partners to retrieve
-    - limit: Maximum number of records to return (default: 50)
+    Builds the (model, domain, fields) search for partners.
     """
-    debug(f"🔍 API endpoint /mcp/odoo/partners called with type: {partner_type}")
-    client = get_odoo_client()
-
     # Initialize domain with no filters
     domain = []
 
     # Add partner_type filter if provided
     if partner_type == "customer":
         domain.append(["customer_rank", ">", 0])
+        info("🔍 Filtering for Customers")
     elif partner_type == "vendor":
         domain.append(["supplier_rank", ">", 0])
+        info("🔍 Filtering for Vendors")
+
+    return "res.partner", domain, PARTNER_FIELDS
+
 
-    records = client.search_read(
-        model="res.partner",
+async def get_partners(partner_type: Optional[str] = None, limit: int = 50, expand: Optional[str] = None, fields: Optional[str] = None, response_format: Optional[str] = None, tenant: Optional[str] = None):
+    """
+    Fetches partners (res.partner).
+    """
+    odoo = await get_async_odoo_client(tenant)
+    model, domain, default_fields = partners_query(partner_type)
+    fields = await resolve_fields(odoo, model, default_fields, fields)
+    debug("🔍 Executing partners search with type: {}", partner_type)
+    results = await odoo.search_read(
+        model=model,
         domain=domain,
-        fields=["name", "email", "phone", "mobile", "street", "city", "zip", "country_id", 
-                "customer_rank", "supplier_rank", "company_id", "category_id", "user_id"],
+        fields=fields,
         limit=limit
     )
-    success(f"✅ Returning {len(records)} partners")
-    return {"records": records}
+    if expand:
+        results = await expand_records(odoo, model, results, expand)
+    success("✅ Retrieved {} partners", len(results))
+    return shape(results, fields, response_format)
 
 
-def get_partners(
-    ctx: Context,
-    partner_type: Optional[str] = None,
-    limit: int = 50
-) -> Dict[str, Any]:
+async def search_partners(query: str, city: Optional[str] = None, limit: int = 10, response_format: Optional[str] = None, tenant: Optional[str] = None):
     """
-    Fetches partners (res.partner) for AI analysis.
-
-    Parameters:
-    - partner_type: Type of partners to retrieve. Options:
-      - "customer" for Customers (customer_rank > 0)
-      - "vendor" for Vendors (supplier_rank > 0)
-      - If not specified, returns all partners
-    - limit: Maximum number of records to return (default: 50)
+    Searches partners (res.partner) by approximate name, or exact email, VAT or phone number.
     """
-    debug("🔍 Environment Configuration Check")
-    # Get Odoo client directly instead of from context
-    odoo = get_odoo_client()
-    info("✅ Odoo client initialized")
-
-    # Initialize domain with no filters
-    domain = []
-
-    # Add partner_type filter if provided
-    if partner_type == "customer":
-        domain.append(["customer_rank", ">", 0])
-        info("🔍 Filtering for Customers")
-    elif partner_type == "vendor":
-        domain.append(["supplier_rank", ">", 0])
-        info("🔍 Filtering for Vendors")
-
-    try:
-        debug(f"🔍 Executing partners search with type: {partner_type}")
-        results = odoo.search_read(
-            model="res.partner",
-            domain=domain,
-            fields=["name", "email", "phone", "mobile", "street", "city", "zip", "country_id", 
-                   "customer_rank", "supplier_rank", "company_id", "category_id", "user_id"],
-            limit=limit
-        )
-        success(f"✅ Retrieved {len(results)} partners")
-        return {"success": True, "result": results}
-    except Exception as e:
-        error(f"❌ Error retrieving partners: {str(e)}")
-        return {"success": False, "error": str(e)}
\ No newline at end of file
+    odoo = await get_async_odoo_client(tenant)
+    index = await get_partner_index(odoo)
+    debug("🔍 Searching {} indexed partners for: {}", len(index), query)
+    results = index.search(query, city, limit)
+    success("✅ Found {} partners", len(results))
+    return shape(results, response_format=response_format)
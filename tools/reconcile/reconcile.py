@@ -0,0 +1,27 @@
+from typing import Optional
+from odoo_client import get_async_odoo_client
+from reconcile import suggest_matches
+from projection import shape
+from logger import info, success, warning, error, debug
+
+
+async def suggest_reconciliations(start_date: Optional[str] = None, end_date: Optional[str] = None, journal_id: Optional[int] = None,
+                                  partner_id: Optional[int] = None, amount_tolerance: float = 0.01, window_days: int = 90,
+                                  limit: int = 100, response_format: Optional[str] = None, tenant: Optional[str] = None):
+    """
+    Proposes open receivable and payable journal items (account.move.line) for unreconciled bank statement lines.
+    """
+    if amount_tolerance < 0:
+        raise ValueError("amount_tolerance must be 0 or more")
+    if window_days < 0:
+        raise ValueError("window_days must be 0 or more")
+    odoo = await get_async_odoo_client(tenant)
+    debug("🔗 Suggesting reconciliations from {} to {}", start_date, end_date)
+    proposals, lines, items = await suggest_matches(odoo, start_date, end_date, journal_id, partner_id=partner_id,
+                                                    window=window_days, tolerance=amount_tolerance)
+    return {
+        "statement_lines": lines,
+        "open_items": items,
+        "matched": len(proposals),
+        "proposals": shape(proposals[:limit] if limit else proposals, response_format=response_format),
+    }
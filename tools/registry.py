@@ -0,0 +1,444 @@
+import inspect
+from typing import Optional, Dict, Any, List
+
+# Every tool is declared once here and served both as an MCP tool (mcp_server.py)
+# and as an HTTP route (server.py). A declaration only carries the signature and
+# documentation; the implementation with the same name is looked up in ``tools``
+# on first call, so importing this module loads neither the Odoo client nor FastAPI.
+
+
+class ToolSpec:
+    """
+    One tool: its name, signature and docs, and where it is served over HTTP.
+
+    The implementation ``tools.<name>`` takes the declared arguments and
+    returns the tool's data. The MCP layer wraps it as ``{"success", "result"}``
+    and the HTTP layer as ``{"records"}``. ``query`` names the
+    ``(model, domain, fields)`` builder that lets the route stream NDJSON.
+    """
+
+    def __init__(self, name, description, path, method="GET", query=None, signature=None, doc=None):
+        self.name = name
+        self.description = description
+        self.path = path
+        self.method = method
+        self.query = query
+        self.signature = signature
+        self.doc = doc
+
+    def load(self):
+        import tools
+        return getattr(tools, self.name)
+
+    def build_query(self, arguments):
+        """Return (model, domain, fields) for ``arguments``, passing the builder only the ones it takes."""
+        import tools
+        builder = getattr(tools, self.query)
+        accepted = inspect.signature(builder).parameters
+        return builder(**{name: value for name, value in arguments.items() if name in accepted})
+
+
+TOOLS: List[ToolSpec] = []
+
+
+def tool(description, path, method="GET", query=None):
+    """Declare the decorated signature-only function as a tool."""
+    def register(declaration):
+        TOOLS.append(ToolSpec(declaration.__name__, description, path, method, query,
+                              inspect.signature(declaration), inspect.getdoc(declaration)))
+        return declaration
+
+    return register
+
+
+@tool("🎯 Get recent journal entries for AI audit", "/mcp/odoo/accounting", query="journal_entries_query")
+def get_recent_journal_entries(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: int = 20,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Fetches recent journal entries (account.move) for AI analysis.
+    Allows optional filtering by date.
+
+    Parameters:
+    - start_date: Optional start date filter (format: YYYY-MM-DD)
+    - end_date: Optional end date filter (format: YYYY-MM-DD)
+    - limit: Maximum number of records to return (default: 20)
+    - expand: Optional comma-separated relational fields to replace with the related records, e.g. "partner_id,journal_id"
+    - fields: Optional profile ("minimal", "standard" or "full") or comma-separated field names (default: "standard")
+    - response_format: "records" (default) or "columns" for the field names once plus one array per record
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("📄 Get invoices and bills for AI analysis", "/mcp/odoo/invoices", query="invoices_query")
+def get_invoices(
+    invoice_type: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: int = 20,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Fetches invoices and bills (account.move) for AI analysis.
+
+    Parameters:
+    - invoice_type: Type of invoice to retrieve. Options:
+      - "customer_invoices" for Customer Invoices (move_type = 'out_invoice')
+      - "vendor_bills" for Vendor Bills (move_type = 'in_invoice')
+      - "credit_notes" for Credit Notes (move_type = 'out_refund' or 'in_refund')
+      - If not specified, returns all types
+    - start_date: Optional start date filter (format: YYYY-MM-DD)
+    - end_date: Optional end date filter (format: YYYY-MM-DD)
+    - limit: Maximum number of records to return (default: 20)
+    - expand: Optional comma-separated relational fields to replace with the related records, e.g. "partner_id,journal_id"
+    - fields: Optional profile ("minimal", "standard" or "full") or comma-separated field names (default: "standard")
+    - response_format: "records" (default) or "columns" for the field names once plus one array per record
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("📊 Get chart of accounts for AI analysis", "/mcp/odoo/accounts", query="accounts_query")
+def get_chart_of_accounts(
+    account_type: Optional[str] = None,
+    include_zero_balance: bool = True,
+    limit: int = 100,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Fetches chart of accounts (account.account) for AI analysis.
+
+    Parameters:
+    - account_type: Optional filter for specific account types. Common types include:
+      - "asset_receivable" for Receivable Accounts
+      - "asset_cash" for Bank & Cash Accounts
+      - "asset_current" for Current Assets
+      - "asset_non_current" for Non-current Assets
+      - "liability_payable" for Payable Accounts
+      - "liability_current" for Current Liabilities
+      - "equity" for Equity Accounts
+      - "income" for Income Accounts
+      - "expense" for Expense Accounts
+      - If not specified, returns all account types
+    - include_zero_balance: Set to false to return only accounts whose posted journal items do not net to zero, each with its "balance" (default: true)
+    - limit: Maximum number of records to return (default: 100)
+    - expand: Optional comma-separated relational fields to replace with the related records, e.g. "company_id,currency_id"
+    - fields: Optional profile ("minimal", "standard" or "full") or comma-separated field names (default: "standard")
+    - response_format: "records" (default) or "columns" for the field names once plus one array per record
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("👥 Get partners for AI analysis", "/mcp/odoo/partners", query="partners_query")
+def get_partners(
+    partner_type: Optional[str] = None,
+    limit: int = 50,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Fetches partners (res.partner) for AI analysis.
+
+    Parameters:
+    - partner_type: Type of partners to retrieve. Options:
+      - "customer" for Customers (customer_rank > 0)
+      - "vendor" for Vendors (supplier_rank > 0)
+      - If not specified, returns all partners
+    - limit: Maximum number of records to return (default: 50)
+    - expand: Optional comma-separated relational fields to replace with the related records, e.g. "country_id,category_id"
+    - fields: Optional profile ("minimal", "standard" or "full") or comma-separated field names (default: "standard")
+    - response_format: "records" (default) or "columns" for the field names once plus one array per record
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("🔎 Search partners by name, email, VAT or phone", "/mcp/odoo/partners/search")
+def search_partners(
+    query: str,
+    city: Optional[str] = None,
+    limit: int = 10,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Finds partners (res.partner) matching a name roughly, or an email, VAT or phone number exactly,
+    from an in-memory index kept up to date by write_date. Each partner comes with a score
+    between 0 and 1; exact email, VAT and phone matches score 1.
+
+    Parameters:
+    - query: Name (typos and word order are tolerated), email, VAT number or phone number to look for
+    - city: Optional city the partners must be in
+    - limit: Maximum number of partners to return, best match first (default: 10)
+    - response_format: "records" (default) or "columns" for the field names once plus one array per partner
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("📒 Get journals for AI analysis", "/mcp/odoo/journals", query="journals_query")
+def get_journals(
+    journal_type: Optional[str] = None,
+    limit: int = 20,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Fetches journals (account.journal) for AI analysis.
+
+    Parameters:
+    - journal_type: Type of journal to retrieve. Common types include:
+      - "sale" for Sales Journals
+      - "purchase" for Purchase Journals
+      - "cash" for Cash Journals
+      - "bank" for Bank Journals
+      - "general" for Miscellaneous Operations Journals
+      - If not specified, returns all journal types
+    - limit: Maximum number of records to return (default: 20)
+    - expand: Optional comma-separated relational fields to replace with the related records, e.g. "company_id,default_account_id"
+    - fields: Optional profile ("minimal", "standard" or "full") or comma-separated field names (default: "standard")
+    - response_format: "records" (default) or "columns" for the field names once plus one array per record
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("📊 Get analytic accounts for AI analysis", "/mcp/odoo/analytic_accounts", query="analytic_accounts_query")
+def get_analytic_accounts(
+    account_type: Optional[str] = None,
+    limit: int = 50,
+    expand: Optional[str] = None,
+    fields: Optional[str] = None,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Fetches analytic accounts (account.analytic.account) for AI analysis.
+
+    Parameters:
+    - account_type: Type of analytic account to retrieve. This can be used to filter by:
+      - Project names
+      - Cost centers
+      - Department names
+      - Any other grouping used in your Odoo instance
+      - If not specified, returns all analytic accounts
+    - limit: Maximum number of records to return (default: 50)
+    - expand: Optional comma-separated relational fields to replace with the related records, e.g. "partner_id,plan_id"
+    - fields: Optional profile ("minimal", "standard" or "full") or comma-separated field names (default: "standard")
+    - response_format: "records" (default) or "columns" for the field names once plus one array per record
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("📈 Get invoice and bill totals grouped by partner and period", "/mcp/odoo/aggregates/invoices")
+def get_invoice_totals(
+    invoice_type: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    groupby: Optional[str] = "partner_id",
+    granularity: Optional[str] = "month",
+    limit: Optional[int] = None,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Aggregates posted invoices and bills (account.move) in Odoo, e.g. total invoiced per partner per month.
+
+    Parameters:
+    - invoice_type: "customer_invoices", "vendor_bills" or "credit_notes" (default: all types)
+    - start_date: Optional start date filter (format: YYYY-MM-DD)
+    - end_date: Optional end date filter (format: YYYY-MM-DD)
+    - groupby: Comma-separated fields to group by, e.g. "partner_id" or "partner_id,journal_id" (default: "partner_id")
+    - granularity: Date bucket: "day", "week", "month", "quarter" or "year" (default: "month"); empty for none
+    - limit: Maximum number of groups to return (default: all)
+    - response_format: "records" (default) or "columns" for the field names once plus one array per group
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("📈 Get journal entry totals grouped by journal and period", "/mcp/odoo/aggregates/moves")
+def get_move_totals(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    groupby: Optional[str] = "journal_id",
+    granularity: Optional[str] = "month",
+    limit: Optional[int] = None,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Totals posted journal entries (account.move) in Odoo, e.g. per journal per month.
+
+    Parameters:
+    - start_date: Optional start date filter (format: YYYY-MM-DD)
+    - end_date: Optional end date filter (format: YYYY-MM-DD)
+    - groupby: Comma-separated fields to group by (default: "journal_id")
+    - granularity: Date bucket: "day", "week", "month", "quarter" or "year" (default: "month"); empty for none
+    - limit: Maximum number of groups to return (default: all)
+    - response_format: "records" (default) or "columns" for the field names once plus one array per group
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("⚖️ Get account balances from posted journal items", "/mcp/odoo/aggregates/account_balances")
+def get_account_balances(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    account_type: Optional[str] = None,
+    groupby: Optional[str] = "account_id",
+    granularity: Optional[str] = None,
+    limit: Optional[int] = None,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Sums debit, credit and balance of posted journal items (account.move.line) in Odoo.
+
+    Parameters:
+    - start_date: Optional start date filter (format: YYYY-MM-DD)
+    - end_date: Optional end date filter (format: YYYY-MM-DD)
+    - account_type: Optional account type filter, e.g. "asset_receivable" or "expense"
+    - groupby: Comma-separated fields to group by (default: "account_id")
+    - granularity: Optional date bucket: "day", "week", "month", "quarter" or "year"
+    - limit: Maximum number of groups to return (default: all)
+    - response_format: "records" (default) or "columns" for the field names once plus one array per group
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("🧮 Get a trial balance: opening, period and closing balance per account", "/mcp/odoo/trial_balance")
+def get_trial_balance(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    granularity: Optional[str] = None,
+    account_type: Optional[str] = None,
+    company_id: Optional[int] = None,
+    include_zero_balance: bool = False,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Computes balances per account from posted journal items (account.move.line).
+    Items before start_date make up the opening balance; debit and credit cover start_date to end_date.
+
+    Parameters:
+    - start_date: Optional start of the period (format: YYYY-MM-DD); without it the opening balance is zero
+    - end_date: Optional end of the period (format: YYYY-MM-DD)
+    - granularity: Optional "month" to add each account's debit, credit and balance per month
+    - account_type: Optional account type filter, e.g. "asset_receivable" or "expense"
+    - company_id: Optional company id (default: every company the user can access)
+    - include_zero_balance: Also return accounts with no balance and no movement (default: false)
+    - response_format: "records" (default) or "columns" for the field names once plus one array per account
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("🕵️ Audit journal entries for duplicates and anomalies", "/mcp/odoo/audit")
+def audit_journal_entries(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    journal_id: Optional[int] = None,
+    checks: Optional[str] = None,
+    timezone: str = "UTC",
+    limit: int = 100,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Runs audit checks on the posted journal entries (account.move) and journal items (account.move.line)
+    of a period inside the server and returns only the flagged items, highest score (0 to 1) first.
+
+    Checks:
+    - duplicates: invoices of the same type and partner with the same amount and invoice date or reference
+    - round_amounts: entries of 1000 or more in whole thousands
+    - weekend: entries created on a Saturday or Sunday
+    - after_hours: entries created before 07:00 or after 20:00
+    - benford: journals whose journal item amounts' first digits deviate from Benford's law
+    - partner_outliers: entries 3 or more standard deviations away from their partner's mean amount
+
+    Parameters:
+    - start_date: Optional start date (format: YYYY-MM-DD)
+    - end_date: Optional end date (format: YYYY-MM-DD)
+    - journal_id: Optional journal id to audit only that journal
+    - checks: Optional comma-separated checks to run (default: all of them)
+    - timezone: Time zone of the weekend and after_hours checks, e.g. "Europe/Brussels" (default: "UTC")
+    - limit: Maximum number of findings to return (default: 100; the counts per check cover all of them)
+    - response_format: "records" (default) or "columns" for the field names once plus one array per finding
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("🔗 Suggest bank statement reconciliations", "/mcp/odoo/reconciliations")
+def suggest_reconciliations(
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    journal_id: Optional[int] = None,
+    partner_id: Optional[int] = None,
+    amount_tolerance: float = 0.01,
+    window_days: int = 90,
+    limit: int = 100,
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Matches unreconciled bank statement lines (account.bank.statement.line) against open receivable and
+    payable journal items (account.move.line) inside the server and returns ranked proposals, best first.
+    Each statement line and open item appears in one proposal at most.
+
+    A proposal pays either one item ("one_to_one") or 2 to 4 items of the line's partner whose residuals
+    add up to its amount ("many_to_one"). Its score (0 to 1) weighs the amount difference, the partner,
+    the item's number or reference in the line's label and the distance between the line's date and the
+    items' due dates.
+
+    Parameters:
+    - start_date: Optional start date of the statement lines (format: YYYY-MM-DD)
+    - end_date: Optional end date of the statement lines (format: YYYY-MM-DD)
+    - journal_id: Optional bank journal id to match only that journal's statement lines
+    - partner_id: Optional partner id to match only that partner's statement lines and items
+    - amount_tolerance: Largest difference between a line's amount and the items' residuals (default: 0.01)
+    - window_days: Largest number of days between a line's date and an item's due date (default: 90)
+    - limit: Maximum number of proposals to return (default: 100; matched counts all of them)
+    - response_format: "records" (default) or "columns" for the field names once plus one array per proposal
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("📦 Run several Odoo queries in one call", "/mcp/odoo/batch", method="POST")
+def batch_query(
+    queries: List[Dict[str, Any]],
+    response_format: Optional[str] = None,
+    tenant: Optional[str] = None
+):
+    """
+    Runs several search_read queries concurrently and returns all results keyed by query.
+    Use it to bootstrap an audit (accounts, journals, partners, invoices) in one round trip.
+
+    Parameters:
+    - queries: List of query specs, each with:
+      - model: Odoo model name, e.g. "account.journal" (required)
+      - domain: Optional search domain, e.g. [["type", "=", "sale"]]
+      - fields: Optional list of fields to return, or a profile: "minimal" or "full" (default: all fields)
+      - limit: Maximum number of records (default: 100)
+      - key: Optional name for the result (default: the query's position in the list)
+    - response_format: "records" (default) or "columns" for the field names once plus one array per record
+    - tenant: Optional tenant name from ODOO_TENANTS_FILE (default: the default tenant)
+    """
+
+
+@tool("🏢 List the Odoo databases (tenants) this server can query", "/mcp/odoo/tenants")
+def list_tenants():
+    """
+    Lists the configured tenants. Pass a tenant's name as the "tenant" argument of any other tool.
+    """
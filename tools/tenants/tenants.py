@@ -0,0 +1,21 @@
+from typing import Dict, Any
+from tenants import get_tenant_registry
+from logger import info, success, warning, error, debug
+
+
+def _tenant_rows():
+    registry = get_tenant_registry()
+    rows = []
+    for name in registry.names():
+        tenant = registry.resolve(name)
+        rows.append({"name": name, "db": tenant.db, "default": registry.is_default(name)})
+    return rows
+
+
+async def list_tenants():
+    """
+    Lists the Odoo databases (tenants) this server can query.
+    """
+    rows = _tenant_rows()
+    success("✅ Retrieved {} tenants", len(rows))
+    return rows